@@ -0,0 +1,36 @@
+import argparse
+import timeit
+from typing import List, Optional
+
+from benchmarks.rows import construct, hydrate, product_rows
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.hydration",
+        description="Per-row cost of mapping database rows to products.",
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(args)
+
+
+def main(args: argparse.Namespace) -> None:
+    rows = list(product_rows(args.rows))
+    results = {}
+    for name, mapper in (("constructors", construct), ("from_row", hydrate)):
+        best = min(
+            timeit.repeat(
+                lambda: [mapper(row) for row in rows],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        results[name] = best / args.rows * 1e9
+        print(f"{name:>12}: {results[name]:8.0f} ns/row")
+    speedup = results["constructors"] / results["from_row"]
+    print(f"{'speedup':>12}: {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(parse_args())
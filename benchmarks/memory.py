@@ -0,0 +1,42 @@
+import argparse
+import gc
+import os
+import resource
+from typing import List, Optional
+
+from benchmarks.rows import hydrate, product_rows
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory",
+        description="Resident memory held by hydrated products.",
+    )
+    parser.add_argument("--products", type=int, default=1_000_000)
+    return parser.parse_args(args)
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # no procfs: fall back to the peak, reported in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def main(args: argparse.Namespace) -> None:
+    gc.collect()
+    before = rss_bytes()
+    products = [hydrate(row) for row in product_rows(args.products)]
+    gc.collect()
+    after = rss_bytes()
+    held = after - before
+    print(f"products: {len(products):,}")
+    print(f"     rss: {after / 2**20:,.0f} MiB ({held / 2**20:,.0f} MiB held)")
+    print(f" product: {held / len(products):,.0f} bytes")
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,96 @@
+from collections import namedtuple
+from typing import Iterator
+from uuid import uuid4
+
+from src.domain.entities import Category, Product
+from src.domain.value_objects import Inventory, Price
+
+ProductRow = namedtuple(
+    "ProductRow",
+    [
+        "product_id",
+        "product_version",
+        "product_sku",
+        "product_name",
+        "product_description",
+        "product_image_url",
+        "price_id",
+        "price_value",
+        "price_discount_percent",
+        "inventory_id",
+        "inventory_quantity",
+        "inventory_reserved",
+        "category_id",
+        "category_name",
+    ],
+)
+
+CATEGORY_IDS = [uuid4() for _ in range(200)]
+
+
+def product_rows(count: int) -> Iterator[ProductRow]:
+    """Rows shaped like the ones the postgres adapter maps to products."""
+    for index in range(count):
+        category = index % len(CATEGORY_IDS)
+        yield ProductRow(
+            product_id=uuid4(),
+            product_version=index % 7,
+            product_sku=f"sku-{index:08d}",
+            product_name=f"Product {index}",
+            product_description=f"Description of product {index}",
+            product_image_url=f"https://example.com/{index}.jpg",
+            price_id=uuid4(),
+            price_value=float(index % 1000) + 0.99,
+            price_discount_percent=0.1,
+            inventory_id=uuid4(),
+            inventory_quantity=100,
+            inventory_reserved=index % 100,
+            category_id=CATEGORY_IDS[category],
+            category_name=f"Category {category}",
+        )
+
+
+def construct(row: ProductRow) -> Product:
+    """Map a row through the validating public constructors."""
+    return Product(
+        id=row.product_id,
+        version=row.product_version,
+        sku=row.product_sku,
+        name=row.product_name,
+        description=row.product_description,
+        image_url=row.product_image_url,
+        price=Price(
+            id=row.price_id,
+            value=row.price_value,
+            discount_percent=row.price_discount_percent,
+        ),
+        inventory=Inventory(
+            id=row.inventory_id,
+            quantity=row.inventory_quantity,
+            reserved=row.inventory_reserved,
+        ),
+        category=Category(id=row.category_id, name=row.category_name),
+    )
+
+
+def hydrate(row: ProductRow) -> Product:
+    """Map a row the way the postgres adapter does."""
+    return Product.from_row(
+        id=row.product_id,
+        version=row.product_version,
+        sku=row.product_sku,
+        name=row.product_name,
+        description=row.product_description,
+        image_url=row.product_image_url,
+        price=Price.from_row(
+            id=row.price_id,
+            value=row.price_value,
+            discount_percent=row.price_discount_percent,
+        ),
+        inventory=Inventory.from_row(
+            id=row.inventory_id,
+            quantity=row.inventory_quantity,
+            reserved=row.inventory_reserved,
+        ),
+        category=Category.intern(id=row.category_id, name=row.category_name),
+    )
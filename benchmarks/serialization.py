@@ -0,0 +1,101 @@
+import argparse
+import json
+import timeit
+from typing import List, Optional
+
+from benchmarks.rows import hydrate, product_rows
+from fastapi.encoders import jsonable_encoder
+from src.adapter.dto import (
+    CategoryDTO,
+    InventoryDTO,
+    PriceDTO,
+    ProductListResponseDTO,
+    ProductResponseDTO,
+)
+from src.adapter.json_response import ProductJSONResponse
+from src.domain.entities import Product
+from src.domain.enums import ProductEventType
+from src.domain.events import ProductEvent
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.serialization",
+        description="Per-product cost of rendering responses and events.",
+    )
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(args)
+
+
+def to_dto(product: Product) -> ProductResponseDTO:
+    """The DTO mapping the HTTP adapter used before rendering with orjson."""
+    return ProductResponseDTO(
+        id=product.id,
+        sku=product.sku,
+        name=product.name,
+        description=product.description,
+        image_url=product.image_url,
+        price=PriceDTO(
+            value=product.price.value,
+            discount_percent=product.price.discount_percent,
+        ),
+        inventory=InventoryDTO(
+            quantity=product.inventory.quantity,
+            reserved=product.inventory.reserved,
+        ),
+        category=CategoryDTO(name=product.category.name),
+    )
+
+
+def render_dtos(products: List[Product]) -> bytes:
+    content = ProductListResponseDTO(
+        products=[to_dto(product) for product in products], next_cursor=None
+    )
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_orjson(products: List[Product]) -> bytes:
+    return ProductJSONResponse(
+        {"products": products, "next_cursor": None}
+    ).body
+
+
+def events_json(events: List[ProductEvent]) -> List[str]:
+    return [json.dumps(event.to_dict()) for event in events]
+
+
+def events_orjson(events: List[ProductEvent]) -> List[str]:
+    return [event.to_json() for event in events]
+
+
+def main(args: argparse.Namespace) -> None:
+    products = [hydrate(row) for row in product_rows(args.products)]
+    events = [
+        ProductEvent(type=ProductEventType.UPDATED, product=product)
+        for product in products
+    ]
+    for title, baseline, candidate, items in (
+        ("response", render_dtos, render_orjson, products),
+        ("event", events_json, events_orjson, events),
+    ):
+        results = {}
+        for name, render in (("json", baseline), ("orjson", candidate)):
+            best = min(
+                timeit.repeat(
+                    lambda: render(items), number=1, repeat=args.repeat
+                )
+            )
+            results[name] = best / args.products * 1e9
+            print(f"{title:>8} {name:>6}: {results[name]:8.0f} ns/product")
+        speedup = results["json"] / results["orjson"]
+        print(f"{title:>8} {'speedup':>6}: {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(parse_args())
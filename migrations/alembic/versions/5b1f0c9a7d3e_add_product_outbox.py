@@ -0,0 +1,41 @@
+"""add product outbox
+
+Revision ID: 5b1f0c9a7d3e
+Revises: d47ca3a3e2b6
+Create Date: 2024-07-20 10:02:11.418305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0c9a7d3e"
+down_revision: Union[str, None] = "d47ca3a3e2b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ProductOutbox",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("event_id", sa.UUID(), nullable=False),
+        sa.Column("sku", sa.String(length=50), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ProductOutbox")
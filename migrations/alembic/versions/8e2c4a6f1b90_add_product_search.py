@@ -0,0 +1,80 @@
+"""add product search
+
+Revision ID: 8e2c4a6f1b90
+Revises: 5b1f0c9a7d3e
+Create Date: 2024-07-27 09:41:53.207114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2c4a6f1b90"
+down_revision: Union[str, None] = "5b1f0c9a7d3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', sku), 'A') || "
+    "setweight(to_tsvector('english', name), 'A') || "
+    "setweight(to_tsvector('english', description), 'B')"
+)
+
+
+def upgrade() -> None:
+    # a stored generated column rewrites every Product row under an
+    # ACCESS EXCLUSIVE lock: reads and writes wait until it is filled, so
+    # run this revision in a maintenance window on large catalogues
+    op.add_column(
+        "Product",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=False,
+        ),
+    )
+    # pg_trgm ships with contrib; skip the fuzzy indexes where it is missing,
+    # the adapter's warm_up then turns trigram search off
+    trigram_available = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT 1 FROM pg_available_extensions "
+                "WHERE name = 'pg_trgm'"
+            )
+        )
+        .scalar()
+    )
+    if trigram_available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # the indexes at least build without holding the table lock
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_product_search_vector",
+            "Product",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        if trigram_available:
+            for column in ("sku", "name"):
+                op.create_index(
+                    f"ix_product_{column}_trgm",
+                    "Product",
+                    [column],
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS "ix_product_name_trgm"')
+    op.execute('DROP INDEX IF EXISTS "ix_product_sku_trgm"')
+    op.drop_index("ix_product_search_vector", table_name="Product")
+    op.drop_column("Product", "search_vector")
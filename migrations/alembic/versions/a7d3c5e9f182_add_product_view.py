@@ -0,0 +1,82 @@
+"""add product view
+
+Revision ID: a7d3c5e9f182
+Revises: f6a2b8d4c015
+Create Date: 2024-08-17 09:41:27.306114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3c5e9f182"
+down_revision: Union[str, None] = "f6a2b8d4c015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ProductView",
+        sa.Column("sku", sa.String(length=50), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("image_url", sa.String(length=255), nullable=False),
+        sa.Column("price_id", sa.UUID(), nullable=True),
+        sa.Column("price_value", sa.Float(), nullable=True),
+        sa.Column("price_discount_percent", sa.Float(), nullable=True),
+        sa.Column(
+            "price_discounted_price",
+            sa.Float(),
+            sa.Computed(
+                "price_value - price_value * price_discount_percent",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        sa.Column("inventory_id", sa.UUID(), nullable=True),
+        sa.Column("inventory_quantity", sa.Integer(), nullable=True),
+        sa.Column("inventory_reserved", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.UUID(), nullable=True),
+        sa.Column("category_name", sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint("sku"),
+    )
+    op.create_index(
+        "ix_product_view_category_name", "ProductView", ["category_name"]
+    )
+    op.create_index(
+        "ix_product_view_discounted_price",
+        "ProductView",
+        ["price_discounted_price"],
+    )
+    op.create_index(
+        "ix_product_view_in_stock",
+        "ProductView",
+        ["sku"],
+        postgresql_where=sa.text("inventory_quantity > inventory_reserved"),
+    )
+    op.execute(
+        'INSERT INTO "ProductView" (sku, id, version, name, description, '
+        "image_url, price_id, price_value, price_discount_percent, "
+        "inventory_id, inventory_quantity, inventory_reserved, "
+        "category_id, category_name) "
+        "SELECT p.sku, p.id, p.version, p.name, p.description, "
+        "p.image_url, p.price_id, pr.value, pr.discount_percent, "
+        "p.inventory_id, i.quantity, i.reserved, p.category_id, c.name "
+        'FROM "Product" p '
+        'LEFT JOIN "Price" pr ON pr.id = p.price_id '
+        'LEFT JOIN "Inventory" i ON i.id = p.inventory_id '
+        'LEFT JOIN "Category" c ON c.id = p.category_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_view_in_stock", table_name="ProductView")
+    op.drop_index("ix_product_view_discounted_price", table_name="ProductView")
+    op.drop_index("ix_product_view_category_name", table_name="ProductView")
+    op.drop_table("ProductView")
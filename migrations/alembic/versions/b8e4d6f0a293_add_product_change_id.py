@@ -0,0 +1,58 @@
+"""add product change id
+
+Revision ID: b8e4d6f0a293
+Revises: a7d3c5e9f182
+Create Date: 2024-08-24 10:12:48.530217
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4d6f0a293"
+down_revision: Union[str, None] = "a7d3c5e9f182"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("Product", "ProductView"):
+        op.add_column(
+            table,
+            sa.Column(
+                "change_id",
+                sa.BigInteger(),
+                server_default=sa.text("txid_current()"),
+                nullable=False,
+            ),
+        )
+    op.create_index("ix_product_change_id", "Product", ["change_id"])
+    op.create_index("ix_product_view_change_id", "ProductView", ["change_id"])
+    op.create_table(
+        "ProductTombstone",
+        sa.Column("sku", sa.String(length=50), nullable=False),
+        sa.Column(
+            "change_id",
+            sa.BigInteger(),
+            server_default=sa.text("txid_current()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sku"),
+    )
+    op.create_index(
+        "ix_product_tombstone_change_id", "ProductTombstone", ["change_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_product_tombstone_change_id", table_name="ProductTombstone"
+    )
+    op.drop_table("ProductTombstone")
+    op.drop_index("ix_product_view_change_id", table_name="ProductView")
+    op.drop_index("ix_product_change_id", table_name="Product")
+    op.drop_column("ProductView", "change_id")
+    op.drop_column("Product", "change_id")
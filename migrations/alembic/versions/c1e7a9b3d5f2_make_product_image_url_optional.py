@@ -0,0 +1,44 @@
+"""make product image url optional
+
+Revision ID: c1e7a9b3d5f2
+Revises: b8e4d6f0a293
+Create Date: 2024-08-31 09:05:12.684301
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c1e7a9b3d5f2"
+down_revision: Union[str, None] = "b8e4d6f0a293"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("Product", "ProductView"):
+        op.alter_column(
+            table,
+            "image_url",
+            existing_type=sa.String(length=255),
+            nullable=True,
+        )
+
+
+def downgrade() -> None:
+    for table in ("Product", "ProductView"):
+        op.execute(
+            sa.text(
+                f"UPDATE \"{table}\" SET image_url = '' "
+                "WHERE image_url IS NULL"
+            )
+        )
+        op.alter_column(
+            table,
+            "image_url",
+            existing_type=sa.String(length=255),
+            nullable=False,
+        )
@@ -0,0 +1,58 @@
+"""add product filter indexes
+
+Revision ID: c3d9e1f27a64
+Revises: 8e2c4a6f1b90
+Create Date: 2024-08-03 14:12:40.551932
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d9e1f27a64"
+down_revision: Union[str, None] = "8e2c4a6f1b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "Price",
+        sa.Column(
+            "discounted_price",
+            sa.Float(),
+            sa.Computed("value - value * discount_percent", persisted=True),
+            nullable=False,
+        ),
+    )
+    # build without blocking writes to the live tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_price_discounted_price",
+            "Price",
+            ["discounted_price"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_inventory_in_stock",
+            "Inventory",
+            ["id"],
+            postgresql_where=sa.text("quantity > reserved"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_product_category_id",
+            "Product",
+            ["category_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_category_id", table_name="Product")
+    op.drop_index("ix_inventory_in_stock", table_name="Inventory")
+    op.drop_index("ix_price_discounted_price", table_name="Price")
+    op.drop_column("Price", "discounted_price")
@@ -0,0 +1,40 @@
+"""add product outbox failures
+
+Revision ID: d9f3b5a7c1e4
+Revises: c1e7a9b3d5f2
+Create Date: 2024-09-07 11:21:36.902514
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f3b5a7c1e4"
+down_revision: Union[str, None] = "c1e7a9b3d5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ProductOutbox",
+        sa.Column("failed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "ProductOutbox", sa.Column("error", sa.Text(), nullable=True)
+    )
+    op.create_index(
+        "ix_product_outbox_pending",
+        "ProductOutbox",
+        ["id"],
+        postgresql_where=sa.text("failed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_outbox_pending", table_name="ProductOutbox")
+    op.drop_column("ProductOutbox", "error")
+    op.drop_column("ProductOutbox", "failed_at")
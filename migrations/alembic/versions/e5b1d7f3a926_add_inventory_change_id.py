@@ -0,0 +1,43 @@
+"""add inventory change id
+
+Revision ID: e5b1d7f3a926
+Revises: d9f3b5a7c1e4
+Create Date: 2024-09-14 16:40:27.318745
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b1d7f3a926"
+down_revision: Union[str, None] = "d9f3b5a7c1e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nullable and defaulted afterwards, so that existing rows are not
+    # rewritten: their changes are already covered by Product.change_id
+    op.add_column(
+        "Inventory", sa.Column("change_id", sa.BigInteger(), nullable=True)
+    )
+    op.alter_column(
+        "Inventory",
+        "change_id",
+        server_default=sa.text("txid_current()"),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_change_id",
+            "Inventory",
+            ["change_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_change_id", table_name="Inventory")
+    op.drop_column("Inventory", "change_id")
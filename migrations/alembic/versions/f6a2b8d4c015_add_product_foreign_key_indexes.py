@@ -0,0 +1,39 @@
+"""add product foreign key indexes
+
+Revision ID: f6a2b8d4c015
+Revises: c3d9e1f27a64
+Create Date: 2024-08-10 11:26:05.914377
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a2b8d4c015"
+down_revision: Union[str, None] = "c3d9e1f27a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # build without blocking writes to a live Product table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_product_price_id",
+            "Product",
+            ["price_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_product_inventory_id",
+            "Product",
+            ["inventory_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_inventory_id", table_name="Product")
+    op.drop_index("ix_product_price_id", table_name="Product")
@@ -0,0 +1,120 @@
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from src.domain.events import ProductEvent
+from src.port.event_publishers import ProductEventPublisher
+
+logger = logging.getLogger("app")
+
+_STOP = object()
+
+
+class BufferedProductEventPublisher(ProductEventPublisher):
+    def __init__(
+        self,
+        product_event_publisher: ProductEventPublisher,
+        batch_size: int = 10,
+        flush_interval_seconds: float = 0.5,
+        max_buffer_size: int = 10000,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.2,
+    ) -> None:
+        self.__product_event_publisher = product_event_publisher
+        self.__batch_size = batch_size
+        self.__flush_interval_seconds = flush_interval_seconds
+        self.__max_retries = max_retries
+        self.__retry_backoff_seconds = retry_backoff_seconds
+        self.__queue: "queue.Queue[object]" = queue.Queue(
+            maxsize=max_buffer_size
+        )
+        self.__worker: Optional[threading.Thread] = None
+        self.__dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Events dropped because the buffer was full or their batch kept
+        failing to publish."""
+        return self.__dropped
+
+    def start(self) -> None:
+        if self.__worker is not None:
+            return
+        self.__worker = threading.Thread(
+            target=self.__run, name="product-event-publisher", daemon=True
+        )
+        self.__worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self.__worker is None:
+            return
+        self.__queue.put(_STOP)
+        self.__worker.join(timeout=timeout)
+        self.__worker = None
+
+    def publish(self, product_event: ProductEvent) -> None:
+        if self.__worker is None:
+            self.__product_event_publisher.publish(product_event=product_event)
+            return
+        try:
+            self.__queue.put_nowait(product_event)
+        except queue.Full:
+            # never block the request path on a stalled broker
+            self.__dropped += 1
+            logger.error(
+                f"Dropping product event, buffer is full "
+                f"({self.__dropped} dropped so far): {product_event.to_json()}"
+            )
+
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        for product_event in product_events:
+            self.publish(product_event=product_event)
+
+    def __run(self) -> None:
+        batch: List[ProductEvent] = []
+        deadline = 0.0
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(deadline - time.monotonic(), 0)
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self.__flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.__flush_interval_seconds
+                batch.append(item)  # type: ignore
+            if len(batch) >= self.__batch_size or (
+                batch and time.monotonic() >= deadline
+            ):
+                self.__flush(batch)
+                batch = []
+
+    def __flush(self, batch: List[ProductEvent]) -> None:
+        if not batch:
+            return
+        for attempt in range(1, self.__max_retries + 1):
+            try:
+                self.__product_event_publisher.publish_batch(
+                    product_events=batch
+                )
+                return
+            except Exception as error:
+                logger.error(
+                    f"Error publishing {len(batch)} product events "
+                    f"(attempt {attempt}/{self.__max_retries}): {error}"
+                )
+                if attempt < self.__max_retries:
+                    time.sleep(self.__retry_backoff_seconds * attempt)
+        self.__dropped += len(batch)
+        logger.error(
+            f"Dropping {len(batch)} product events: "
+            f"{[product_event.to_json() for product_event in batch]}"
+        )
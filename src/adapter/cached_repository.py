@@ -0,0 +1,428 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+from src.domain.entities.product import Product
+from src.domain.value_objects import Inventory
+from src.port import ProductRepository
+from src.port.cache import Cache
+from src.utils.lru_cache import LRUCache
+
+logger = logging.getLogger("app")
+
+KEY_PREFIX = "product:"
+LOCK_PREFIX = "lock:product:"
+TOMBSTONE = b""
+
+
+class CachedProductRepository(ProductRepository):
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        cache: Optional[LRUCache] = None,
+        shared_cache: Optional[Cache] = None,
+        shared_cache_ttl_seconds: float = 300,
+        lock_ttl_seconds: float = 5,
+        lock_poll_interval_seconds: float = 0.05,
+        tombstone_ttl_seconds: float = 5,
+    ) -> None:
+        self.__product_repository = product_repository
+        self.__cache = cache
+        self.__shared_cache = shared_cache
+        self.__shared_cache_ttl_seconds = shared_cache_ttl_seconds
+        self.__lock_ttl_seconds = lock_ttl_seconds
+        self.__lock_poll_interval_seconds = lock_poll_interval_seconds
+        self.__tombstone_ttl_seconds = tombstone_ttl_seconds
+        self.__loading: Dict[str, "asyncio.Future[Product]"] = {}
+        self.__writes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        if self.__cache is None:
+            return {}
+        return self.__cache.stats
+
+    @staticmethod
+    def __serialize(product: Product) -> bytes:
+        return orjson.dumps(product.to_dict())
+
+    @staticmethod
+    def __deserialize(value: bytes) -> Product:
+        return Product.from_dict(orjson.loads(value))
+
+    def __decode(self, value: bytes) -> Optional[Product]:
+        try:
+            return self.__deserialize(value)
+        except Exception as error:
+            logger.error(error)
+            return None
+
+    async def __shared_get(self, sku: str) -> Optional[bytes]:
+        if self.__shared_cache is None:
+            return None
+        try:
+            return await self.__shared_cache.get(KEY_PREFIX + sku)
+        except Exception as error:
+            logger.error(error)
+            return None
+
+    async def __shared_get_many(self, skus: List[str]) -> List[Product]:
+        if self.__shared_cache is None or not skus:
+            return []
+        try:
+            values = await self.__shared_cache.get_many(
+                [KEY_PREFIX + sku for sku in skus]
+            )
+            return [
+                self.__deserialize(value)
+                for value in values
+                if value is not None and value != TOMBSTONE
+            ]
+        except Exception as error:
+            logger.error(error)
+            return []
+
+    async def __shared_set(self, product: Product) -> None:
+        """Fill the shared cache unless the key is taken, so a load that
+        read the database before another process invalidated the product
+        can not overwrite the tombstone left by that invalidation."""
+        if self.__shared_cache is None:
+            return
+        try:
+            await self.__shared_cache.add(
+                KEY_PREFIX + product.sku,
+                self.__serialize(product),
+                ttl_seconds=self.__shared_cache_ttl_seconds,
+            )
+        except Exception as error:
+            logger.error(error)
+
+    async def __invalidate(self, *skus: str) -> None:
+        self.__writes += 1
+        if self.__cache is not None:
+            for sku in skus:
+                self.__cache.delete(sku)
+        if self.__shared_cache is not None:
+            try:
+                await asyncio.gather(
+                    *(
+                        self.__shared_cache.set(
+                            KEY_PREFIX + sku,
+                            TOMBSTONE,
+                            ttl_seconds=self.__tombstone_ttl_seconds,
+                        )
+                        for sku in skus
+                    )
+                )
+            except Exception as error:
+                logger.error(error)
+
+    async def __acquire_lock(self, sku: str) -> bool:
+        try:
+            return await self.__shared_cache.add(  # type: ignore
+                LOCK_PREFIX + sku, b"1", ttl_seconds=self.__lock_ttl_seconds
+            )
+        except Exception as error:
+            logger.error(error)
+            return True
+
+    async def __release_lock(self, sku: str) -> None:
+        try:
+            await self.__shared_cache.delete(LOCK_PREFIX + sku)  # type: ignore
+        except Exception as error:
+            logger.error(error)
+
+    async def __load(self, sku: str, on_not_found: Exception) -> Product:
+        writes = self.__writes
+        value = await self.__shared_get(sku)
+        product = None
+        if value is None and self.__shared_cache is not None:
+            if await self.__acquire_lock(sku):
+                try:
+                    product = (
+                        await self.__product_repository.get_product_by_sku(
+                            sku=sku, on_not_found=on_not_found
+                        )
+                    )
+                    if writes == self.__writes:
+                        await self.__shared_set(product)
+                finally:
+                    await self.__release_lock(sku)
+            else:
+                product = await self.__wait_for_shared(sku)
+        elif value is not None and value != TOMBSTONE:
+            product = self.__decode(value)
+        if product is None:
+            product = await self.__product_repository.get_product_by_sku(
+                sku=sku, on_not_found=on_not_found
+            )
+        if self.__cache is not None and writes == self.__writes:
+            self.__cache.set(sku, product)
+        return product
+
+    async def __wait_for_shared(self, sku: str) -> Optional[Product]:
+        attempts = int(
+            self.__lock_ttl_seconds / self.__lock_poll_interval_seconds
+        )
+        for _ in range(attempts):
+            await asyncio.sleep(self.__lock_poll_interval_seconds)
+            value = await self.__shared_get(sku)
+            if value == TOMBSTONE:
+                return None
+            if value is not None:
+                return self.__decode(value)
+        return None
+
+    async def create_product(
+        self,
+        product: Product,
+        on_duplicate_sku: Exception,
+        on_not_found: Exception,
+    ) -> Product:
+        try:
+            return await self.__product_repository.create_product(
+                product=product,
+                on_duplicate_sku=on_duplicate_sku,
+                on_not_found=on_not_found,
+            )
+        finally:
+            await self.__invalidate(product.sku)
+
+    async def create_products(self, products: List[Product]) -> List[Product]:
+        try:
+            return await self.__product_repository.create_products(
+                products=products
+            )
+        finally:
+            await self.__invalidate(*(product.sku for product in products))
+
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        if self.__cache is not None:
+            product: Optional[Product] = self.__cache.get(sku)
+            if product is not None:
+                return product
+
+        loading = self.__loading.get(sku)
+        if loading is None:
+            loading = asyncio.ensure_future(self.__load(sku, on_not_found))
+            self.__loading[sku] = loading
+            loading.add_done_callback(lambda _: self.__loading.pop(sku, None))
+        return await asyncio.shield(loading)
+
+    async def get_product_revision(
+        self, sku: str, on_not_found: Exception
+    ) -> Tuple[int, Optional[int]]:
+        if self.__cache is not None:
+            product: Optional[Product] = self.__cache.get(sku)
+            if product is not None and product.version is not None:
+                inventory = product.inventory
+                return product.version, (
+                    inventory.reserved if inventory else None
+                )
+        return await self.__product_repository.get_product_revision(
+            sku=sku, on_not_found=on_not_found
+        )
+
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        writes = self.__writes
+        found: Dict[str, Product] = {}
+        if self.__cache is not None:
+            for sku in skus:
+                product = self.__cache.get(sku)
+                if product is not None:
+                    found[sku] = product
+        for product in await self.__shared_get_many(
+            [sku for sku in skus if sku not in found]
+        ):
+            found[product.sku] = product
+            if self.__cache is not None and writes == self.__writes:
+                self.__cache.set(product.sku, product)
+        missing_skus = [sku for sku in skus if sku not in found]
+        if missing_skus:
+            products = await self.__product_repository.get_products_by_skus(
+                skus=missing_skus
+            )
+            for product in products:
+                found[product.sku] = product
+                if self.__cache is not None and writes == self.__writes:
+                    self.__cache.set(product.sku, product)
+            if writes == self.__writes:
+                await asyncio.gather(
+                    *(self.__shared_set(product) for product in products)
+                )
+        return [found[sku] for sku in skus if sku in found]
+
+    async def list_products(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> List[Product]:
+        return await self.__product_repository.list_products(
+            limit=limit,
+            after_sku=after_sku,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+        )
+
+    def export_products(
+        self,
+        batch_size: int,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = None,
+    ) -> AsyncIterator[List[Product]]:
+        return self.__product_repository.export_products(
+            batch_size=batch_size,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            changed_since=changed_since,
+        )
+
+    def export_deleted_skus(
+        self, batch_size: int, changed_since: int
+    ) -> AsyncIterator[List[str]]:
+        return self.__product_repository.export_deleted_skus(
+            batch_size=batch_size, changed_since=changed_since
+        )
+
+    async def get_change_watermark(self) -> int:
+        return await self.__product_repository.get_change_watermark()
+
+    async def count_products_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Dict[str, int]:
+        return await self.__product_repository.count_products_by_category(
+            min_price=min_price, max_price=max_price, in_stock=in_stock
+        )
+
+    async def search_products(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[Product, float]]:
+        return await self.__product_repository.search_products(
+            query=query, limit=limit, after=after
+        )
+
+    async def update_product(
+        self,
+        product: Product,
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_duplicate: Exception,
+        expected_version: Optional[int] = None,
+    ) -> Product:
+        try:
+            return await self.__product_repository.update_product(
+                product=product,
+                on_not_found=on_not_found,
+                on_outdated_version=on_outdated_version,
+                on_duplicate=on_duplicate,
+                expected_version=expected_version,
+            )
+        finally:
+            await self.__invalidate(product.sku)
+
+    async def patch_product(
+        self,
+        product: Product,
+        changes: Dict[str, Any],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        expected_version: int,
+    ) -> Product:
+        try:
+            return await self.__product_repository.patch_product(
+                product=product,
+                changes=changes,
+                on_not_found=on_not_found,
+                on_outdated_version=on_outdated_version,
+                expected_version=expected_version,
+            )
+        finally:
+            await self.__invalidate(product.sku)
+
+    async def list_prices(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        skus: Optional[List[str]] = None,
+    ) -> List[Tuple[str, float, float]]:
+        return await self.__product_repository.list_prices(
+            limit=limit, after_sku=after_sku, category=category, skus=skus
+        )
+
+    async def update_prices(
+        self,
+        skus: List[str],
+        values: List[float],
+        discount_percents: List[float],
+        expected_values: List[float],
+        expected_discount_percents: List[float],
+    ) -> List[Product]:
+        try:
+            return await self.__product_repository.update_prices(
+                skus=skus,
+                values=values,
+                discount_percents=discount_percents,
+                expected_values=expected_values,
+                expected_discount_percents=expected_discount_percents,
+            )
+        finally:
+            await self.__invalidate(*skus)
+
+    async def reserve_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        try:
+            return await self.__product_repository.reserve_inventory(
+                quantities=quantities,
+                on_not_found=on_not_found,
+                on_insufficient=on_insufficient,
+            )
+        finally:
+            await self.__invalidate(*quantities)
+
+    async def release_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        try:
+            return await self.__product_repository.release_inventory(
+                quantities=quantities,
+                on_not_found=on_not_found,
+                on_insufficient=on_insufficient,
+            )
+        finally:
+            await self.__invalidate(*quantities)
+
+    async def delete_product(self, sku: str, on_not_found: Exception) -> bool:
+        try:
+            return await self.__product_repository.delete_product(
+                sku=sku, on_not_found=on_not_found
+            )
+        finally:
+            await self.__invalidate(sku)
@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class InventoryDTO(BaseModel):
@@ -44,6 +44,34 @@ class ProductRequestDTO(BaseModel):
     }
 
 
+class InventoryPatchDTO(BaseModel):
+    quantity: Optional[int] = None
+    reserved: Optional[int] = None
+
+
+class PricePatchDTO(BaseModel):
+    value: Optional[float] = None
+    discount_percent: Optional[float] = None
+
+
+class ProductPatchRequestDTO(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    price: Optional[PricePatchDTO] = None
+    inventory: Optional[InventoryPatchDTO] = None
+    category: Optional[CategoryDTO] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"price": {"value": 9.5}},
+                {"inventory": {"quantity": 42}},
+            ]
+        }
+    }
+
+
 class ProductResponseDTO(BaseModel):
     id: Optional[UUID]
     sku: str
@@ -53,3 +81,77 @@ class ProductResponseDTO(BaseModel):
     price: Optional[PriceDTO] = None
     inventory: Optional[InventoryDTO] = None
     category: Optional[CategoryDTO] = None
+
+
+class ProductImportFailureDTO(BaseModel):
+    index: int
+    sku: Optional[str] = None
+    error: str
+
+
+class ProductImportResponseDTO(BaseModel):
+    created: int
+    failed: List[ProductImportFailureDTO]
+
+
+class ProductBatchGetRequestDTO(BaseModel):
+    skus: List[str] = Field(min_length=1, max_length=100)
+
+    model_config = {
+        "json_schema_extra": {"examples": [{"skus": ["00056789", "00056790"]}]}
+    }
+
+
+class ProductBatchGetResponseDTO(BaseModel):
+    products: List[ProductResponseDTO]
+    missing: List[str]
+
+
+class ProductListResponseDTO(BaseModel):
+    products: List[ProductResponseDTO]
+    next_cursor: Optional[str] = None
+
+
+class CategoryFacetDTO(BaseModel):
+    name: str
+    count: int
+
+
+class ProductFacetsResponseDTO(BaseModel):
+    categories: List[CategoryFacetDTO]
+
+
+class InventoryReservationDTO(BaseModel):
+    quantity: int = Field(gt=0)
+
+
+class InventoryLineDTO(BaseModel):
+    sku: str
+    quantity: int = Field(gt=0)
+
+
+class InventoryBatchReservationDTO(BaseModel):
+    lines: List[InventoryLineDTO] = Field(min_length=1, max_length=100)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "lines": [
+                        {"sku": "00056789", "quantity": 2},
+                        {"sku": "00056790", "quantity": 1},
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class InventoryLineResponseDTO(BaseModel):
+    sku: str
+    quantity: int
+    reserved: int
+
+
+class InventoryBatchResponseDTO(BaseModel):
+    inventories: List[InventoryLineResponseDTO]
@@ -4,3 +4,7 @@ class SqsException(Exception):
 
 class DatabaseException(Exception):
     pass
+
+
+class CacheException(Exception):
+    pass
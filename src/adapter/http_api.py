@@ -1,22 +1,57 @@
+import asyncio
+import hashlib
 import logging
+import zlib
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from fastapi import APIRouter, HTTPException
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from src.adapter.dto import (
-    CategoryDTO,
-    InventoryDTO,
-    PriceDTO,
+    CategoryFacetDTO,
+    InventoryBatchReservationDTO,
+    InventoryBatchResponseDTO,
+    InventoryLineResponseDTO,
+    InventoryReservationDTO,
+    ProductBatchGetRequestDTO,
+    ProductBatchGetResponseDTO,
+    ProductFacetsResponseDTO,
+    ProductImportFailureDTO,
+    ProductImportResponseDTO,
+    ProductListResponseDTO,
+    ProductPatchRequestDTO,
     ProductRequestDTO,
     ProductResponseDTO,
 )
+from src.adapter.json_response import ProductJSONResponse, encode_lines
 from src.config import get_config
 from src.domain.entities import Category, Product
 from src.domain.exceptions import (
     DuplicatedProduct,
+    InsufficientInventory,
+    InvalidCursor,
     InvalidDescription,
     InvalidImageUrl,
     InvalidInventory,
     InvalidName,
     InvalidPrice,
+    InvalidSearchQuery,
     InvalidSku,
     OutdatedProduct,
     ProductAlreadyExist,
@@ -28,79 +63,222 @@ from src.domain.value_objects import Inventory, Price
 config = get_config()
 logger = logging.getLogger("app")
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_WATERMARK_HEADER = "X-Export-Watermark"
+
 
 class HTTPApiAdapter:
     def __init__(self, catalogue_service: CatalogueService) -> None:
         self.__catalogue_service = catalogue_service
         self.router = APIRouter()
         self.router.add_api_route(
-            "/product", self.create_product, methods=["POST"]
+            "/product",
+            self.create_product,
+            methods=["POST"],
+            response_model=ProductResponseDTO,
+            response_class=ProductJSONResponse,
+        )
+        self.router.add_api_route(
+            "/products:import",
+            self.import_products,
+            methods=["POST"],
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "array",
+                                "items": ProductRequestDTO.model_json_schema(),
+                            }
+                        },
+                        NDJSON_MEDIA_TYPE: {
+                            "schema": ProductRequestDTO.model_json_schema()
+                        },
+                    },
+                }
+            },
+        )
+        self.router.add_api_route(
+            "/products",
+            self.list_products,
+            methods=["GET"],
+            response_model=ProductListResponseDTO,
+            response_class=ProductJSONResponse,
+        )
+        self.router.add_api_route(
+            "/products:export",
+            self.export_products,
+            methods=["GET"],
+            response_class=StreamingResponse,
+            responses={
+                200: {
+                    "content": {
+                        NDJSON_MEDIA_TYPE: {
+                            "schema": ProductResponseDTO.model_json_schema()
+                        }
+                    }
+                }
+            },
+        )
+        self.router.add_api_route(
+            "/products/search",
+            self.search_products,
+            methods=["GET"],
+            response_model=ProductListResponseDTO,
+            response_class=ProductJSONResponse,
+        )
+        self.router.add_api_route(
+            "/products/facets", self.get_product_facets, methods=["GET"]
         )
         self.router.add_api_route(
-            "/product/{sku}", self.get_product_by_sku, methods=["GET"]
+            "/products:batchGet",
+            self.get_products_by_skus,
+            methods=["POST"],
+            response_model=ProductBatchGetResponseDTO,
+            response_class=ProductJSONResponse,
         )
         self.router.add_api_route(
-            "/product/{sku}", self.update_product, methods=["PUT"]
+            "/product/{sku}",
+            self.get_product_by_sku,
+            methods=["GET"],
+            response_model=ProductResponseDTO,
+            response_class=ProductJSONResponse,
+            responses={304: {"description": "Not Modified"}},
+        )
+        self.router.add_api_route(
+            "/product/{sku}",
+            self.update_product,
+            methods=["PUT"],
+            response_model=ProductResponseDTO,
+            response_class=ProductJSONResponse,
+            responses={412: {"description": "Precondition Failed"}},
+        )
+        self.router.add_api_route(
+            "/product/{sku}",
+            self.patch_product,
+            methods=["PATCH"],
+            response_model=ProductResponseDTO,
+            response_class=ProductJSONResponse,
+            responses={412: {"description": "Precondition Failed"}},
         )
         self.router.add_api_route(
             "/product/{sku}", self.delete_product, methods=["DELETE"]
         )
+        self.router.add_api_route(
+            "/product/{sku}/inventory:reserve",
+            self.reserve_inventory,
+            methods=["POST"],
+        )
+        self.router.add_api_route(
+            "/product/{sku}/inventory:release",
+            self.release_inventory,
+            methods=["POST"],
+        )
+        self.router.add_api_route(
+            "/products:reserveInventory",
+            self.reserve_inventories,
+            methods=["POST"],
+        )
+        self.router.add_api_route(
+            "/products:releaseInventory",
+            self.release_inventories,
+            methods=["POST"],
+        )
+
+    @staticmethod
+    def __product_fields(product: ProductRequestDTO) -> Dict[str, Any]:
+        inventory = None
+        price = None
+        category = None
+        if product.inventory is not None:
+            inventory = Inventory(
+                quantity=product.inventory.quantity,
+                reserved=product.inventory.reserved or 0,
+            )
+        if product.price is not None:
+            price = Price(
+                value=product.price.value,
+                discount_percent=product.price.discount_percent,
+            )
+
+        if product.category is not None:
+            category = Category(name=product.category.name)
+
+        return {
+            "sku": product.sku,
+            "name": product.name,
+            "description": product.description,
+            "image_url": product.image_url,
+            "price": price,
+            "inventory": inventory,
+            "category": category,
+        }
+
+    @staticmethod
+    def __etag(
+        sku: str, version: Optional[int], reserved: Optional[int]
+    ) -> str:
+        # reservations leave the product version alone, so the reserved
+        # count is part of the tag to keep it in step with the body
+        revision = (
+            f"{version}" if reserved is None else f"{version}.{reserved}"
+        )
+        digest = hashlib.sha1(f"{sku}:{revision}".encode()).hexdigest()
+        return f'"{revision}-{digest[:16]}"'
 
-    def create_product(self, product: ProductRequestDTO) -> ProductResponseDTO:
+    @classmethod
+    def __product_etag(cls, product: Product) -> str:
+        inventory = product.inventory
+        return cls.__etag(
+            product.sku,
+            product.version,
+            inventory.reserved if inventory else None,
+        )
+
+    @classmethod
+    def __version_from_etag(cls, sku: str, header: str) -> Optional[int]:
+        tag = header.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        version, _, reserved = tag.strip('"').split("-", 1)[0].partition(".")
         try:
-            inventory = None
-            price = None
-            category = None
-            if product.inventory is not None:
-                inventory = Inventory(
-                    quantity=product.inventory.quantity,
-                    reserved=product.inventory.reserved or 0,
-                )
-            if product.price is not None:
-                price = Price(
-                    value=product.price.value,
-                    discount_percent=product.price.discount_percent,
-                )
+            revision = (int(version), int(reserved) if reserved else None)
+        except ValueError:
+            return None
+        return revision[0] if cls.__etag(sku, *revision) == tag else None
 
-            if product.category is not None:
-                category = Category(name=product.category.name)
+    @staticmethod
+    def __etag_matches(header: str, etag: str) -> bool:
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in (
+            tag[2:] if tag.startswith("W/") else tag for tag in tags
+        )
 
-            created_product: Product = self.__catalogue_service.create_product(
-                sku=product.sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
+    @classmethod
+    def __expected_version(
+        cls, sku: str, if_match: Optional[str]
+    ) -> Optional[int]:
+        if not if_match or if_match.strip() == "*":
+            return None
+        expected_version = cls.__version_from_etag(sku, if_match)
+        if expected_version is None:
+            raise HTTPException(
+                status_code=412,
+                detail="Error updating product: If-Match does not match",
             )
+        return expected_version
 
-            inventory_dto = None
-            price_dto = None
-            category_dto = None
-            if created_product.price:
-                price_dto = PriceDTO(
-                    value=created_product.price.value,
-                    discount_percent=created_product.price.discount_percent,
-                )
-            if created_product.inventory:
-                inventory_dto = InventoryDTO(
-                    quantity=created_product.inventory.quantity,
-                    reserved=created_product.inventory.reserved,
+    async def create_product(
+        self, product: ProductRequestDTO
+    ) -> ProductJSONResponse:
+        try:
+            created_product: Product = (
+                await self.__catalogue_service.create_product(
+                    **self.__product_fields(product)
                 )
-            if created_product.category:
-                category_dto = CategoryDTO(name=created_product.category.name)
-
-            return ProductResponseDTO(
-                id=created_product.id,
-                sku=created_product.sku,
-                name=created_product.name,
-                description=created_product.description,
-                image_url=created_product.image_url,
-                price=price_dto,
-                inventory=inventory_dto,
-                category=category_dto,
             )
+            return ProductJSONResponse(created_product)
 
         except (
             InvalidSku,
@@ -125,33 +303,124 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error creating product: {error}"
             )
 
-    def get_product_by_sku(self, sku: str) -> ProductResponseDTO:
-        try:
-            product = self.__catalogue_service.get_product_by_sku(sku=sku)
-            price = None
-            inventory = None
-            category = None
-            if product.price:
-                price = PriceDTO(
-                    value=product.price.value,
-                    discount_percent=product.price.discount_percent,
+    @staticmethod
+    async def __read_import_rows(
+        request: Request,
+    ) -> AsyncIterator[Union[bytes, Any]]:
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith(NDJSON_MEDIA_TYPE):
+            buffer = b""
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield line
+            if buffer.strip():
+                yield buffer
+            return
+
+        rows = await request.json()
+        if not isinstance(rows, list):
+            raise ValueError("Request body must be a list of products")
+        for row in rows:
+            yield row
+
+    async def __import_batch(
+        self,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        failed: List[ProductImportFailureDTO],
+    ) -> int:
+        created_products, failures = (
+            await self.__catalogue_service.import_products(
+                products=[fields for _, fields in batch]
+            )
+        )
+        for position, error in failures:
+            index, fields = batch[position]
+            failed.append(
+                ProductImportFailureDTO(
+                    index=index, sku=fields["sku"], error=error
                 )
-            if product.inventory:
-                inventory = InventoryDTO(
-                    quantity=product.inventory.quantity,
-                    reserved=product.inventory.reserved,
+            )
+        return len(created_products)
+
+    async def import_products(
+        self, request: Request
+    ) -> ProductImportResponseDTO:
+        created = 0
+        failed: List[ProductImportFailureDTO] = []
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        index = 0
+        try:
+            async for row in self.__read_import_rows(request):
+                product = None
+                try:
+                    if isinstance(row, bytes):
+                        product = ProductRequestDTO.model_validate_json(row)
+                    else:
+                        product = ProductRequestDTO.model_validate(row)
+                    batch.append((index, self.__product_fields(product)))
+                except ValidationError as error:
+                    failed.append(
+                        ProductImportFailureDTO(
+                            index=index,
+                            error="; ".join(
+                                ".".join(str(loc) for loc in detail["loc"])
+                                + f": {detail['msg']}"
+                                for detail in error.errors()
+                            ),
+                        )
+                    )
+                except (InvalidInventory, InvalidName, InvalidPrice) as error:
+                    failed.append(
+                        ProductImportFailureDTO(
+                            index=index,
+                            sku=product.sku if product else None,
+                            error=str(error),
+                        )
+                    )
+                index += 1
+                if len(batch) >= config.IMPORT_BATCH_SIZE:
+                    created += await self.__import_batch(batch, failed)
+                    batch = []
+            if batch:
+                created += await self.__import_batch(batch, failed)
+        except ValueError as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error importing products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error importing products: {error}"
+            )
+
+        failed.sort(key=lambda failure: failure.index)
+        return ProductImportResponseDTO(created=created, failed=failed)
+
+    async def get_product_by_sku(
+        self,
+        sku: str,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+    ) -> Response:
+        try:
+            if if_none_match:
+                version, reserved = (
+                    await self.__catalogue_service.get_product_revision(
+                        sku=sku
+                    )
                 )
-            if product.category:
-                category = CategoryDTO(name=product.category.name)
-            return ProductResponseDTO(
-                id=product.id,
-                sku=product.sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
+                etag = self.__etag(sku, version, reserved)
+                if self.__etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+            product = await self.__catalogue_service.get_product_by_sku(
+                sku=sku
+            )
+            return ProductJSONResponse(
+                product,
+                headers={"ETag": self.__product_etag(product)},
             )
         except InvalidSku as error:
             logger.error(error)
@@ -169,9 +438,213 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error getting product: {error}"
             )
 
-    def update_product(
-        self, sku: str, product: ProductRequestDTO
-    ) -> ProductResponseDTO:
+    async def list_products(
+        self,
+        limit: int = Query(
+            default=config.LIST_PAGE_SIZE, ge=1, le=config.LIST_MAX_PAGE_SIZE
+        ),
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = Query(default=None, ge=0),
+        max_price: Optional[float] = Query(default=None, ge=0),
+        in_stock: Optional[bool] = None,
+    ) -> ProductJSONResponse:
+        try:
+            products, next_cursor = (
+                await self.__catalogue_service.list_products(
+                    limit=limit,
+                    cursor=cursor,
+                    category=category,
+                    min_price=min_price,
+                    max_price=max_price,
+                    in_stock=in_stock,
+                )
+            )
+            return ProductJSONResponse(
+                {"products": products, "next_cursor": next_cursor}
+            )
+        except (InvalidCursor, InvalidPrice) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error listing products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error listing products: {error}"
+            )
+
+    @staticmethod
+    def __accepts_gzip(accept_encoding: Optional[str]) -> bool:
+        for coding in (accept_encoding or "").split(","):
+            name, _, params = coding.partition(";")
+            if name.strip().lower() == "gzip":
+                quality = params.replace(" ", "").partition("q=")[2]
+                try:
+                    return float(quality or 1) > 0
+                except ValueError:
+                    return False
+        return False
+
+    @staticmethod
+    async def __export_lines(
+        deleted_skus: Optional[AsyncIterator[List[str]]],
+        products: AsyncIterator[List[Product]],
+    ) -> AsyncIterator[bytes]:
+        try:
+            if deleted_skus is not None:
+                # deletions first, so a sku deleted and then created again
+                # ends up present once a consumer applies the whole feed
+                async for skus in deleted_skus:
+                    yield encode_lines(
+                        {"sku": sku, "deleted": True} for sku in skus
+                    )
+            async for batch in products:
+                yield encode_lines(batch)
+        except Exception as error:
+            # headers are already sent: all that is left is to cut the stream
+            logger.error(f"Error exporting products: {error}")
+            raise
+
+    @staticmethod
+    async def __gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        async for chunk in chunks:
+            compressed = await asyncio.to_thread(compressor.compress, chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    async def export_products(
+        self,
+        category: Optional[str] = None,
+        min_price: Optional[float] = Query(default=None, ge=0),
+        max_price: Optional[float] = Query(default=None, ge=0),
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = Query(default=None, ge=0),
+        accept_encoding: Annotated[Optional[str], Header()] = None,
+    ) -> StreamingResponse:
+        try:
+            (
+                watermark,
+                deleted_skus,
+                products,
+            ) = await self.__catalogue_service.export_products(
+                batch_size=config.EXPORT_BATCH_SIZE,
+                category=category,
+                min_price=min_price,
+                max_price=max_price,
+                in_stock=in_stock,
+                changed_since=changed_since,
+            )
+        except InvalidPrice as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error exporting products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error exporting products: {error}"
+            )
+
+        body = self.__export_lines(deleted_skus, products)
+        headers = {
+            "Vary": "Accept-Encoding",
+            EXPORT_WATERMARK_HEADER: str(watermark),
+        }
+        if self.__accepts_gzip(accept_encoding):
+            body = self.__gzip(body)
+            headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(
+            body, media_type=NDJSON_MEDIA_TYPE, headers=headers
+        )
+
+    async def get_product_facets(
+        self,
+        min_price: Optional[float] = Query(default=None, ge=0),
+        max_price: Optional[float] = Query(default=None, ge=0),
+        in_stock: Optional[bool] = None,
+    ) -> ProductFacetsResponseDTO:
+        try:
+            counts = await self.__catalogue_service.count_products_by_category(
+                min_price=min_price, max_price=max_price, in_stock=in_stock
+            )
+            return ProductFacetsResponseDTO(
+                categories=[
+                    CategoryFacetDTO(name=name, count=count)
+                    for name, count in counts.items()
+                ]
+            )
+        except InvalidPrice as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error counting products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error counting products: {error}"
+            )
+
+    async def search_products(
+        self,
+        q: str = Query(min_length=1, max_length=200),
+        limit: int = Query(
+            default=config.LIST_PAGE_SIZE, ge=1, le=config.LIST_MAX_PAGE_SIZE
+        ),
+        cursor: Optional[str] = None,
+    ) -> ProductJSONResponse:
+        try:
+            products, next_cursor = (
+                await self.__catalogue_service.search_products(
+                    query=q, limit=limit, cursor=cursor
+                )
+            )
+            return ProductJSONResponse(
+                {"products": products, "next_cursor": next_cursor}
+            )
+        except (InvalidCursor, InvalidSearchQuery) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error searching products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error searching products: {error}"
+            )
+
+    async def get_products_by_skus(
+        self, request: ProductBatchGetRequestDTO
+    ) -> ProductJSONResponse:
+        try:
+            products, missing = (
+                await self.__catalogue_service.get_products_by_skus(
+                    skus=request.skus
+                )
+            )
+            return ProductJSONResponse(
+                {"products": products, "missing": missing}
+            )
+        except InvalidSku as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error getting products: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error getting products: {error}"
+            )
+
+    async def update_product(
+        self,
+        sku: str,
+        product: ProductRequestDTO,
+        if_match: Annotated[Optional[str], Header()] = None,
+    ) -> ProductJSONResponse:
+        expected_version = self.__expected_version(sku, if_match)
         try:
             inventory = None
             price = None
@@ -188,46 +661,27 @@ class HTTPApiAdapter:
                 )
             if product.category is not None:
                 category = Category(name=product.category.name)
-            updated_product: Product = self.__catalogue_service.update_product(
-                sku=sku,
-                name=product.name,
-                description=product.description,
-                image_url=product.image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
-            )
-            inventory_dto = None
-            price_dto = None
-            category_dto = None
-            if updated_product.inventory:
-                inventory_dto = InventoryDTO(
-                    quantity=updated_product.inventory.quantity,
-                    reserved=updated_product.inventory.reserved,
+            updated_product: Product = (
+                await self.__catalogue_service.update_product(
+                    sku=sku,
+                    name=product.name,
+                    description=product.description,
+                    image_url=product.image_url,
+                    price=price,
+                    inventory=inventory,
+                    category=category,
+                    expected_version=expected_version,
                 )
-            if updated_product.price:
-                price_dto = PriceDTO(
-                    value=updated_product.price.value,
-                    discount_percent=updated_product.price.discount_percent,
-                )
-            if updated_product.category:
-                category_dto = CategoryDTO(name=updated_product.category.name)
-            return ProductResponseDTO(
-                id=updated_product.id,
-                name=updated_product.name,
-                description=updated_product.description,
-                image_url=updated_product.image_url,
-                inventory=inventory_dto,
-                price=price_dto,
-                category=category_dto,
-                sku=updated_product.sku,
+            )
+            return ProductJSONResponse(
+                updated_product,
+                headers={"ETag": self.__product_etag(updated_product)},
             )
         except (
             InvalidSku,
             InvalidPrice,
             InvalidName,
             InvalidInventory,
-            InvalidPrice,
             InvalidImageUrl,
             InvalidDescription,
         ) as error:
@@ -251,9 +705,130 @@ class HTTPApiAdapter:
                 status_code=500, detail=f"Error updating product: {error}"
             )
 
-    def delete_product(self, sku: str) -> bool:
+    async def patch_product(
+        self,
+        sku: str,
+        product: ProductPatchRequestDTO,
+        if_match: Annotated[Optional[str], Header()] = None,
+    ) -> ProductJSONResponse:
+        changes = product.model_dump(exclude_unset=True)
+        if not changes:
+            raise HTTPException(
+                status_code=400,
+                detail="Error patching product: no fields to change",
+            )
+        expected_version = self.__expected_version(sku, if_match)
+        try:
+            patched_product: Product = (
+                await self.__catalogue_service.patch_product(
+                    sku=sku,
+                    changes=changes,
+                    expected_version=expected_version,
+                )
+            )
+            return ProductJSONResponse(
+                patched_product,
+                headers={"ETag": self.__product_etag(patched_product)},
+            )
+        except (
+            InvalidSku,
+            InvalidPrice,
+            InvalidName,
+            InvalidInventory,
+            InvalidImageUrl,
+            InvalidDescription,
+        ) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error patching product: {error}"
+            )
+        except ProductNotFound as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=404, detail=f"Error patching product: {error}"
+            )
+        except OutdatedProduct as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=409, detail=f"Error patching product: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error patching product: {error}"
+            )
+
+    async def __adjust_inventory(
+        self, lines: List[Tuple[str, int]], reserve: bool
+    ) -> List[InventoryLineResponseDTO]:
+        action = "reserving" if reserve else "releasing"
+        try:
+            adjust = (
+                self.__catalogue_service.reserve_inventory
+                if reserve
+                else self.__catalogue_service.release_inventory
+            )
+            inventories = await adjust(lines=lines)
+            return [
+                InventoryLineResponseDTO(
+                    sku=sku,
+                    quantity=inventory.quantity,
+                    reserved=inventory.reserved,
+                )
+                for sku, inventory in inventories.items()
+            ]
+        except (InvalidSku, InvalidInventory) as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=400, detail=f"Error {action} inventory: {error}"
+            )
+        except ProductNotFound as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=404, detail=f"Error {action} inventory: {error}"
+            )
+        except InsufficientInventory as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=409, detail=f"Error {action} inventory: {error}"
+            )
+        except Exception as error:
+            logger.error(error)
+            raise HTTPException(
+                status_code=500, detail=f"Error {action} inventory: {error}"
+            )
+
+    async def reserve_inventory(
+        self, sku: str, reservation: InventoryReservationDTO
+    ) -> InventoryLineResponseDTO:
+        lines = [(sku, reservation.quantity)]
+        return (await self.__adjust_inventory(lines, reserve=True))[0]
+
+    async def release_inventory(
+        self, sku: str, reservation: InventoryReservationDTO
+    ) -> InventoryLineResponseDTO:
+        lines = [(sku, reservation.quantity)]
+        return (await self.__adjust_inventory(lines, reserve=False))[0]
+
+    async def reserve_inventories(
+        self, reservation: InventoryBatchReservationDTO
+    ) -> InventoryBatchResponseDTO:
+        lines = [(line.sku, line.quantity) for line in reservation.lines]
+        return InventoryBatchResponseDTO(
+            inventories=await self.__adjust_inventory(lines, reserve=True)
+        )
+
+    async def release_inventories(
+        self, reservation: InventoryBatchReservationDTO
+    ) -> InventoryBatchResponseDTO:
+        lines = [(line.sku, line.quantity) for line in reservation.lines]
+        return InventoryBatchResponseDTO(
+            inventories=await self.__adjust_inventory(lines, reserve=False)
+        )
+
+    async def delete_product(self, sku: str) -> bool:
         try:
-            self.__catalogue_service.delete_product(sku)
+            await self.__catalogue_service.delete_product(sku)
             return True
         except InvalidSku as error:
             logger.error(error)
@@ -0,0 +1,58 @@
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from src.domain.entities import Product
+
+
+def encode_product(obj: Any) -> Any:
+    """orjson ``default`` hook rendering products in the
+    ``ProductResponseDTO`` shape without building the DTOs."""
+    if isinstance(obj, Product):
+        price = obj.price
+        inventory = obj.inventory
+        category = obj.category
+        return {
+            "id": obj.id,
+            "sku": obj.sku,
+            "name": obj.name,
+            "description": obj.description,
+            "image_url": obj.image_url,
+            "price": (
+                {
+                    "value": float(price.value),
+                    "discount_percent": float(price.discount_percent),
+                }
+                if price
+                else None
+            ),
+            "inventory": (
+                {
+                    "quantity": inventory.quantity,
+                    "reserved": inventory.reserved,
+                }
+                if inventory
+                else None
+            ),
+            "category": {"name": category.name} if category else None,
+        }
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def encode_lines(items: Iterable[Any]) -> bytes:
+    """Render items as newline-delimited JSON."""
+    return b"".join(
+        orjson.dumps(
+            item, default=encode_product, option=orjson.OPT_APPEND_NEWLINE
+        )
+        for item in items
+    )
+
+
+class ProductJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=encode_product,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
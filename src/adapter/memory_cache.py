@@ -0,0 +1,36 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.port.cache import Cache
+
+
+class InMemoryCacheAdapter(Cache):
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.__clock = clock
+        self.__entries: Dict[str, Tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.__clock():
+            del self.__entries[key]
+            return None
+        return value
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.__entries[key] = (self.__clock() + ttl_seconds, value)
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl_seconds)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.__entries.pop(key, None)
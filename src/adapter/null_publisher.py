@@ -0,0 +1,9 @@
+from src.domain.events import ProductEvent
+from src.port.event_publishers import ProductEventPublisher
+
+
+class NullProductEventPublisher(ProductEventPublisher):
+    """Used when events are written to the outbox with the product change."""
+
+    def publish(self, product_event: ProductEvent) -> None:
+        return None
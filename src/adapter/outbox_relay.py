@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from src.adapter.postgres import ProductPostgresAdapter
+from src.port.event_publishers import (
+    ProductEventPublisher,
+    SerializedProductEvent,
+)
+
+logger = logging.getLogger("app")
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        product_postgres_adapter: ProductPostgresAdapter,
+        product_event_publisher: ProductEventPublisher,
+        batch_size: int = 100,
+        poll_interval_seconds: float = 1,
+    ) -> None:
+        self.__product_postgres_adapter = product_postgres_adapter
+        self.__product_event_publisher = product_event_publisher
+        self.__batch_size = batch_size
+        self.__poll_interval_seconds = poll_interval_seconds
+
+    async def __publish(
+        self, product_events: List[SerializedProductEvent]
+    ) -> Dict[UUID, str]:
+        return await asyncio.to_thread(
+            self.__product_event_publisher.publish_serialized_batch,
+            product_events=product_events,
+        )
+
+    async def relay_once(self) -> int:
+        return await self.__product_postgres_adapter.drain_outbox(
+            publish=self.__publish, limit=self.__batch_size
+        )
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                relayed = await self.relay_once()
+                if relayed:
+                    logger.info(f"Relayed {relayed} product events")
+            except Exception as error:
+                logger.error(error)
+                relayed = 0
+            if relayed < self.__batch_size:
+                try:
+                    await asyncio.wait_for(
+                        stop.wait(), timeout=self.__poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
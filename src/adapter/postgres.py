@@ -1,35 +1,127 @@
+import asyncio
 import logging
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from uuid import UUID as PythonUUID
 
 from sqlalchemy import (
     UUID,
+    BigInteger,
     Column,
+    Computed,
+    DateTime,
     Float,
     ForeignKey,
+    Identity,
+    Index,
     Integer,
     MetaData,
     String,
     Table,
     Text,
-    create_engine,
+    and_,
+    any_,
+    bindparam,
+    exists,
+    func,
     insert,
+    literal,
+    literal_column,
+    or_,
     select,
+    text,
+    true,
     update,
 )
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.engine import URL, Row, make_url
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.sql import ColumnElement, Insert, Select
+from sqlalchemy.sql.expression import CTE, Join
 from src.adapter.exceptions import DatabaseException
 from src.config import get_config
 from src.domain.entities import Category, Product
+from src.domain.enums import ProductEventType
+from src.domain.events import ProductEvent
 from src.domain.value_objects import Inventory, Price
+from src.port.event_publishers import SerializedProductEvent
 from src.port.repositories import ProductRepository
+from src.utils.lru_cache import LRUCache
 
 config = get_config()
 logger = logging.getLogger("app")
 
+OUTBOX_LOCK_ID = 7_294_003_187
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', sku), 'A') || "
+    "setweight(to_tsvector('english', name), 'A') || "
+    "setweight(to_tsvector('english', description), 'B')"
+)
+READ_MODEL_COLUMNS = [
+    "sku",
+    "id",
+    "version",
+    "name",
+    "description",
+    "image_url",
+    "price_id",
+    "price_value",
+    "price_discount_percent",
+    "inventory_id",
+    "inventory_quantity",
+    "inventory_reserved",
+    "category_id",
+    "category_name",
+    "change_id",
+]
+
 
 class ProductPostgresAdapter(ProductRepository):
-    def __init__(self, database_url) -> None:
-        self.__engine = create_engine(database_url)
+    def __init__(
+        self,
+        database_url,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        outbox_enabled: bool = False,
+        trigram_search: bool = True,
+        read_model: bool = False,
+        category_cache_size: int = 1000,
+        category_cache_ttl_seconds: float = 300,
+    ) -> None:
+        self.__pool_size = pool_size
+        self.__outbox_enabled = outbox_enabled
+        self.__trigram_search = trigram_search
+        self.__read_model = read_model
+        self.__category_ids = LRUCache(
+            max_size=category_cache_size,
+            ttl_seconds=category_cache_ttl_seconds,
+        )
+        self.__engine = create_async_engine(
+            self.async_database_url(database_url),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
         self._metadata = MetaData()
 
         self.__inventory_table = Table(
@@ -38,6 +130,15 @@ class ProductPostgresAdapter(ProductRepository):
             Column("id", UUID, primary_key=True),
             Column("quantity", Integer, nullable=False),
             Column("reserved", Integer, nullable=False, default=0),
+            Column(
+                "change_id", BigInteger, server_default=func.txid_current()
+            ),
+            Index(
+                "ix_inventory_in_stock",
+                "id",
+                postgresql_where=text("quantity > reserved"),
+            ),
+            Index("ix_inventory_change_id", "change_id"),
         )
 
         self.__price_table = Table(
@@ -46,6 +147,12 @@ class ProductPostgresAdapter(ProductRepository):
             Column("id", UUID, primary_key=True),
             Column("value", Float, nullable=False),
             Column("discount_percent", Float, nullable=False),
+            Column(
+                "discounted_price",
+                Float,
+                Computed("value - value * discount_percent"),
+            ),
+            Index("ix_price_discounted_price", "discounted_price"),
         )
 
         self.__category_table = Table(
@@ -63,88 +170,431 @@ class ProductPostgresAdapter(ProductRepository):
             Column("sku", String(50), nullable=False, unique=True),
             Column("name", String(255), nullable=False),
             Column("description", Text, nullable=False),
-            Column("image_url", String(255), nullable=False),
+            Column("image_url", String(255)),
             Column("price_id", UUID, ForeignKey("Price.id")),
             Column("inventory_id", UUID, ForeignKey("Inventory.id")),
             Column("category_id", UUID, ForeignKey("Category.id")),
+            Column("search_vector", TSVECTOR, Computed(SEARCH_VECTOR)),
+            Column(
+                "change_id",
+                BigInteger,
+                nullable=False,
+                server_default=func.txid_current(),
+            ),
+            Index("ix_product_price_id", "price_id"),
+            Index("ix_product_inventory_id", "inventory_id"),
+            Index("ix_product_category_id", "category_id"),
+            Index(
+                "ix_product_search_vector",
+                "search_vector",
+                postgresql_using="gin",
+            ),
+            Index("ix_product_change_id", "change_id"),
+        )
+
+        self.__read_model_table = Table(
+            "ProductView",
+            self._metadata,
+            Column("sku", String(50), primary_key=True),
+            Column("id", UUID, nullable=False),
+            Column("version", Integer, nullable=False),
+            Column("name", String(255), nullable=False),
+            Column("description", Text, nullable=False),
+            Column("image_url", String(255)),
+            Column("price_id", UUID),
+            Column("price_value", Float),
+            Column("price_discount_percent", Float),
+            Column(
+                "price_discounted_price",
+                Float,
+                Computed("price_value - price_value * price_discount_percent"),
+            ),
+            Column("inventory_id", UUID),
+            Column("inventory_quantity", Integer),
+            Column("inventory_reserved", Integer),
+            Column("category_id", UUID),
+            Column("category_name", String(255)),
+            Column(
+                "change_id",
+                BigInteger,
+                nullable=False,
+                server_default=func.txid_current(),
+            ),
+            Index("ix_product_view_category_name", "category_name"),
+            Index(
+                "ix_product_view_discounted_price", "price_discounted_price"
+            ),
+            Index(
+                "ix_product_view_in_stock",
+                "sku",
+                postgresql_where=text(
+                    "inventory_quantity > inventory_reserved"
+                ),
+            ),
+            Index("ix_product_view_change_id", "change_id"),
+        )
+
+        self.__outbox_table = Table(
+            "ProductOutbox",
+            self._metadata,
+            Column("id", BigInteger, Identity(), primary_key=True),
+            Column("event_id", UUID, nullable=False, unique=True),
+            Column("sku", String(50), nullable=False),
+            Column("type", String(20), nullable=False),
+            Column("payload", Text, nullable=False),
+            Column(
+                "created_at",
+                DateTime(timezone=True),
+                nullable=False,
+                server_default=func.now(),
+            ),
+            Column("failed_at", DateTime(timezone=True)),
+            Column("error", Text),
+            Index(
+                "ix_product_outbox_pending",
+                "id",
+                postgresql_where=text("failed_at IS NULL"),
+            ),
         )
 
-        self.__session = sessionmaker(autocommit=False, bind=self.__engine)
+        self.__tombstone_table = Table(
+            "ProductTombstone",
+            self._metadata,
+            Column("sku", String(50), primary_key=True),
+            Column(
+                "change_id",
+                BigInteger,
+                nullable=False,
+                server_default=func.txid_current(),
+            ),
+            Index("ix_product_tombstone_change_id", "change_id"),
+        )
+
+        self.__session = async_sessionmaker(
+            bind=self.__engine, expire_on_commit=False
+        )
+
+    @staticmethod
+    def async_database_url(database_url: str) -> URL:
+        url = make_url(database_url)
+        return url.set(drivername="postgresql+asyncpg")
 
     @property
     def metadata(self) -> MetaData:
         return self._metadata
 
-    def create_product(
+    @property
+    def trigram_search(self) -> bool:
+        return self.__trigram_search
+
+    async def warm_up(self) -> None:
+        connections = await asyncio.gather(
+            *(self.__engine.connect() for _ in range(self.__pool_size))
+        )
+        try:
+            if self.__trigram_search:
+                await self.__detect_trigram_search(connections[0])
+        finally:
+            for connection in connections:
+                await connection.close()
+        logger.info(f"Warmed up {len(connections)} database connections")
+
+    async def __detect_trigram_search(
+        self, connection: AsyncConnection
+    ) -> None:
+        # the search migration skips pg_trgm where contrib is missing
+        trigram_installed = (
+            await connection.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+        ).scalar()
+        if not trigram_installed:
+            logger.warning(
+                "pg_trgm is not installed, disabling trigram search"
+            )
+            self.__trigram_search = False
+
+    async def dispose(self) -> None:
+        await self.__engine.dispose()
+
+    async def __write_outbox(
+        self, session: AsyncSession, product_events: List[ProductEvent]
+    ) -> None:
+        if not self.__outbox_enabled or not product_events:
+            return
+        await session.execute(
+            insert(self.__outbox_table).values(
+                [
+                    {
+                        "event_id": product_event.id,
+                        "sku": (
+                            product_event.product.sku
+                            if product_event.product
+                            else product_event.sku
+                        ),
+                        "type": product_event.type.string,
+                        "payload": product_event.to_json(),
+                    }
+                    for product_event in product_events
+                ]
+            )
+        )
+
+    def __refresh_read_model_statement(
+        self, skus: Optional[List[str]] = None
+    ) -> Insert:
+        rows = select(
+            self.__product_table.c.sku,
+            self.__product_table.c.id,
+            self.__product_table.c.version,
+            self.__product_table.c.name,
+            self.__product_table.c.description,
+            self.__product_table.c.image_url,
+            self.__product_table.c.price_id,
+            self.__price_table.c.value,
+            self.__price_table.c.discount_percent,
+            self.__product_table.c.inventory_id,
+            self.__inventory_table.c.quantity,
+            self.__inventory_table.c.reserved,
+            self.__product_table.c.category_id,
+            self.__category_table.c.name,
+            # greatest() skips the NULL of products without inventory
+            func.greatest(
+                self.__product_table.c.change_id,
+                self.__inventory_table.c.change_id,
+            ),
+        ).select_from(self.__join_products())
+        removed = self.__read_model_table.delete().where(
+            ~exists().where(
+                self.__product_table.c.sku == self.__read_model_table.c.sku
+            )
+        )
+        if skus is not None:
+            sku_list = bindparam("skus", value=skus, type_=ARRAY(String))
+            rows = rows.where(self.__product_table.c.sku == any_(sku_list))
+            removed = removed.where(
+                self.__read_model_table.c.sku == any_(sku_list)
+            )
+        insert_rows = postgresql.insert(self.__read_model_table).from_select(
+            READ_MODEL_COLUMNS, rows
+        )
+        return insert_rows.on_conflict_do_update(
+            index_elements=[self.__read_model_table.c.sku],
+            set_={
+                column: insert_rows.excluded[column]
+                for column in READ_MODEL_COLUMNS[1:]
+            },
+        ).add_cte(
+            removed.returning(self.__read_model_table.c.sku).cte(
+                "removed_view"
+            )
+        )
+
+    async def __refresh_read_model(
+        self, session: AsyncSession, skus: List[str]
+    ) -> None:
+        if not self.__read_model or not skus:
+            return
+        skus = sorted(set(skus))
+        # lock the view rows in sku order first, so that concurrent writers
+        # of a product refresh it one after another from committed data
+        await session.execute(
+            select(self.__read_model_table.c.sku)
+            .where(
+                self.__read_model_table.c.sku
+                == any_(bindparam("skus", value=skus, type_=ARRAY(String)))
+            )
+            .order_by(self.__read_model_table.c.sku)
+            .with_for_update()
+        )
+        await session.execute(self.__refresh_read_model_statement(skus))
+
+    async def rebuild_read_model(self) -> None:
+        session = self.__session()
+        try:
+            await session.begin()
+            await session.execute(
+                text('LOCK TABLE "ProductView" IN SHARE ROW EXCLUSIVE MODE')
+            )
+            await session.execute(self.__refresh_read_model_statement())
+            await session.commit()
+            logger.info("Product read model rebuilt")
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            raise DatabaseException(
+                {
+                    "code": "database.error.read_model",
+                    "message": f"Error rebuilding the read model: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def drain_outbox(
+        self,
+        publish: Callable[
+            [List[SerializedProductEvent]], Awaitable[Dict[PythonUUID, str]]
+        ],
+        limit: int = 100,
+    ) -> int:
+        """Publish pending outbox rows in order. Rows the publisher rejects
+        for good are kept with ``failed_at`` and ``error`` set and are not
+        picked up again; clear ``failed_at`` to retry them."""
+        session = self.__session()
+        try:
+            await session.begin()
+            locked = (
+                await session.execute(
+                    select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_ID))
+                )
+            ).scalar()
+            if not locked:
+                await session.rollback()
+                return 0
+            rows = (
+                await session.execute(
+                    select(
+                        self.__outbox_table.c.id,
+                        self.__outbox_table.c.event_id,
+                        self.__outbox_table.c.sku,
+                        self.__outbox_table.c.payload,
+                    )
+                    .where(self.__outbox_table.c.failed_at.is_(None))
+                    .order_by(self.__outbox_table.c.id)
+                    .limit(limit)
+                )
+            ).fetchall()
+            if not rows:
+                await session.rollback()
+                return 0
+            rejected = await publish(
+                [
+                    SerializedProductEvent(
+                        id=row.event_id, sku=row.sku, body=row.payload
+                    )
+                    for row in rows
+                ]
+            )
+            await session.execute(
+                self.__outbox_table.delete().where(
+                    self.__outbox_table.c.id.in_(
+                        [
+                            row.id
+                            for row in rows
+                            if row.event_id not in rejected
+                        ]
+                    )
+                )
+            )
+            if rejected:
+                for event_id, reason in rejected.items():
+                    logger.error(
+                        f"Product event {event_id} was rejected: {reason}"
+                    )
+                await session.execute(
+                    update(self.__outbox_table)
+                    .where(
+                        self.__outbox_table.c.event_id
+                        == bindparam("rejected_event_id")
+                    )
+                    .values(failed_at=func.now(), error=bindparam("reason")),
+                    [
+                        {"rejected_event_id": event_id, "reason": reason}
+                        for event_id, reason in rejected.items()
+                    ],
+                )
+            await session.commit()
+            return len(rows)
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            raise DatabaseException(
+                {
+                    "code": "database.error.outbox",
+                    "message": f"Error draining the outbox: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def __category_id(
+        self, session: AsyncSession, category: Category
+    ) -> PythonUUID:
+        category_id: Optional[PythonUUID] = self.__category_ids.get(
+            category.name
+        )
+        if category_id is not None:
+            return category_id
+        category_id = (
+            await session.execute(
+                postgresql.insert(self.__category_table)
+                .values(id=category.id, name=category.name)
+                .on_conflict_do_nothing(
+                    index_elements=[self.__category_table.c.name]
+                )
+                .returning(self.__category_table.c.id)
+            )
+        ).scalar()
+        if category_id is None:
+            # a new statement sees the row committed by the conflicting insert
+            category_id = (
+                await session.execute(
+                    select(self.__category_table.c.id).where(
+                        self.__category_table.c.name == category.name
+                    )
+                )
+            ).scalar_one()
+        return category_id
+
+    def __remember_categories(
+        self, category_ids: Dict[str, PythonUUID]
+    ) -> None:
+        # called after commit, so only ids of committed rows are cached
+        for name, category_id in category_ids.items():
+            self.__category_ids.set(name, category_id)
+
+    def __forget_categories(self, names: List[str]) -> None:
+        for name in names:
+            self.__category_ids.delete(name)
+
+    async def create_product(
         self,
         product: Product,
         on_duplicate_sku: Exception,
         on_not_found: Exception,
     ) -> Product:
-        session = self.__session()
-        try:
-            session.begin()
-            price_id = None
-            inventory_id = None
-            category_id = None
-            if product.price:
-                insert_price = insert(self.__price_table).values(
+        price_id = None
+        inventory_id = None
+        if product.price:
+            inserted_price = (
+                insert(self.__price_table)
+                .values(
                     id=product.price.id,
                     value=product.price.value,
                     discount_percent=product.price.discount_percent,
                 )
-                price_result = session.execute(insert_price)
-                if not hasattr(price_result, "inserted_primary_key"):
-                    raise DatabaseException(
-                        {
-                            "code": "database.error.insert",
-                            "message": "Error inserting price",
-                        }
-                    )
-                price_id = price_result.inserted_primary_key[0]
+                .returning(self.__price_table.c.id)
+                .cte("inserted_price")
+            )
+            price_id = select(inserted_price.c.id).scalar_subquery()
 
-            if product.inventory:
-                insert_inventory = insert(self.__inventory_table).values(
+        if product.inventory:
+            inserted_inventory = (
+                insert(self.__inventory_table)
+                .values(
                     id=product.inventory.id,
                     quantity=product.inventory.quantity,
                     reserved=product.inventory.reserved,
                 )
-                inventory_result = session.execute(insert_inventory)
-                if not hasattr(inventory_result, "inserted_primary_key"):
-                    raise DatabaseException(
-                        {
-                            "code": "database.error.insert",
-                            "message": "Error inserting inventory",
-                        }
-                    )
-                inventory_id = inventory_result.inserted_primary_key[0]
-
-            if product.category:
-                get_category = select(self.__category_table.c.id).where(
-                    self.__category_table.c.name == product.category.name
-                )
-                category_id = None
-                category_result = session.execute(get_category).fetchone()
-                if category_result:
-                    category_id = category_result[0]
-                if category_id is None:
-                    insert_category = insert(self.__category_table).values(
-                        id=product.category.id, name=product.category.name
-                    )
-                    category_result_row = session.execute(insert_category)
-                    if not hasattr(
-                        category_result_row, "inserted_primary_key"
-                    ):
-                        raise DatabaseException(
-                            {
-                                "code": "database.error.insert",
-                                "message": "Error inserting category",
-                            }
-                        )
-                    category_id = category_result_row.inserted_primary_key[0]
+                .returning(self.__inventory_table.c.id)
+                .cte("inserted_inventory")
+            )
+            inventory_id = select(inserted_inventory.c.id).scalar_subquery()
 
-            logger.info("Inserting")
-            insert_product = insert(self.__product_table).values(
+        insert_product = (
+            insert(self.__product_table)
+            .values(
                 id=product.id,
                 version=0,
                 sku=product.sku,
@@ -153,21 +603,58 @@ class ProductPostgresAdapter(ProductRepository):
                 image_url=product.image_url,
                 price_id=price_id,
                 inventory_id=inventory_id,
-                category_id=category_id,
             )
-            session.execute(insert_product)
-            session.commit()
-            logger.info(f"Product sku {product.sku} created")
-            return self.get_product_by_sku(
-                product.sku, on_not_found=on_not_found
+            .returning(self.__product_table.c.version)
+        )
+        category_ids: Dict[str, PythonUUID] = {}
+        session = self.__session()
+        try:
+            await session.begin()
+            category = None
+            if product.category:
+                category_id = await self.__category_id(
+                    session, product.category
+                )
+                category = Category.intern(
+                    id=category_id, name=product.category.name
+                )
+                insert_product = insert_product.values(category_id=category_id)
+                category_ids[category.name] = category_id
+            result = (await session.execute(insert_product)).one()
+
+            created_product = Product(
+                id=product.id,
+                version=result.version,
+                sku=product.sku,
+                name=product.name,
+                description=product.description,
+                image_url=product.image_url,
+                price=product.price,
+                inventory=product.inventory,
+                category=category,
             )
+            await self.__refresh_read_model(session, [product.sku])
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.CREATED, product=created_product
+                    )
+                ],
+            )
+            await session.commit()
+            self.__remember_categories(category_ids)
+            logger.info(f"Product sku {product.sku} created")
+            return created_product
         except IntegrityError as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
             raise on_duplicate_sku
         except Exception as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
             if type(error) is type(on_duplicate_sku):
                 raise
             raise DatabaseException(
@@ -177,87 +664,329 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
+            await session.close()
 
-    def get_product_by_sku(self, sku: str, on_not_found: Exception) -> Product:
-        query = (
-            select(
-                self.__product_table.c.id.label("product_id"),
-                self.__product_table.c.version.label("product_version"),
-                self.__product_table.c.sku.label("product_sku"),
-                self.__product_table.c.name.label("product_name"),
-                self.__product_table.c.description.label(
-                    "product_description"
-                ),
-                self.__product_table.c.image_url.label("product_image_url"),
-                self.__product_table.c.price_id,
-                self.__product_table.c.inventory_id,
-                self.__product_table.c.category_id,
-                self.__price_table.c.value.label("price_value"),
-                self.__price_table.c.discount_percent.label(
-                    "price_discount_percent"
-                ),
-                self.__inventory_table.c.quantity.label("inventory_quantity"),
-                self.__inventory_table.c.reserved.label("inventory_reserved"),
-                self.__category_table.c.name.label("category_name"),
+    async def create_products(self, products: List[Product]) -> List[Product]:
+        if not products:
+            return []
+        category_ids: Dict[str, PythonUUID] = {}
+        session = self.__session()
+        try:
+            await session.begin()
+            missing_categories: Dict[str, Optional[PythonUUID]] = {}
+            for product in products:
+                if product.category is None:
+                    continue
+                name = product.category.name
+                category_id = self.__category_ids.get(name)
+                if category_id is not None:
+                    category_ids[name] = category_id
+                else:
+                    missing_categories.setdefault(name, product.category.id)
+            if missing_categories:
+                names = sorted(missing_categories)
+                inserted_categories = (
+                    postgresql.insert(self.__category_table)
+                    .values(
+                        [
+                            {"id": missing_categories[name], "name": name}
+                            for name in names
+                        ]
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=[self.__category_table.c.name]
+                    )
+                    .returning(
+                        self.__category_table.c.id,
+                        self.__category_table.c.name,
+                    )
+                )
+                category_ids.update(
+                    {
+                        row.name: row.id
+                        for row in await session.execute(inserted_categories)
+                    }
+                )
+                existing_names = [
+                    name for name in names if name not in category_ids
+                ]
+                if existing_names:
+                    existing_categories = select(
+                        self.__category_table.c.id,
+                        self.__category_table.c.name,
+                    ).where(
+                        self.__category_table.c.name
+                        == any_(
+                            bindparam(
+                                "names",
+                                value=existing_names,
+                                type_=ARRAY(String),
+                            )
+                        )
+                    )
+                    category_ids.update(
+                        {
+                            row.name: row.id
+                            for row in await session.execute(
+                                existing_categories
+                            )
+                        }
+                    )
+            categories = {
+                name: Category.intern(id=category_id, name=name)
+                for name, category_id in category_ids.items()
+            }
+
+            prices = [product.price for product in products if product.price]
+            if prices:
+                await session.execute(
+                    insert(self.__price_table).values(
+                        [
+                            {
+                                "id": price.id,
+                                "value": price.value,
+                                "discount_percent": price.discount_percent,
+                            }
+                            for price in prices
+                        ]
+                    )
+                )
+
+            inventories = [
+                product.inventory for product in products if product.inventory
+            ]
+            if inventories:
+                await session.execute(
+                    insert(self.__inventory_table).values(
+                        [
+                            {
+                                "id": inventory.id,
+                                "quantity": inventory.quantity,
+                                "reserved": inventory.reserved,
+                            }
+                            for inventory in inventories
+                        ]
+                    )
+                )
+
+            insert_products = (
+                postgresql.insert(self.__product_table)
+                .values(
+                    [
+                        {
+                            "id": product.id,
+                            "version": 0,
+                            "sku": product.sku,
+                            "name": product.name,
+                            "description": product.description,
+                            "image_url": product.image_url,
+                            "price_id": (
+                                product.price.id if product.price else None
+                            ),
+                            "inventory_id": (
+                                product.inventory.id
+                                if product.inventory
+                                else None
+                            ),
+                            "category_id": (
+                                category_ids[product.category.name]
+                                if product.category
+                                else None
+                            ),
+                        }
+                        for product in products
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[self.__product_table.c.sku]
+                )
+                .returning(
+                    self.__product_table.c.sku,
+                    self.__product_table.c.version,
+                )
             )
-            .select_from(
-                self.__product_table.outerjoin(
-                    self.__price_table,
-                    self.__product_table.c.price_id == self.__price_table.c.id,
+            versions = {
+                row.sku: row.version
+                for row in await session.execute(insert_products)
+            }
+
+            skipped = [
+                product for product in products if product.sku not in versions
+            ]
+            skipped_price_ids = [
+                product.price.id for product in skipped if product.price
+            ]
+            if skipped_price_ids:
+                await session.execute(
+                    self.__price_table.delete().where(
+                        self.__price_table.c.id.in_(skipped_price_ids)
+                    )
                 )
-                .outerjoin(
-                    self.__inventory_table,
-                    self.__product_table.c.inventory_id
-                    == self.__inventory_table.c.id,
+            skipped_inventory_ids = [
+                product.inventory.id
+                for product in skipped
+                if product.inventory
+            ]
+            if skipped_inventory_ids:
+                await session.execute(
+                    self.__inventory_table.delete().where(
+                        self.__inventory_table.c.id.in_(skipped_inventory_ids)
+                    )
                 )
-                .outerjoin(
-                    self.__category_table,
-                    self.__product_table.c.category_id
-                    == self.__category_table.c.id,
+            created_products = [
+                Product(
+                    id=product.id,
+                    version=versions[product.sku],
+                    sku=product.sku,
+                    name=product.name,
+                    description=product.description,
+                    image_url=product.image_url,
+                    price=product.price,
+                    inventory=product.inventory,
+                    category=(
+                        categories[product.category.name]
+                        if product.category
+                        else None
+                    ),
                 )
+                for product in products
+                if product.sku in versions
+            ]
+            await self.__refresh_read_model(session, list(versions))
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.CREATED, product=product
+                    )
+                    for product in created_products
+                ],
             )
-            .where(self.__product_table.c.sku == sku)
+            await session.commit()
+            self.__remember_categories(category_ids)
+            logger.info(f"{len(versions)} of {len(products)} products created")
+            return created_products
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
+            raise DatabaseException(
+                {
+                    "code": "database.error.insert",
+                    "message": f"Error inserting products in database {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    def __select_products(self) -> Select[Any]:
+        return select(
+            self.__product_table.c.id.label("product_id"),
+            self.__product_table.c.version.label("product_version"),
+            self.__product_table.c.sku.label("product_sku"),
+            self.__product_table.c.name.label("product_name"),
+            self.__product_table.c.description.label("product_description"),
+            self.__product_table.c.image_url.label("product_image_url"),
+            self.__product_table.c.price_id,
+            self.__product_table.c.inventory_id,
+            self.__product_table.c.category_id,
+            self.__price_table.c.value.label("price_value"),
+            self.__price_table.c.discount_percent.label(
+                "price_discount_percent"
+            ),
+            self.__inventory_table.c.quantity.label("inventory_quantity"),
+            self.__inventory_table.c.reserved.label("inventory_reserved"),
+            self.__category_table.c.name.label("category_name"),
+        ).select_from(self.__join_products())
+
+    def __join_products(self) -> Join:
+        return (
+            self.__product_table.outerjoin(
+                self.__price_table,
+                self.__product_table.c.price_id == self.__price_table.c.id,
+            )
+            .outerjoin(
+                self.__inventory_table,
+                self.__product_table.c.inventory_id
+                == self.__inventory_table.c.id,
+            )
+            .outerjoin(
+                self.__category_table,
+                self.__product_table.c.category_id
+                == self.__category_table.c.id,
+            )
+        )
+
+    def __select_read_model(self) -> Select[Any]:
+        return select(
+            self.__read_model_table.c.id.label("product_id"),
+            self.__read_model_table.c.version.label("product_version"),
+            self.__read_model_table.c.sku.label("product_sku"),
+            self.__read_model_table.c.name.label("product_name"),
+            self.__read_model_table.c.description.label("product_description"),
+            self.__read_model_table.c.image_url.label("product_image_url"),
+            self.__read_model_table.c.price_id,
+            self.__read_model_table.c.price_value,
+            self.__read_model_table.c.price_discount_percent,
+            self.__read_model_table.c.inventory_id,
+            self.__read_model_table.c.inventory_quantity,
+            self.__read_model_table.c.inventory_reserved,
+            self.__read_model_table.c.category_id,
+            self.__read_model_table.c.category_name,
         )
+
+    def __select_for_read(self) -> Tuple[Select[Any], ColumnElement[str]]:
+        if self.__read_model:
+            return self.__select_read_model(), self.__read_model_table.c.sku
+        return self.__select_products(), self.__product_table.c.sku
+
+    @staticmethod
+    def __to_product(row: Row[Any]) -> Product:
+        inventory = None
+        if row.inventory_id is not None:
+            inventory = Inventory.from_row(
+                id=row.inventory_id,
+                quantity=row.inventory_quantity,
+                reserved=row.inventory_reserved,
+            )
+        price = None
+        if row.price_id is not None:
+            price = Price.from_row(
+                id=row.price_id,
+                value=row.price_value,
+                discount_percent=row.price_discount_percent,
+            )
+        category = None
+        if row.category_id is not None:
+            category = Category.intern(
+                id=row.category_id, name=row.category_name
+            )
+        return Product.from_row(
+            id=row.product_id,
+            version=row.product_version,
+            sku=row.product_sku,
+            name=row.product_name,
+            description=row.product_description,
+            image_url=row.product_image_url,
+            price=price,
+            inventory=inventory,
+            category=category,
+        )
+
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        query, sku_column = self.__select_for_read()
+        query = query.where(sku_column == sku)
         session = self.__session()
         try:
-            session.begin()
-            result = session.execute(query).fetchone()
+            await session.begin()
+            result = (await session.execute(query)).fetchone()
             if result is None:
                 logger.error(f"Product not found for {sku}")
                 raise on_not_found
 
-            inventory = None
-            if hasattr(result, "inventory_id"):
-                inventory = Inventory(
-                    id=result.inventory_id,
-                    quantity=result.inventory_quantity,
-                    reserved=result.inventory_reserved,
-                )
-            price = None
-            if hasattr(result, "price_id"):
-                price = Price(
-                    id=result.price_id,
-                    value=result.price_value,
-                    discount_percent=result.price_discount_percent,
-                )
-            category = None
-            if hasattr(result, "category_id"):
-                category = Category(
-                    id=result.category_id, name=result.category_name
-                )
-            product = Product(
-                id=result.product_id,
-                version=result.product_version,
-                sku=result.product_sku,
-                name=result.product_name,
-                description=result.product_description,
-                image_url=result.product_image_url,
-                price=price,
-                inventory=inventory,
-                category=category,
-            )
-            return product
+            return self.__to_product(result)
 
         except NoResultFound as error:
             logger.error(error)
@@ -273,120 +1002,751 @@ class ProductPostgresAdapter(ProductRepository):
                     "message": f"Error searching product by sku :{error}",
                 }
             )
+        finally:
+            await session.close()
 
-    def update_product(
-        self,
-        product: Product,
-        on_not_found: Exception,
-        on_outdated_version: Exception,
-        on_duplicate: Exception,
-    ) -> Product:
+    async def get_product_revision(
+        self, sku: str, on_not_found: Exception
+    ) -> Tuple[int, Optional[int]]:
+        query = (
+            select(
+                self.__product_table.c.version,
+                self.__inventory_table.c.reserved,
+            )
+            .select_from(
+                self.__product_table.outerjoin(
+                    self.__inventory_table,
+                    self.__product_table.c.inventory_id
+                    == self.__inventory_table.c.id,
+                )
+            )
+            .where(self.__product_table.c.sku == sku)
+        )
         session = self.__session()
         try:
-            session.begin()
-            query = select(self.__product_table.c.version).where(
-                self.__product_table.c.sku == product.sku
-            )
-            result = session.execute(query).fetchone()
-
-            if result is None:
+            await session.begin()
+            row = (await session.execute(query)).one_or_none()
+            if row is None:
                 raise on_not_found
-            version = result[0]
-            new_version = version + 1
-
-            update_product_query = (
-                update(self.__product_table)
-                .where(
-                    self.__product_table.c.sku == product.sku,
-                    self.__product_table.c.version == version,
-                )
-                .values(
-                    name=product.name,
-                    description=product.description,
-                    image_url=product.image_url,
-                    version=new_version,
-                )
+            return row.version, row.reserved
+        except Exception as error:
+            logger.error(error)
+            if type(error) is type(on_not_found):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error searching product revision :{error}",
+                }
             )
-            product_result = session.execute(update_product_query)
-
-            if (
-                hasattr(product_result, "rowcount")
-                and product_result.rowcount == 0
-            ):
-                raise on_outdated_version
+        finally:
+            await session.close()
 
-            if product.price:
-                price_update_query = (
-                    update(self.__price_table)
-                    .where(
-                        self.__price_table.c.id
-                        == select(self.__product_table.c.price_id)
-                        .where(self.__product_table.c.sku == product.sku)
-                        .scalar_subquery()
-                    )
-                    .values(
-                        value=product.price.value,
-                        discount_percent=product.price.discount_percent,
-                    )
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        query, sku_column = self.__select_for_read()
+        query = query.where(
+            sku_column
+            == any_(bindparam("skus", value=list(skus), type_=ARRAY(String)))
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            products = {
+                product.sku: product
+                for product in map(
+                    self.__to_product, await session.execute(query)
+                )
+            }
+            return [products[sku] for sku in skus if sku in products]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error searching products by skus :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    def __filter_products(
+        self,
+        query: Select[Any],
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = None,
+    ) -> Select[Any]:
+        category_name = self.__category_table.c.name
+        discounted_price = self.__price_table.c.discounted_price
+        inventory_id = self.__inventory_table.c.id
+        quantity = self.__inventory_table.c.quantity
+        reserved = self.__inventory_table.c.reserved
+        change_id = self.__product_table.c.change_id
+        if self.__read_model:
+            category_name = self.__read_model_table.c.category_name
+            discounted_price = self.__read_model_table.c.price_discounted_price
+            inventory_id = self.__read_model_table.c.inventory_id
+            quantity = self.__read_model_table.c.inventory_quantity
+            reserved = self.__read_model_table.c.inventory_reserved
+            change_id = self.__read_model_table.c.change_id
+        if category is not None:
+            query = query.where(category_name == category)
+        if min_price is not None:
+            query = query.where(discounted_price >= min_price)
+        if max_price is not None:
+            query = query.where(discounted_price <= max_price)
+        if in_stock is True:
+            query = query.where(quantity > reserved)
+        elif in_stock is False:
+            query = query.where(
+                or_(inventory_id.is_(None), quantity <= reserved)
+            )
+        if changed_since is not None:
+            changed = change_id >= changed_since
+            if not self.__read_model:
+                # reservations only touch the inventory row
+                changed = or_(
+                    changed,
+                    self.__inventory_table.c.change_id >= changed_since,
                 )
-                session.execute(price_update_query)
+            query = query.where(changed)
+        return query
 
-            if product.inventory:
-                inventory_update_query = (
-                    update(self.__inventory_table)
-                    .where(
-                        self.__inventory_table.c.id
-                        == select(self.__product_table.c.inventory_id)
-                        .where(self.__product_table.c.sku == product.sku)
-                        .scalar_subquery()
+    async def list_products(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> List[Product]:
+        query, sku_column = self.__select_for_read()
+        query = self.__filter_products(
+            query,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+        )
+        if after_sku is not None:
+            query = query.where(sku_column > after_sku)
+        query = query.order_by(sku_column).limit(limit)
+        session = self.__session()
+        try:
+            await session.begin()
+            return [
+                self.__to_product(row) for row in await session.execute(query)
+            ]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error listing products :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def export_products(
+        self,
+        batch_size: int,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = None,
+    ) -> AsyncIterator[List[Product]]:
+        query, sku_column = self.__select_for_read()
+        query = self.__filter_products(
+            query,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            changed_since=changed_since,
+        )
+        # server-side cursor: only one batch of rows is held at a time
+        query = query.order_by(sku_column).execution_options(
+            yield_per=batch_size
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield [self.__to_product(row) for row in rows]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error exporting products :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def export_deleted_skus(
+        self, batch_size: int, changed_since: int
+    ) -> AsyncIterator[List[str]]:
+        query = (
+            select(self.__tombstone_table.c.sku)
+            .where(self.__tombstone_table.c.change_id >= changed_since)
+            .order_by(self.__tombstone_table.c.sku)
+            .execution_options(yield_per=batch_size)
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            result = await session.stream_scalars(query)
+            async for skus in result.partitions():
+                yield list(skus)
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error exporting deleted products :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def get_change_watermark(self) -> int:
+        # every transaction below the snapshot xmin has finished, so its
+        # changes are visible to any export that starts after this query
+        query = select(func.txid_snapshot_xmin(func.txid_current_snapshot()))
+        session = self.__session()
+        try:
+            await session.begin()
+            watermark: int = (await session.execute(query)).scalar_one()
+            return watermark
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error getting change watermark :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def count_products_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Dict[str, int]:
+        if self.__read_model:
+            category_name = self.__read_model_table.c.category_name
+            query = select(category_name, func.count()).where(
+                category_name.is_not(None)
+            )
+        else:
+            category_name = self.__category_table.c.name
+            query = select(category_name, func.count()).select_from(
+                self.__product_table.join(
+                    self.__category_table,
+                    self.__product_table.c.category_id
+                    == self.__category_table.c.id,
+                )
+                .outerjoin(
+                    self.__price_table,
+                    self.__product_table.c.price_id == self.__price_table.c.id,
+                )
+                .outerjoin(
+                    self.__inventory_table,
+                    self.__product_table.c.inventory_id
+                    == self.__inventory_table.c.id,
+                )
+            )
+        query = self.__filter_products(
+            query.group_by(category_name).order_by(category_name),
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            return {
+                name: count for name, count in await session.execute(query)
+            }
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error counting products :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def list_prices(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        skus: Optional[List[str]] = None,
+    ) -> List[Tuple[str, float, float]]:
+        query = select(
+            self.__product_table.c.sku,
+            self.__price_table.c.value,
+            self.__price_table.c.discount_percent,
+        ).join(
+            self.__price_table,
+            self.__price_table.c.id == self.__product_table.c.price_id,
+        )
+        if category is not None:
+            query = query.join(
+                self.__category_table,
+                self.__category_table.c.id
+                == self.__product_table.c.category_id,
+            ).where(self.__category_table.c.name == category)
+        if skus is not None:
+            query = query.where(
+                self.__product_table.c.sku
+                == any_(bindparam("skus", value=skus, type_=ARRAY(String)))
+            )
+        if after_sku is not None:
+            query = query.where(self.__product_table.c.sku > after_sku)
+        query = query.order_by(self.__product_table.c.sku).limit(limit)
+        session = self.__session()
+        try:
+            await session.begin()
+            return [tuple(row) for row in await session.execute(query)]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error listing prices :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def update_prices(
+        self,
+        skus: List[str],
+        values: List[float],
+        discount_percents: List[float],
+        expected_values: List[float],
+        expected_discount_percents: List[float],
+    ) -> List[Product]:
+        lines = (
+            func.unnest(
+                bindparam("skus", value=skus, type_=ARRAY(String)),
+                bindparam("values", value=values, type_=ARRAY(Float)),
+                bindparam(
+                    "discount_percents",
+                    value=discount_percents,
+                    type_=ARRAY(Float),
+                ),
+                bindparam(
+                    "expected_values",
+                    value=expected_values,
+                    type_=ARRAY(Float),
+                ),
+                bindparam(
+                    "expected_discount_percents",
+                    value=expected_discount_percents,
+                    type_=ARRAY(Float),
+                ),
+            )
+            .table_valued(
+                "sku",
+                "value",
+                "discount_percent",
+                "expected_value",
+                "expected_discount_percent",
+            )
+            .render_derived(name="line")
+        )
+        updated_price = (
+            update(self.__price_table)
+            .where(
+                self.__price_table.c.id == self.__product_table.c.price_id,
+                self.__product_table.c.sku == lines.c.sku,
+                self.__price_table.c.value == lines.c.expected_value,
+                self.__price_table.c.discount_percent
+                == lines.c.expected_discount_percent,
+            )
+            .values(
+                value=lines.c.value,
+                discount_percent=lines.c.discount_percent,
+            )
+            .returning(self.__price_table.c.id)
+            .cte("updated_price")
+        )
+        updated_product = (
+            update(self.__product_table)
+            .where(self.__product_table.c.price_id == updated_price.c.id)
+            .values(
+                version=self.__product_table.c.version + 1,
+                change_id=func.txid_current(),
+            )
+            .returning(self.__product_table.c.sku)
+            .cte("updated_product")
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            updated_skus: List[str] = list(
+                (await session.execute(select(updated_product.c.sku)))
+                .scalars()
+                .all()
+            )
+            products = []
+            if updated_skus:
+                query = self.__select_products().where(
+                    self.__product_table.c.sku
+                    == any_(
+                        bindparam(
+                            "skus", value=updated_skus, type_=ARRAY(String)
+                        )
                     )
-                    .values(
-                        quantity=product.inventory.quantity,
-                        reserved=product.inventory.reserved,
+                )
+                products = [
+                    self.__to_product(row)
+                    for row in await session.execute(query)
+                ]
+            await self.__refresh_read_model(session, updated_skus)
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.UPDATED, product=product
                     )
+                    for product in products
+                ],
+            )
+            await session.commit()
+            return products
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            raise DatabaseException(
+                {
+                    "code": "database.error.update",
+                    "message": f"Error updating prices: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def search_products(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[Product, float]]:
+        ts_query = func.websearch_to_tsquery(
+            literal_column("'english'::regconfig"), query
+        )
+        search_vector = self.__product_table.c.search_vector
+        match = search_vector.bool_op("@@")(ts_query)
+        rank = func.ts_rank_cd(search_vector, ts_query)
+        if self.__trigram_search:
+            match = or_(
+                match,
+                literal(query, String).bool_op("<%")(
+                    self.__product_table.c.name
+                ),
+                self.__product_table.c.sku.bool_op("%")(query),
+            )
+            rank = rank + func.greatest(
+                func.word_similarity(query, self.__product_table.c.name),
+                func.similarity(self.__product_table.c.sku, query),
+            )
+        ranked = (
+            select(
+                self.__product_table.c.id,
+                rank.label("rank"),
+            )
+            .where(match)
+            .subquery("ranked")
+        )
+        statement = (
+            self.__select_products()
+            .add_columns(ranked.c.rank)
+            .join(ranked, ranked.c.id == self.__product_table.c.id)
+        )
+        if after is not None:
+            after_rank, after_sku = after
+            statement = statement.where(
+                or_(
+                    ranked.c.rank < after_rank,
+                    and_(
+                        ranked.c.rank == after_rank,
+                        self.__product_table.c.sku > after_sku,
+                    ),
+                )
+            )
+        statement = statement.order_by(
+            ranked.c.rank.desc(), self.__product_table.c.sku
+        ).limit(limit)
+        session = self.__session()
+        try:
+            await session.begin()
+            return [
+                (self.__to_product(row), row.rank)
+                for row in await session.execute(statement)
+            ]
+        except Exception as error:
+            logger.error(error)
+            raise DatabaseException(
+                {
+                    "code": "database.error.select",
+                    "message": f"Error searching products :{error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    def __update_product_statement(
+        self,
+        product: Product,
+        expected_version: Optional[int],
+        category_id: Optional[PythonUUID],
+    ) -> Select[Any]:
+        current = (
+            select(
+                self.__product_table.c.id,
+                self.__product_table.c.version,
+                self.__product_table.c.price_id,
+                self.__product_table.c.inventory_id,
+            )
+            .where(self.__product_table.c.sku == product.sku)
+            .cte("current_product")
+        )
+        if expected_version is None:
+            version = current.c.version
+        else:
+            version = literal(expected_version, Integer)
+
+        values = {
+            "name": product.name,
+            "description": product.description,
+            "image_url": product.image_url,
+            "version": self.__product_table.c.version + 1,
+            "change_id": func.txid_current(),
+        }
+        if product.price:
+            values["price_id"] = func.coalesce(
+                self.__product_table.c.price_id,
+                literal(product.price.id, UUID),
+            )
+        if product.inventory:
+            values["inventory_id"] = func.coalesce(
+                self.__product_table.c.inventory_id,
+                literal(product.inventory.id, UUID),
+            )
+        if product.category:
+            values["category_id"] = literal(category_id, UUID)
+
+        updated_product = (
+            update(self.__product_table)
+            .where(
+                self.__product_table.c.id == current.c.id,
+                self.__product_table.c.version == version,
+            )
+            .values(**values)
+            .returning(
+                self.__product_table.c.id,
+                self.__product_table.c.version,
+                self.__product_table.c.sku,
+                self.__product_table.c.name,
+                self.__product_table.c.description,
+                self.__product_table.c.image_url,
+                self.__product_table.c.price_id,
+                self.__product_table.c.inventory_id,
+                self.__product_table.c.category_id,
+            )
+            .cte("updated_product")
+        )
+
+        ctes = []
+        joins = current.outerjoin(updated_product, true())
+        if product.price:
+            ctes.append(
+                insert(self.__price_table)
+                .from_select(
+                    ["id", "value", "discount_percent"],
+                    select(
+                        updated_product.c.price_id,
+                        literal(product.price.value, Float),
+                        literal(product.price.discount_percent, Float),
+                    ).where(
+                        updated_product.c.id == current.c.id,
+                        current.c.price_id.is_(None),
+                    ),
                 )
-                session.execute(inventory_update_query)
+                .returning(self.__price_table.c.id)
+                .cte("inserted_price")
+            )
+            ctes.append(
+                update(self.__price_table)
+                .where(self.__price_table.c.id == updated_product.c.price_id)
+                .values(
+                    value=product.price.value,
+                    discount_percent=product.price.discount_percent,
+                )
+                .returning(self.__price_table.c.id)
+                .cte("updated_price")
+            )
+            price_columns = [
+                literal(product.price.value, Float).label("price_value"),
+                literal(product.price.discount_percent, Float).label(
+                    "price_discount_percent"
+                ),
+            ]
+        else:
+            joins = joins.outerjoin(
+                self.__price_table,
+                self.__price_table.c.id == updated_product.c.price_id,
+            )
+            price_columns = [
+                self.__price_table.c.value.label("price_value"),
+                self.__price_table.c.discount_percent.label(
+                    "price_discount_percent"
+                ),
+            ]
+        if product.inventory:
+            ctes.append(
+                insert(self.__inventory_table)
+                .from_select(
+                    ["id", "quantity", "reserved"],
+                    select(
+                        updated_product.c.inventory_id,
+                        literal(product.inventory.quantity, Integer),
+                        literal(product.inventory.reserved, Integer),
+                    ).where(
+                        updated_product.c.id == current.c.id,
+                        current.c.inventory_id.is_(None),
+                    ),
+                )
+                .returning(self.__inventory_table.c.id)
+                .cte("inserted_inventory")
+            )
+            ctes.append(
+                update(self.__inventory_table)
+                .where(
+                    self.__inventory_table.c.id
+                    == updated_product.c.inventory_id
+                )
+                .values(
+                    quantity=product.inventory.quantity,
+                    reserved=product.inventory.reserved,
+                )
+                .returning(self.__inventory_table.c.id)
+                .cte("updated_inventory")
+            )
+            inventory_columns = [
+                literal(product.inventory.quantity, Integer).label(
+                    "inventory_quantity"
+                ),
+                literal(product.inventory.reserved, Integer).label(
+                    "inventory_reserved"
+                ),
+            ]
+        else:
+            joins = joins.outerjoin(
+                self.__inventory_table,
+                self.__inventory_table.c.id == updated_product.c.inventory_id,
+            )
+            inventory_columns = [
+                self.__inventory_table.c.quantity.label("inventory_quantity"),
+                self.__inventory_table.c.reserved.label("inventory_reserved"),
+            ]
+        if product.category:
+            category_name = literal(product.category.name, String)
+        else:
+            joins = joins.outerjoin(
+                self.__category_table,
+                self.__category_table.c.id == updated_product.c.category_id,
+            )
+            category_name = self.__category_table.c.name
+
+        return (
+            select(
+                current.c.version.label("current_version"),
+                updated_product.c.id.label("product_id"),
+                updated_product.c.version.label("product_version"),
+                updated_product.c.sku.label("product_sku"),
+                updated_product.c.name.label("product_name"),
+                updated_product.c.description.label("product_description"),
+                updated_product.c.image_url.label("product_image_url"),
+                updated_product.c.price_id,
+                updated_product.c.inventory_id,
+                updated_product.c.category_id,
+                *price_columns,
+                *inventory_columns,
+                category_name.label("category_name"),
+            )
+            .select_from(joins)
+            .add_cte(*ctes)
+        )
+
+    async def update_product(
+        self,
+        product: Product,
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        on_duplicate: Exception,
+        expected_version: Optional[int] = None,
+    ) -> Product:
+        category_ids = {}
+        session = self.__session()
+        try:
+            await session.begin()
+            category_id = None
             if product.category:
-                get_category = select(self.__category_table.c.id).where(
-                    self.__category_table.c.name == product.category.name
-                )
-                category_id = None
-                category_result = session.execute(get_category).fetchone()
-                if category_result:
-                    category_id = category_result[0]
-                if category_id is None:
-                    insert_category = insert(self.__category_table).values(
-                        id=product.category.id, name=product.category.name
+                category_id = await self.__category_id(
+                    session, product.category
+                )
+                category_ids[product.category.name] = category_id
+            statement = self.__update_product_statement(
+                product, expected_version, category_id
+            )
+            row = (await session.execute(statement)).fetchone()
+            if row is None:
+                raise on_not_found
+            if row.product_id is None:
+                raise on_outdated_version
+
+            updated_product = self.__to_product(row)
+            await self.__refresh_read_model(session, [product.sku])
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.UPDATED, product=updated_product
                     )
-                    category_result_row = session.execute(insert_category)
-                    if not hasattr(
-                        category_result_row, "inserted_primary_key"
-                    ):
-                        raise on_not_found
-                    category_id = category_result_row.inserted_primary_key[0]
-                product_update_query = (
-                    update(self.__product_table)
-                    .where(self.__product_table.c.sku == product.sku)
-                    .values(category_id=category_id)
-                )
-                session.execute(product_update_query)
-            session.commit()
-            return self.get_product_by_sku(
-                sku=product.sku, on_not_found=on_not_found
+                ],
+            )
+            await session.commit()
+            self.__remember_categories(category_ids)
+            logger.info(
+                f"Product sku {product.sku} updated to version "
+                f"{updated_product.version}"
             )
+            return updated_product
         except IntegrityError as error:
-            session.rollback()
-            error_orig = error.orig
-            if not error_orig:
-                raise
-            if error_orig and error_orig.args[0] == 1062:
-                raise on_duplicate
-            elif error_orig and error_orig.args[0] == 1452:
-                raise on_not_found
-            logger.error(f"SQL Error code: {error_orig.args[0]}")
-            raise
+            logger.error(error)
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
+            raise on_duplicate
         except Exception as error:
-            session.rollback()
+            logger.error(error)
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
             if (
                 type(error) is type(on_not_found)
                 or type(error) is type(on_outdated_version)
@@ -400,19 +1760,346 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
+            await session.close()
+
+    def __upsert_value_object(
+        self,
+        table: Table,
+        columns: List[str],
+        row: Select[Any],
+        changed: List[str],
+        name: str,
+    ) -> CTE:
+        insert_row = postgresql.insert(table).from_select(columns, row)
+        if changed:
+            insert_row = insert_row.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={
+                    column: insert_row.excluded[column] for column in changed
+                },
+            )
+        else:
+            insert_row = insert_row.on_conflict_do_nothing(
+                index_elements=[table.c.id]
+            )
+        return insert_row.returning(table.c.id).cte(name)
 
-    def delete_product(self, sku, on_not_found: Exception) -> bool:
+    def __patch_product_statement(
+        self,
+        product: Product,
+        changes: Dict[str, Any],
+        expected_version: int,
+        category_id: Optional[PythonUUID],
+    ) -> Select[Any]:
+        current = (
+            select(self.__product_table.c.id, self.__product_table.c.version)
+            .where(self.__product_table.c.sku == product.sku)
+            .cte("current_product")
+        )
+        version = literal(expected_version, Integer)
+        # a patched product always carries the value objects it changes
+        price = product.price if "price" in changes else None
+        inventory = product.inventory if "inventory" in changes else None
+
+        values: Dict[str, Any] = {
+            column: getattr(product, column)
+            for column in ("name", "description", "image_url")
+            if column in changes
+        }
+        values["version"] = self.__product_table.c.version + 1
+        values["change_id"] = func.txid_current()
+        if price is not None:
+            values["price_id"] = func.coalesce(
+                self.__product_table.c.price_id,
+                literal(price.id, UUID),
+            )
+        if inventory is not None:
+            values["inventory_id"] = func.coalesce(
+                self.__product_table.c.inventory_id,
+                literal(inventory.id, UUID),
+            )
+        if "category" in changes:
+            values["category_id"] = literal(category_id, UUID)
+
+        updated_product = (
+            update(self.__product_table)
+            .where(
+                self.__product_table.c.id == current.c.id,
+                self.__product_table.c.version == version,
+            )
+            .values(**values)
+            .returning(
+                self.__product_table.c.id,
+                self.__product_table.c.version,
+                self.__product_table.c.price_id,
+                self.__product_table.c.inventory_id,
+                self.__product_table.c.category_id,
+            )
+            .cte("updated_product")
+        )
+
+        ctes = []
+        if price is not None:
+            ctes.append(
+                self.__upsert_value_object(
+                    self.__price_table,
+                    ["id", "value", "discount_percent"],
+                    select(
+                        updated_product.c.price_id,
+                        literal(price.value, Float),
+                        literal(price.discount_percent, Float),
+                    ),
+                    [
+                        column
+                        for column in ("value", "discount_percent")
+                        if column in (changes["price"] or {})
+                    ],
+                    "upserted_price",
+                )
+            )
+        if inventory is not None:
+            ctes.append(
+                self.__upsert_value_object(
+                    self.__inventory_table,
+                    ["id", "quantity", "reserved"],
+                    select(
+                        updated_product.c.inventory_id,
+                        literal(inventory.quantity, Integer),
+                        literal(inventory.reserved, Integer),
+                    ),
+                    [
+                        column
+                        for column in ("quantity", "reserved")
+                        if column in (changes["inventory"] or {})
+                    ],
+                    "upserted_inventory",
+                )
+            )
+
+        return (
+            select(
+                current.c.version.label("current_version"),
+                updated_product.c.id.label("product_id"),
+                updated_product.c.version.label("product_version"),
+                updated_product.c.category_id,
+            )
+            .select_from(current.outerjoin(updated_product, true()))
+            .add_cte(*ctes)
+        )
+
+    async def patch_product(
+        self,
+        product: Product,
+        changes: Dict[str, Any],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        expected_version: int,
+    ) -> Product:
+        category_ids = {}
         session = self.__session()
         try:
-            session.begin()
+            await session.begin()
+            category_id = None
+            if "category" in changes and product.category:
+                category_id = await self.__category_id(
+                    session, product.category
+                )
+                category_ids[product.category.name] = category_id
+            statement = self.__patch_product_statement(
+                product, changes, expected_version, category_id
+            )
+            row = (await session.execute(statement)).fetchone()
+            if row is None:
+                raise on_not_found
+            if row.product_id is None:
+                raise on_outdated_version
+
+            category = product.category
+            if category is not None and row.category_id is not None:
+                category = Category.intern(
+                    id=row.category_id, name=category.name
+                )
+            patched_product = Product(
+                id=row.product_id,
+                version=row.product_version,
+                sku=product.sku,
+                name=product.name,
+                description=product.description,
+                image_url=product.image_url,
+                price=product.price,
+                inventory=product.inventory,
+                category=category,
+            )
+            await self.__refresh_read_model(session, [product.sku])
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.PATCHED,
+                        sku=product.sku,
+                        changes={
+                            **changes,
+                            "version": patched_product.version,
+                        },
+                    )
+                ],
+            )
+            await session.commit()
+            self.__remember_categories(category_ids)
+            logger.info(
+                f"Product sku {product.sku} patched to version "
+                f"{patched_product.version}"
+            )
+            return patched_product
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            self.__forget_categories(list(category_ids))
+            if type(error) is type(on_not_found) or type(error) is type(
+                on_outdated_version
+            ):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.patch",
+                    "message": f"Error patching the product: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def __adjust_reserved(
+        self,
+        quantities: Dict[str, int],
+        sign: int,
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        # sorted, so that overlapping orders lock inventory rows in the
+        # same order instead of deadlocking each other
+        skus = sorted(quantities)
+        lines = (
+            func.unnest(
+                bindparam("skus", value=skus, type_=ARRAY(String)),
+                bindparam(
+                    "quantities",
+                    value=[quantities[sku] for sku in skus],
+                    type_=ARRAY(Integer),
+                ),
+            )
+            .table_valued("sku", "quantity")
+            .render_derived(name="line")
+        )
+        reserved = self.__inventory_table.c.reserved + sign * lines.c.quantity
+        statement = (
+            update(self.__inventory_table)
+            .where(
+                self.__inventory_table.c.id
+                == self.__product_table.c.inventory_id,
+                self.__product_table.c.sku == lines.c.sku,
+                (
+                    reserved <= self.__inventory_table.c.quantity
+                    if sign > 0
+                    else reserved >= 0
+                ),
+            )
+            .values(reserved=reserved, change_id=func.txid_current())
+            .returning(
+                self.__product_table.c.sku,
+                self.__inventory_table.c.id,
+                self.__inventory_table.c.quantity,
+                self.__inventory_table.c.reserved,
+            )
+        )
+        session = self.__session()
+        try:
+            await session.begin()
+            rows = (await session.execute(statement)).fetchall()
+            if len(rows) != len(skus):
+                query = select(self.__product_table.c.sku).where(
+                    self.__product_table.c.sku
+                    == any_(
+                        bindparam("skus", value=skus, type_=ARRAY(String))
+                    ),
+                    self.__product_table.c.inventory_id.is_not(None),
+                )
+                found = (await session.execute(query)).scalars().all()
+                if len(found) != len(skus):
+                    raise on_not_found
+                raise on_insufficient
+
+            inventories = {
+                row.sku: Inventory.from_row(
+                    id=row.id, quantity=row.quantity, reserved=row.reserved
+                )
+                for row in rows
+            }
+            await self.__refresh_read_model(session, skus)
+            await self.__write_outbox(
+                session,
+                [
+                    ProductEvent(
+                        type=ProductEventType.PATCHED,
+                        sku=sku,
+                        changes={
+                            "inventory": {
+                                "quantity": inventory.quantity,
+                                "reserved": inventory.reserved,
+                            }
+                        },
+                    )
+                    for sku, inventory in inventories.items()
+                ],
+            )
+            await session.commit()
+            return inventories
+        except Exception as error:
+            logger.error(error)
+            await session.rollback()
+            if type(error) is type(on_not_found) or type(error) is type(
+                on_insufficient
+            ):
+                raise
+            raise DatabaseException(
+                {
+                    "code": "database.error.inventory",
+                    "message": f"Error adjusting the inventory: {error}",
+                }
+            )
+        finally:
+            await session.close()
+
+    async def reserve_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        return await self.__adjust_reserved(
+            quantities, 1, on_not_found, on_insufficient
+        )
+
+    async def release_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        return await self.__adjust_reserved(
+            quantities, -1, on_not_found, on_insufficient
+        )
+
+    async def delete_product(self, sku, on_not_found: Exception) -> bool:
+        session = self.__session()
+        try:
+            await session.begin()
             query = select(
                 self.__product_table.c.id,
                 self.__product_table.c.inventory_id,
                 self.__product_table.c.price_id,
                 self.__product_table.c.category_id,
             ).where(self.__product_table.c.sku == sku)
-            result = session.execute(query).fetchone()
+            result = (await session.execute(query)).fetchone()
             if result is None:
                 raise on_not_found
 
@@ -421,25 +2108,38 @@ class ProductPostgresAdapter(ProductRepository):
             delete_product_query = self.__product_table.delete().where(
                 self.__product_table.c.sku == sku
             )
-            session.execute(delete_product_query)
+            await session.execute(delete_product_query)
+            tombstone = postgresql.insert(self.__tombstone_table).values(
+                sku=sku
+            )
+            await session.execute(
+                tombstone.on_conflict_do_update(
+                    index_elements=[self.__tombstone_table.c.sku],
+                    set_={"change_id": func.txid_current()},
+                )
+            )
 
             if inventory_id is not None:
                 delete_inventory_query = self.__inventory_table.delete().where(
                     self.__inventory_table.c.id == inventory_id
                 )
-                session.execute(delete_inventory_query)
+                await session.execute(delete_inventory_query)
 
             if price_id is not None:
                 delete_price_query = self.__price_table.delete().where(
                     self.__price_table.c.id == price_id
                 )
-                session.execute(delete_price_query)
+                await session.execute(delete_price_query)
 
-            session.commit()
+            await self.__refresh_read_model(session, [sku])
+            await self.__write_outbox(
+                session, [ProductEvent(type=ProductEventType.DELETED, sku=sku)]
+            )
+            await session.commit()
             return True
         except Exception as error:
             logger.error(error)
-            session.rollback()
+            await session.rollback()
             if type(error) is type(on_not_found):
                 raise
             raise DatabaseException(
@@ -449,4 +2149,4 @@ class ProductPostgresAdapter(ProductRepository):
                 }
             )
         finally:
-            session.close()
+            await session.close()
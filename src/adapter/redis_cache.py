@@ -0,0 +1,88 @@
+import logging
+from typing import List, Optional, cast
+
+from redis import asyncio as redis
+from src.adapter.exceptions import CacheException
+from src.port.cache import Cache
+
+logger = logging.getLogger("app")
+
+
+class RedisCacheAdapter(Cache):
+    def __init__(self, url: str, socket_timeout: float = 0.5) -> None:
+        self.__client = redis.from_url(
+            url,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return cast(Optional[bytes], await self.__client.get(key))
+        except redis.RedisError as error:
+            logger.error(error)
+            raise CacheException(
+                {
+                    "code": "cache.error.get",
+                    "message": f"Error getting cache key {key}: {error}",
+                }
+            )
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        try:
+            return cast(List[Optional[bytes]], await self.__client.mget(keys))
+        except redis.RedisError as error:
+            logger.error(error)
+            raise CacheException(
+                {
+                    "code": "cache.error.get_many",
+                    "message": f"Error getting cache keys: {error}",
+                }
+            )
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            await self.__client.set(key, value, px=int(ttl_seconds * 1000))
+        except redis.RedisError as error:
+            logger.error(error)
+            raise CacheException(
+                {
+                    "code": "cache.error.set",
+                    "message": f"Error setting cache key {key}: {error}",
+                }
+            )
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        try:
+            return bool(
+                await self.__client.set(
+                    key, value, px=int(ttl_seconds * 1000), nx=True
+                )
+            )
+        except redis.RedisError as error:
+            logger.error(error)
+            raise CacheException(
+                {
+                    "code": "cache.error.add",
+                    "message": f"Error adding cache key {key}: {error}",
+                }
+            )
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.__client.delete(*keys)
+        except redis.RedisError as error:
+            logger.error(error)
+            raise CacheException(
+                {
+                    "code": "cache.error.delete",
+                    "message": f"Error deleting cache keys {keys}: {error}",
+                }
+            )
+
+    async def close(self) -> None:
+        await self.__client.aclose()
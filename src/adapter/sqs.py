@@ -1,15 +1,26 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 import boto3  # type: ignore
+from botocore.exceptions import ClientError  # type: ignore
 from src.adapter.exceptions import SqsException
 from src.config import get_config
 from src.domain.events import ProductEvent
-from src.port.event_publishers import ProductEventPublisher
+from src.port.event_publishers import (
+    ProductEventPublisher,
+    SerializedProductEvent,
+)
 
 config = get_config()
 logger = logging.getLogger("app")
 
+SEND_MESSAGE_BATCH_SIZE = 10
+NON_EXISTENT_QUEUE_ERROR_CODES = (
+    "AWS.SimpleQueueService.NonExistentQueue",
+    "QueueDoesNotExist",
+)
+
 
 class SQSAdapter(ProductEventPublisher):
     def __init__(
@@ -21,6 +32,8 @@ class SQSAdapter(ProductEventPublisher):
         aws_secret_access_key: Optional[str] = None,
     ) -> None:
         self.__queue_name = queue_name
+        self.__queue_url: Optional[str] = None
+        self.__fifo = queue_name.endswith(".fifo")
         self.__session = boto3.Session()
         self.__credentials = self.__session.get_credentials()
 
@@ -37,11 +50,14 @@ class SQSAdapter(ProductEventPublisher):
             aws_secret_access_key=aws_secret_access_key,
         )
 
-    def get_queue_url(self) -> str:
+    def get_queue_url(self, refresh: bool = False) -> str:
+        if self.__queue_url is not None and not refresh:
+            return self.__queue_url
         try:
             response = self.__sqs.get_queue_url(QueueName=self.__queue_name)
             queue_url = response.get("QueueUrl")
             logger.debug(f"Got queue url: {queue_url}")
+            self.__queue_url = queue_url
             return queue_url
         except Exception as error:
             raise SqsException(
@@ -51,14 +67,52 @@ class SQSAdapter(ProductEventPublisher):
                 }
             )
 
-    def publish(self, product_event: ProductEvent) -> None:
-        queue_url = self.get_queue_url()
+    @staticmethod
+    def __is_non_existent_queue(error: Exception) -> bool:
+        return (
+            isinstance(error, ClientError)
+            and error.response.get("Error", {}).get("Code")
+            in NON_EXISTENT_QUEUE_ERROR_CODES
+        )
+
+    def __send(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        send = getattr(self.__sqs, operation)
+        response: Dict[str, Any]
         try:
-            self.__sqs.send_message(
-                QueueUrl=queue_url,
-                MessageBody=product_event.to_json(),
-                DelaySeconds=0,
+            response = send(QueueUrl=self.get_queue_url(), **kwargs)
+        except Exception as error:
+            if not self.__is_non_existent_queue(error):
+                raise
+            logger.warning(f"Queue url is stale, resolving it again: {error}")
+            response = send(
+                QueueUrl=self.get_queue_url(refresh=True), **kwargs
             )
+        return response
+
+    def __message(
+        self, body: str, group_id: Optional[str], deduplication_id: str
+    ) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"MessageBody": body}
+        if not self.__fifo:
+            message["DelaySeconds"] = 0
+            return message
+        message["MessageGroupId"] = group_id
+        message["MessageDeduplicationId"] = deduplication_id
+        return message
+
+    def __event_message(self, product_event: ProductEvent) -> Dict[str, Any]:
+        product = product_event.product
+        return self.__message(
+            body=product_event.to_json(),
+            group_id=product.sku if product else product_event.sku,
+            deduplication_id=str(product_event.id),
+        )
+
+    def publish(self, product_event: ProductEvent) -> None:
+        try:
+            self.__send("send_message", **self.__event_message(product_event))
+        except SqsException:
+            raise
         except Exception as error:
             raise SqsException(
                 {
@@ -66,3 +120,78 @@ class SQSAdapter(ProductEventPublisher):
                     "message": f"Error sending message to sqs queue: {error}",
                 }
             )
+
+    def __send_batch(
+        self, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        entries = [
+            {"Id": str(index), **message}
+            for index, message in enumerate(messages)
+        ]
+        try:
+            response = self.__send("send_message_batch", Entries=entries)
+        except SqsException:
+            raise
+        except Exception as error:
+            raise SqsException(
+                {
+                    "code": "sqs.error.queue.send_message_batch",
+                    "message": f"Error sending messages to sqs queue: {error}",
+                }
+            )
+        failed: List[Dict[str, Any]] = response.get("Failed", [])
+        return failed
+
+    @staticmethod
+    def __failed_entries_error(
+        failed: List[Dict[str, Any]],
+    ) -> SqsException:
+        return SqsException(
+            {
+                "code": "sqs.error.queue.send_message_batch",
+                "message": (
+                    f"{len(failed)} messages were not sent to sqs "
+                    f"queue: {failed}"
+                ),
+            }
+        )
+
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        for start in range(0, len(product_events), SEND_MESSAGE_BATCH_SIZE):
+            end = start + SEND_MESSAGE_BATCH_SIZE
+            failed = self.__send_batch(
+                [
+                    self.__event_message(product_event)
+                    for product_event in product_events[start:end]
+                ]
+            )
+            if failed:
+                raise self.__failed_entries_error(failed)
+
+    def publish_serialized_batch(
+        self, product_events: List[SerializedProductEvent]
+    ) -> Dict[UUID, str]:
+        rejected: Dict[UUID, str] = {}
+        for start in range(0, len(product_events), SEND_MESSAGE_BATCH_SIZE):
+            end = start + SEND_MESSAGE_BATCH_SIZE
+            chunk = product_events[start:end]
+            failed = self.__send_batch(
+                [
+                    self.__message(
+                        body=product_event.body,
+                        group_id=product_event.sku,
+                        deduplication_id=str(product_event.id),
+                    )
+                    for product_event in chunk
+                ]
+            )
+            # only the sender's fault is final: anything else is retried
+            retryable = [entry for entry in failed if not entry["SenderFault"]]
+            if retryable:
+                raise self.__failed_entries_error(retryable)
+            for entry in failed:
+                product_event = chunk[int(entry["Id"])]
+                rejected[product_event.id] = (
+                    f"{entry['Code']}: {entry.get('Message', '')}"
+                )
+        return rejected
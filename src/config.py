@@ -15,14 +15,60 @@ class Config(metaclass=Singleton):
     REGION_NAME = os.getenv("REGION_NAME", "us-east-1")
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "10"))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+    DATABASE_POOL_PRE_PING = (
+        os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+    )
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    REPRICE_CHUNK_SIZE = int(os.getenv("REPRICE_CHUNK_SIZE", "1000"))
+    LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+    LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "500"))
+    SEARCH_TRIGRAM_ENABLED = (
+        os.getenv("SEARCH_TRIGRAM_ENABLED", "true").lower() == "true"
+    )
+    READ_MODEL_ENABLED = (
+        os.getenv("READ_MODEL_ENABLED", "false").lower() == "true"
+    )
+    CATEGORY_CACHE_MAX_SIZE = int(os.getenv("CATEGORY_CACHE_MAX_SIZE", "1000"))
+    CATEGORY_CACHE_TTL_SECONDS = float(
+        os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300")
+    )
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() == "true"
+    CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "10000"))
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_URL = os.getenv("CACHE_URL")
+    CACHE_LOCAL_TTL_SECONDS = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "1"))
+    CACHE_SHARED_TTL_SECONDS = float(
+        os.getenv("CACHE_SHARED_TTL_SECONDS", "300")
+    )
+    CACHE_LOCK_TTL_SECONDS = float(os.getenv("CACHE_LOCK_TTL_SECONDS", "5"))
+    CACHE_TOMBSTONE_TTL_SECONDS = float(
+        os.getenv("CACHE_TOMBSTONE_TTL_SECONDS", "5")
+    )
+    EVENT_BUFFER_ENABLED = (
+        os.getenv("EVENT_BUFFER_ENABLED", "false").lower() == "true"
+    )
+    EVENT_BUFFER_MAX_SIZE = int(os.getenv("EVENT_BUFFER_MAX_SIZE", "10000"))
+    EVENT_FLUSH_INTERVAL_SECONDS = float(
+        os.getenv("EVENT_FLUSH_INTERVAL_SECONDS", "0.5")
+    )
+    OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_INTERVAL_SECONDS = float(
+        os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "1")
+    )
 
     def __init__(self, parameter_store: Optional[ParameterStore] = None):
         self._parameter_store = parameter_store
 
-    def set_parameter_store(self, parameter_store):
+    def set_parameter_store(self, parameter_store: ParameterStore) -> None:
         self._parameter_store = parameter_store
 
-    def get_database_url(self):
+    def get_database_url(self) -> str:
         return self._parameter_store.get_database_url()
 
 
@@ -1,17 +1,26 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID, uuid4
+from weakref import WeakValueDictionary
 
 from src.domain.exceptions import InvalidName
 
+NAME_MAX_LENGTH = 255
+
 
 class Category:
+    __slots__ = ("_id", "_name", "__weakref__")
+
+    _interned: "WeakValueDictionary[Tuple[UUID, str], Category]" = (
+        WeakValueDictionary()
+    )
+
     def __init__(
         self,
         name: str,
         id: Optional[UUID] = None,
     ):
         self._id = id or uuid4()
-        self._name = name
+        self._name = self.validate_name(name)
 
     @property
     def id(self) -> Optional[UUID]:
@@ -21,12 +30,24 @@ class Category:
     def name(self) -> str:
         return self._name
 
+    @classmethod
+    def intern(cls, id: UUID, name: str) -> "Category":
+        category = cls._interned.get((id, name))
+        if category is None:
+            category = cls(id=id, name=name)
+            cls._interned[(id, name)] = category
+        return category
+
     @staticmethod
     def validate_name(name: str) -> str:
         if name is None or name == "":
             raise InvalidName("Name field is mandatory.")
         if len(name) < 3:
             raise InvalidName("Name can not have less than 3 characters.")
+        if len(name) > NAME_MAX_LENGTH:
+            raise InvalidName(
+                f"Name can not have more than {NAME_MAX_LENGTH} characters."
+            )
         return name
 
     def to_dict(self) -> dict:
@@ -34,3 +55,7 @@ class Category:
             "id": str(self.id),
             "name": self.name,
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Category":
+        return cls.intern(id=UUID(data["id"]), name=data["name"])
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional, cast
 from uuid import UUID, uuid4
 
 from src.domain.entities import Category
@@ -10,8 +10,23 @@ from src.domain.exceptions import (
 )
 from src.domain.value_objects import Inventory, Price
 
+SKU_MAX_LENGTH = 50
+NAME_MAX_LENGTH = 255
+IMAGE_URL_MAX_LENGTH = 255
+
 
 class Product:
+    __slots__ = (
+        "_id",
+        "_version",
+        "_sku",
+        "_name",
+        "_description",
+        "_image_url",
+        "_price",
+        "_inventory",
+        "_category",
+    )
 
     def __init__(
         self,
@@ -24,7 +39,7 @@ class Product:
         category: Optional[Category] = None,
         version: Optional[int] = None,
         id: Optional[UUID] = None,
-        **kwargs
+        **kwargs,
     ) -> None:
 
         self._id = id or uuid4()
@@ -43,6 +58,10 @@ class Product:
             raise InvalidSku("Sku field is mandatory")
         if len(sku) < 3:
             raise InvalidSku("Sku can not have less than 3 characters.")
+        if len(sku) > SKU_MAX_LENGTH:
+            raise InvalidSku(
+                f"Sku can not have more than {SKU_MAX_LENGTH} characters."
+            )
         return sku
 
     @staticmethod
@@ -51,6 +70,10 @@ class Product:
             raise InvalidName("Name field is mandatory.")
         if len(name) < 3:
             raise InvalidName("Name can not have less than 3 characters.")
+        if len(name) > NAME_MAX_LENGTH:
+            raise InvalidName(
+                f"Name can not have more than {NAME_MAX_LENGTH} characters."
+            )
         return name
 
     @staticmethod
@@ -71,6 +94,11 @@ class Product:
             "https://"
         ):
             raise InvalidImageUrl("Image Url is invalid.")
+        if len(image_url) > IMAGE_URL_MAX_LENGTH:
+            raise InvalidImageUrl(
+                "Image Url can not have more than "
+                f"{IMAGE_URL_MAX_LENGTH} characters."
+            )
         return image_url
 
     @property
@@ -109,6 +137,44 @@ class Product:
     def category(self) -> Optional[Category]:
         return self._category
 
+    def patch(self, changes: Dict[str, Any]) -> "Product":
+        price = self.price
+        inventory = self.inventory
+        category = self.category
+        if "price" in changes:
+            current = price.to_dict() if price else {}
+            merged: Dict[str, Any] = {**current, **(changes["price"] or {})}
+            price = Price(
+                id=price.id if price else None,
+                value=cast(float, merged.get("value")),
+                discount_percent=merged.get("discount_percent", 0),
+            )
+        if "inventory" in changes:
+            current = inventory.to_dict() if inventory else {}
+            merged = {**current, **(changes["inventory"] or {})}
+            inventory = Inventory(
+                id=inventory.id if inventory else None,
+                quantity=cast(int, merged.get("quantity")),
+                reserved=merged.get("reserved", 0),
+            )
+        if "category" in changes:
+            category = Category(
+                name=Category.validate_name(
+                    cast(str, (changes["category"] or {}).get("name"))
+                )
+            )
+        return Product(
+            id=self.id,
+            version=self.version,
+            sku=self.sku,
+            name=changes.get("name", self.name),
+            description=changes.get("description", self.description),
+            image_url=changes.get("image_url", self.image_url),
+            price=price,
+            inventory=inventory,
+            category=category,
+        )
+
     def to_dict(self) -> dict:
         return {
             "id": str(self.id),
@@ -121,3 +187,46 @@ class Product:
             "inventory": self.inventory.to_dict() if self.inventory else None,
             "category": self.category.to_dict() if self.category else None,
         }
+
+    @classmethod
+    def from_row(
+        cls,
+        id: UUID,
+        version: int,
+        sku: str,
+        name: str,
+        description: str,
+        image_url: Optional[str],
+        price: Optional[Price],
+        inventory: Optional[Inventory],
+        category: Optional[Category],
+    ) -> "Product":
+        # trusted values read back from the repository: skip validation
+        product = cls.__new__(cls)
+        product._id = id
+        product._version = version
+        product._sku = sku
+        product._name = name
+        product._description = description
+        product._image_url = image_url or None
+        product._price = price
+        product._inventory = inventory
+        product._category = category
+        return product
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Product":
+        price = data.get("price")
+        inventory = data.get("inventory")
+        category = data.get("category")
+        return cls(
+            id=UUID(data["id"]),
+            version=data.get("version"),
+            sku=data["sku"],
+            name=data["name"],
+            description=data["description"],
+            image_url=data.get("image_url"),
+            price=Price.from_dict(price) if price else None,
+            inventory=Inventory.from_dict(inventory) if inventory else None,
+            category=Category.from_dict(category) if category else None,
+        )
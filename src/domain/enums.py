@@ -4,6 +4,7 @@ from enum import Enum
 class ProductEventType(Enum):
     CREATED = "created"
     UPDATED = "updated"
+    PATCHED = "patched"
     DELETED = "deleted"
 
     @property
@@ -1,21 +1,27 @@
-import json
-from typing import Optional
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
 
+import orjson
 from src.domain.entities import Product
 from src.domain.enums import ProductEventType
 
 
 class ProductEvent:
+    __slots__ = ("_id", "_type", "_product", "_sku", "_changes")
 
     def __init__(
         self,
         type: ProductEventType,
         product: Optional[Product] = None,
         sku: Optional[str] = None,
+        changes: Optional[Dict[str, Any]] = None,
+        id: Optional[UUID] = None,
     ) -> None:
+        self._id = id or uuid4()
         self._type = type
         self._product = product
         self._sku = sku
+        self._changes = changes
 
         self.validade_event()
 
@@ -24,9 +30,17 @@ class ProductEvent:
             raise Exception("CREATED product event must have valid product")
         if self.type == ProductEventType.UPDATED and self.product is None:
             raise Exception("UPDATED product event must have valid product")
+        if self.type == ProductEventType.PATCHED and (
+            self.sku is None or not self.changes
+        ):
+            raise Exception("PATCHED product event must have sku and changes")
         if self.type == ProductEventType.DELETED and self.sku is None:
             raise Exception("DELETED product event must have valid sku")
 
+    @property
+    def id(self) -> UUID:
+        return self._id
+
     @property
     def type(self) -> ProductEventType:
         return self._type
@@ -39,6 +53,10 @@ class ProductEvent:
     def product(self) -> Optional[Product]:
         return self._product
 
+    @property
+    def changes(self) -> Optional[Dict[str, Any]]:
+        return self._changes
+
     def to_dict(self):
         product = None
         sku = None
@@ -47,7 +65,24 @@ class ProductEvent:
         if self.sku is not None:
             sku = self.sku
 
-        return {"type": self.type.string, "product": product, "sku": sku}
+        return {
+            "id": str(self.id),
+            "type": self.type.string,
+            "product": product,
+            "sku": sku,
+            "changes": self.changes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductEvent":
+        product = data.get("product")
+        return cls(
+            id=UUID(data["id"]),
+            type=ProductEventType(data["type"]),
+            product=Product.from_dict(product) if product else None,
+            sku=data.get("sku"),
+            changes=data.get("changes"),
+        )
 
-    def to_json(self):
-        return json.dumps(self.to_dict())
+    def to_json(self) -> str:
+        return orjson.dumps(self.to_dict()).decode()
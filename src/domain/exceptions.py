@@ -52,3 +52,31 @@ class UpdateProductError(Exception):
 
 class DeleteProductError(Exception):
     pass
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class ListProductsError(Exception):
+    pass
+
+
+class InsufficientInventory(Exception):
+    pass
+
+
+class InventoryReservationError(Exception):
+    pass
+
+
+class RepricingError(Exception):
+    pass
+
+
+class InvalidSearchQuery(Exception):
+    pass
+
+
+class SearchProductsError(Exception):
+    pass
@@ -1,6 +1,8 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import numpy as np
 from src.config import get_config
 from src.domain.entities import Category, Product
 from src.domain.enums import ProductEventType
@@ -9,24 +11,35 @@ from src.domain.exceptions import (
     DeleteProductError,
     DuplicatedProduct,
     GetProductError,
+    InsufficientInventory,
     InvalidDescription,
     InvalidImageUrl,
     InvalidInventory,
     InvalidName,
     InvalidPrice,
+    InvalidCursor,
+    InvalidSearchQuery,
     InvalidSku,
+    InventoryReservationError,
+    ListProductsError,
     OutdatedProduct,
     ProductAlreadyExist,
     ProductCreationError,
     ProductNotFound,
+    RepricingError,
+    SearchProductsError,
     UpdateProductError,
 )
-from src.domain.value_objects import Inventory, Price
+from src.domain.value_objects import Inventory, Price, RepricingRule
 from src.port import ProductEventPublisher, ProductRepository
+from src.utils.cursor import decode_cursor, encode_cursor
 
 config = get_config()
 logger = logging.getLogger("app")
 
+PATCH_ATTEMPTS = 3
+SEARCH_QUERY_MAX_LENGTH = 200
+
 
 class CatalogueService:
     def __init__(
@@ -37,7 +50,20 @@ class CatalogueService:
         self.__product_repository = product_repository
         self.__product_event_publisher = product_event_publisher
 
-    def create_product(
+    async def __publish(self, product_event: ProductEvent) -> None:
+        await asyncio.to_thread(
+            self.__product_event_publisher.publish, product_event=product_event
+        )
+
+    async def __publish_batch(
+        self, product_events: List[ProductEvent]
+    ) -> None:
+        await asyncio.to_thread(
+            self.__product_event_publisher.publish_batch,
+            product_events=product_events,
+        )
+
+    async def create_product(
         self,
         sku: str,
         name: str,
@@ -58,7 +84,7 @@ class CatalogueService:
                 category=category,
             )
             created_product: Product = (
-                self.__product_repository.create_product(
+                await self.__product_repository.create_product(
                     product=product,
                     on_duplicate_sku=ProductAlreadyExist(
                         "Product already exists"
@@ -71,7 +97,7 @@ class CatalogueService:
             product_event = ProductEvent(
                 type=ProductEventType.CREATED, product=product
             )
-            self.__product_event_publisher.publish(product_event=product_event)
+            await self.__publish(product_event=product_event)
             return created_product
         except (
             InvalidSku,
@@ -88,11 +114,99 @@ class CatalogueService:
             logger.error(error)
             raise ProductCreationError(f"Error creating product: {error}")
 
-    def get_product_by_sku(self, sku: str) -> Product:
+    async def __import_row_by_row(
+        self,
+        batch: List[Tuple[int, Product]],
+        failures: List[Tuple[int, str]],
+    ) -> Tuple[List[Tuple[int, Product]], List[Product]]:
+        # one bad row aborts the whole multi-row insert: retry the chunk one
+        # row at a time so that only the offending rows are reported
+        inserted: List[Tuple[int, Product]] = []
+        created_products: List[Product] = []
+        for position, product in batch:
+            try:
+                created_products.extend(
+                    await self.__product_repository.create_products(
+                        products=[product]
+                    )
+                )
+            except Exception as error:
+                logger.error(error)
+                failures.append((position, f"Error creating product: {error}"))
+                continue
+            inserted.append((position, product))
+        return inserted, created_products
+
+    async def import_products(
+        self,
+        products: List[Dict[str, Any]],
+        batch_size: int = config.IMPORT_BATCH_SIZE,
+    ) -> Tuple[List[Product], List[Tuple[int, str]]]:
+        created_products: List[Product] = []
+        failures: List[Tuple[int, str]] = []
+        valid_products: List[Tuple[int, Product]] = []
+        skus = set()
+        for position, fields in enumerate(products):
+            try:
+                product = Product(**fields)
+            except (
+                InvalidSku,
+                InvalidName,
+                InvalidDescription,
+                InvalidImageUrl,
+            ) as error:
+                failures.append((position, str(error)))
+                continue
+            if product.sku in skus:
+                failures.append((position, "Product is duplicated in batch"))
+                continue
+            skus.add(product.sku)
+            valid_products.append((position, product))
+
+        for start in range(0, len(valid_products), batch_size):
+            end = start + batch_size
+            batch = valid_products[start:end]
+            try:
+                created_batch = (
+                    await self.__product_repository.create_products(
+                        products=[product for _, product in batch]
+                    )
+                )
+            except Exception as error:
+                logger.error(error)
+                batch, created_batch = await self.__import_row_by_row(
+                    batch, failures
+                )
+            created_skus = {product.sku for product in created_batch}
+            failures.extend(
+                (position, "Product already exists")
+                for position, product in batch
+                if product.sku not in created_skus
+            )
+            created_products.extend(created_batch)
+            try:
+                await self.__publish_batch(
+                    product_events=[
+                        ProductEvent(
+                            type=ProductEventType.CREATED, product=product
+                        )
+                        for _, product in batch
+                        if product.sku in created_skus
+                    ]
+                )
+            except Exception as error:
+                logger.error(error)
+
+        failures.sort()
+        return created_products, failures
+
+    async def get_product_by_sku(self, sku: str) -> Product:
         try:
             Product.validate_sku(sku)
-            product: Product = self.__product_repository.get_product_by_sku(
-                sku=sku, on_not_found=ProductNotFound("Product not found")
+            product: Product = (
+                await self.__product_repository.get_product_by_sku(
+                    sku=sku, on_not_found=ProductNotFound("Product not found")
+                )
             )
             if product is None:
                 raise ProductNotFound("Product not found")
@@ -104,7 +218,191 @@ class CatalogueService:
             logger.error(error)
             raise GetProductError(f"Error getting product: {error}")
 
-    def update_product(
+    async def get_product_revision(
+        self, sku: str
+    ) -> Tuple[int, Optional[int]]:
+        try:
+            Product.validate_sku(sku)
+            return await self.__product_repository.get_product_revision(
+                sku=sku, on_not_found=ProductNotFound("Product not found")
+            )
+        except (InvalidSku, ProductNotFound) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise GetProductError(f"Error getting product: {error}")
+
+    async def get_products_by_skus(
+        self, skus: List[str]
+    ) -> Tuple[List[Product], List[str]]:
+        try:
+            unique_skus = list(dict.fromkeys(skus))
+            for sku in unique_skus:
+                Product.validate_sku(sku)
+            products: List[Product] = (
+                await self.__product_repository.get_products_by_skus(
+                    skus=unique_skus
+                )
+            )
+            found_skus = {product.sku for product in products}
+            missing_skus = [
+                sku for sku in unique_skus if sku not in found_skus
+            ]
+            return products, missing_skus
+        except InvalidSku as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise GetProductError(f"Error getting products: {error}")
+
+    @staticmethod
+    def __validate_price_range(
+        min_price: Optional[float], max_price: Optional[float]
+    ) -> None:
+        if (
+            min_price is not None
+            and max_price is not None
+            and min_price > max_price
+        ):
+            raise InvalidPrice(
+                "Minimum price can not be higher than maximum price."
+            )
+
+    async def list_products(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
+        try:
+            self.__validate_price_range(min_price, max_price)
+            after_sku = None
+            if cursor is not None:
+                try:
+                    after_sku = decode_cursor(cursor)["sku"]
+                except (ValueError, KeyError) as error:
+                    raise InvalidCursor(f"Cursor is invalid: {error}")
+            products: List[Product] = (
+                await self.__product_repository.list_products(
+                    limit=limit + 1,
+                    after_sku=after_sku,
+                    category=category,
+                    min_price=min_price,
+                    max_price=max_price,
+                    in_stock=in_stock,
+                )
+            )
+            next_cursor = None
+            if len(products) > limit:
+                products = products[:limit]
+                next_cursor = encode_cursor({"sku": products[-1].sku})
+            return products, next_cursor
+        except (InvalidCursor, InvalidPrice) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise ListProductsError(f"Error listing products: {error}")
+
+    async def export_products(
+        self,
+        batch_size: int,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = None,
+    ) -> Tuple[
+        int,
+        Optional[AsyncIterator[List[str]]],
+        AsyncIterator[List[Product]],
+    ]:
+        """Return the change watermark to resume an incremental export
+        from, the skus deleted since ``changed_since`` (only for
+        incremental exports) and the product batches."""
+        try:
+            self.__validate_price_range(min_price, max_price)
+        except InvalidPrice as error:
+            logger.error(error)
+            raise
+        watermark = await self.__product_repository.get_change_watermark()
+        deleted_skus = None
+        if changed_since is not None:
+            deleted_skus = self.__product_repository.export_deleted_skus(
+                batch_size=batch_size, changed_since=changed_since
+            )
+        products = self.__product_repository.export_products(
+            batch_size=batch_size,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            changed_since=changed_since,
+        )
+        return watermark, deleted_skus, products
+
+    async def count_products_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Dict[str, int]:
+        try:
+            self.__validate_price_range(min_price, max_price)
+            return await self.__product_repository.count_products_by_category(
+                min_price=min_price, max_price=max_price, in_stock=in_stock
+            )
+        except InvalidPrice as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise ListProductsError(f"Error counting products: {error}")
+
+    async def search_products(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
+        try:
+            query = (query or "").strip()
+            if not query:
+                raise InvalidSearchQuery("Search query is mandatory.")
+            if len(query) > SEARCH_QUERY_MAX_LENGTH:
+                raise InvalidSearchQuery(
+                    "Search query can not have more than "
+                    f"{SEARCH_QUERY_MAX_LENGTH} characters."
+                )
+            after = None
+            if cursor is not None:
+                try:
+                    position = decode_cursor(cursor)
+                    after = (float(position["rank"]), str(position["sku"]))
+                except (ValueError, KeyError, TypeError) as error:
+                    raise InvalidCursor(f"Cursor is invalid: {error}")
+            results = await self.__product_repository.search_products(
+                query=query, limit=limit + 1, after=after
+            )
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                product, rank = results[-1]
+                next_cursor = encode_cursor({"rank": rank, "sku": product.sku})
+            return [product for product, _ in results], next_cursor
+        except (InvalidCursor, InvalidSearchQuery) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise SearchProductsError(f"Error searching products: {error}")
+
+    async def update_product(
         self,
         sku: str,
         name: str,
@@ -113,6 +411,7 @@ class CatalogueService:
         price: Optional[Price] = None,
         inventory: Optional[Inventory] = None,
         category: Optional[Category] = None,
+        expected_version: Optional[int] = None,
     ) -> Product:
         try:
             product = Product(
@@ -125,17 +424,18 @@ class CatalogueService:
                 category=category,
             )
             updated_product: Product = (
-                self.__product_repository.update_product(
+                await self.__product_repository.update_product(
                     product=product,
                     on_not_found=ProductNotFound("Product not found"),
                     on_outdated_version=OutdatedProduct("Outdated version"),
                     on_duplicate=DuplicatedProduct("Duplicated product"),
+                    expected_version=expected_version,
                 )
             )
             product_event = ProductEvent(
-                type=ProductEventType.UPDATED, product=product
+                type=ProductEventType.UPDATED, product=updated_product
             )
-            self.__product_event_publisher.publish(product_event=product_event)
+            await self.__publish(product_event=product_event)
 
             return updated_product
         except (
@@ -146,6 +446,7 @@ class CatalogueService:
             InvalidDescription,
             InvalidInventory,
             InvalidImageUrl,
+            OutdatedProduct,
             ProductNotFound,
         ) as error:
             logger.error(error)
@@ -154,16 +455,218 @@ class CatalogueService:
             logger.error(error)
             raise UpdateProductError(f"Error updating product {error}")
 
-    def delete_product(self, sku: str) -> bool:
+    async def patch_product(
+        self,
+        sku: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Product:
+        try:
+            for attempt in range(1, PATCH_ATTEMPTS + 1):
+                current_product: Product = (
+                    await self.__product_repository.get_product_by_sku(
+                        sku=sku,
+                        on_not_found=ProductNotFound("Product not found"),
+                    )
+                )
+                if current_product.version is None or (
+                    expected_version is not None
+                    and current_product.version != expected_version
+                ):
+                    raise OutdatedProduct("Outdated version")
+                product = current_product.patch(changes)
+                try:
+                    patched_product: Product = (
+                        await self.__product_repository.patch_product(
+                            product=product,
+                            changes=changes,
+                            on_not_found=ProductNotFound("Product not found"),
+                            on_outdated_version=OutdatedProduct(
+                                "Outdated version"
+                            ),
+                            expected_version=current_product.version,
+                        )
+                    )
+                    break
+                except OutdatedProduct:
+                    if expected_version is not None or (
+                        attempt == PATCH_ATTEMPTS
+                    ):
+                        raise
+                    logger.info(f"Product sku {sku} changed, patching again")
+            product_event = ProductEvent(
+                type=ProductEventType.PATCHED,
+                sku=sku,
+                changes={**changes, "version": patched_product.version},
+            )
+            await self.__publish(product_event=product_event)
+
+            return patched_product
+        except (
+            InvalidSku,
+            InvalidPrice,
+            InvalidName,
+            InvalidDescription,
+            InvalidInventory,
+            InvalidImageUrl,
+            OutdatedProduct,
+            ProductNotFound,
+        ) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise UpdateProductError(f"Error patching product {error}")
+
+    @staticmethod
+    def __quantities(lines: List[Tuple[str, int]]) -> Dict[str, int]:
+        quantities: Dict[str, int] = {}
+        for sku, quantity in lines:
+            Product.validate_sku(sku)
+            if quantity is None or quantity <= 0:
+                raise InvalidInventory("Quantity must be positive.")
+            quantities[sku] = quantities.get(sku, 0) + quantity
+        if not quantities:
+            raise InvalidInventory("At least one line is required.")
+        return quantities
+
+    async def __adjust_inventory(
+        self, lines: List[Tuple[str, int]], reserve: bool
+    ) -> Dict[str, Inventory]:
+        try:
+            quantities = self.__quantities(lines)
+            adjust = (
+                self.__product_repository.reserve_inventory
+                if reserve
+                else self.__product_repository.release_inventory
+            )
+            inventories = await adjust(
+                quantities=quantities,
+                on_not_found=ProductNotFound("Product not found"),
+                on_insufficient=InsufficientInventory(
+                    "Insufficient inventory"
+                    if reserve
+                    else "Can not release more than reserved"
+                ),
+            )
+            await self.__publish_batch(
+                product_events=[
+                    ProductEvent(
+                        type=ProductEventType.PATCHED,
+                        sku=sku,
+                        changes={
+                            "inventory": {
+                                "quantity": inventory.quantity,
+                                "reserved": inventory.reserved,
+                            }
+                        },
+                    )
+                    for sku, inventory in inventories.items()
+                ]
+            )
+            return inventories
+        except (
+            InsufficientInventory,
+            InvalidInventory,
+            InvalidSku,
+            ProductNotFound,
+        ) as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise InventoryReservationError(
+                f"Error adjusting inventory {error}"
+            )
+
+    async def reserve_inventory(
+        self, lines: List[Tuple[str, int]]
+    ) -> Dict[str, Inventory]:
+        return await self.__adjust_inventory(lines, reserve=True)
+
+    async def release_inventory(
+        self, lines: List[Tuple[str, int]]
+    ) -> Dict[str, Inventory]:
+        return await self.__adjust_inventory(lines, reserve=False)
+
+    async def reprice_products(
+        self, rule: RepricingRule, chunk_size: int = config.REPRICE_CHUNK_SIZE
+    ) -> int:
+        repriced = 0
+        after_sku = None
+        try:
+            while True:
+                rows = await self.__product_repository.list_prices(
+                    limit=chunk_size,
+                    after_sku=after_sku,
+                    category=rule.category,
+                    skus=rule.skus,
+                )
+                if not rows:
+                    break
+                after_sku = rows[-1][0]
+                values = np.fromiter(
+                    (row[1] for row in rows), dtype=np.float64, count=len(rows)
+                )
+                discount_percents = np.fromiter(
+                    (row[2] for row in rows), dtype=np.float64, count=len(rows)
+                )
+                new_values, new_discount_percents = rule.apply(
+                    values, discount_percents
+                )
+                changed = np.flatnonzero(
+                    (new_values != values)
+                    | (new_discount_percents != discount_percents)
+                )
+                if changed.size:
+                    products = await self.__product_repository.update_prices(
+                        skus=[rows[index][0] for index in changed],
+                        values=new_values[changed].tolist(),
+                        discount_percents=new_discount_percents[
+                            changed
+                        ].tolist(),
+                        expected_values=values[changed].tolist(),
+                        expected_discount_percents=discount_percents[
+                            changed
+                        ].tolist(),
+                    )
+                    if len(products) < changed.size:
+                        logger.warning(
+                            f"Skipped {changed.size - len(products)} products"
+                            " changed during repricing"
+                        )
+                    if products:
+                        await self.__publish_batch(
+                            product_events=[
+                                ProductEvent(
+                                    type=ProductEventType.UPDATED,
+                                    product=product,
+                                )
+                                for product in products
+                            ]
+                        )
+                    repriced += len(products)
+                logger.info(f"Repriced {repriced} products up to {after_sku}")
+                if len(rows) < chunk_size:
+                    break
+            return repriced
+        except InvalidPrice as error:
+            logger.error(error)
+            raise
+        except Exception as error:
+            logger.error(error)
+            raise RepricingError(f"Error repricing products {error}")
+
+    async def delete_product(self, sku: str) -> bool:
         try:
             Product.validate_sku(sku)
-            self.__product_repository.delete_product(
+            await self.__product_repository.delete_product(
                 sku=sku, on_not_found=ProductNotFound("Product not found")
             )
             product_event = ProductEvent(
                 type=ProductEventType.DELETED, sku=sku
             )
-            self.__product_event_publisher.publish(product_event=product_event)
+            await self.__publish(product_event=product_event)
 
             return True
         except (InvalidSku, ProductNotFound) as error:
@@ -1,4 +1,5 @@
 from .inventory import Inventory
 from .price import Price
+from .repricing_rule import RepricingRule
 
-__all__ = ["Price", "Inventory"]
+__all__ = ["Price", "Inventory", "RepricingRule"]
@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
 from src.domain.exceptions import InvalidInventory
 
 
 class Inventory:
+    __slots__ = ("_id", "_quantity", "_reserved")
+
     def __init__(
         self,
         quantity: int,
@@ -56,3 +58,20 @@ class Inventory:
             "reserved": self.reserved,
             "in_stock": self.in_stock,
         }
+
+    @classmethod
+    def from_row(cls, id: UUID, quantity: int, reserved: int) -> "Inventory":
+        # trusted values read back from the repository: skip validation
+        inventory = cls.__new__(cls)
+        inventory._id = id
+        inventory._quantity = quantity
+        inventory._reserved = reserved
+        return inventory
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Inventory":
+        return cls(
+            id=UUID(data["id"]),
+            quantity=data["quantity"],
+            reserved=data["reserved"],
+        )
@@ -1,10 +1,13 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
+import numpy as np
 from src.domain.exceptions import InvalidPrice
 
 
 class Price:
+    __slots__ = ("_id", "_value", "_discount_percent")
+
     def __init__(
         self,
         value: float,
@@ -33,6 +36,21 @@ class Price:
             raise InvalidPrice("Discount value can not be higher than 100%.")
         return discount_percent
 
+    @staticmethod
+    def validate_many(
+        price_values: np.ndarray, discount_percents: np.ndarray
+    ) -> None:
+        if np.isnan(price_values).any():
+            raise InvalidPrice("Price value is a mandatory field.")
+        if (price_values < 0).any():
+            raise InvalidPrice("Price value can not be negative.")
+        if np.isnan(discount_percents).any():
+            raise InvalidPrice("Discount value is a mandatory field.")
+        if (discount_percents < 0).any():
+            raise InvalidPrice("Discount value can not be negative.")
+        if (discount_percents > 1).any():
+            raise InvalidPrice("Discount value can not be higher than 100%.")
+
     @property
     def id(self) -> Optional[UUID]:
         return self._id
@@ -56,3 +74,22 @@ class Price:
             "discount_percent": self.discount_percent,
             "discounted_price": self.discounted_price,
         }
+
+    @classmethod
+    def from_row(
+        cls, id: UUID, value: float, discount_percent: float
+    ) -> "Price":
+        # trusted values read back from the repository: skip validation
+        price = cls.__new__(cls)
+        price._id = id
+        price._value = value
+        price._discount_percent = discount_percent
+        return price
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Price":
+        return cls(
+            id=UUID(data["id"]),
+            value=data["value"],
+            discount_percent=data["discount_percent"],
+        )
@@ -0,0 +1,62 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from src.domain.exceptions import InvalidPrice
+from src.domain.value_objects.price import Price
+
+
+class RepricingRule:
+    __slots__ = (
+        "_category",
+        "_skus",
+        "_discount_percent",
+        "_value_change_percent",
+    )
+
+    def __init__(
+        self,
+        category: Optional[str] = None,
+        skus: Optional[List[str]] = None,
+        discount_percent: Optional[float] = None,
+        value_change_percent: Optional[float] = None,
+    ) -> None:
+        if discount_percent is None and value_change_percent is None:
+            raise InvalidPrice("Repricing rule must change the price.")
+        if discount_percent is not None:
+            Price._validate_discount(discount_percent)
+        if value_change_percent is not None and value_change_percent < -1:
+            raise InvalidPrice("Price value can not be negative.")
+        self._category = category
+        self._skus = skus
+        self._discount_percent = discount_percent
+        self._value_change_percent = value_change_percent
+
+    @property
+    def category(self) -> Optional[str]:
+        return self._category
+
+    @property
+    def skus(self) -> Optional[List[str]]:
+        return self._skus
+
+    @property
+    def discount_percent(self) -> Optional[float]:
+        return self._discount_percent
+
+    @property
+    def value_change_percent(self) -> Optional[float]:
+        return self._value_change_percent
+
+    def apply(
+        self, price_values: np.ndarray, discount_percents: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self.value_change_percent is not None:
+            price_values = np.round(
+                price_values * (1 + self.value_change_percent), 2
+            )
+        if self.discount_percent is not None:
+            discount_percents = np.full_like(
+                discount_percents, self.discount_percent
+            )
+        Price.validate_many(price_values, discount_percents)
+        return price_values, discount_percents
@@ -1,10 +1,18 @@
+import asyncio
+
 from fastapi import FastAPI
+from src.adapter.buffered_publisher import BufferedProductEventPublisher
+from src.adapter.cached_repository import CachedProductRepository
 from src.adapter.http_api import HTTPApiAdapter
+from src.adapter.null_publisher import NullProductEventPublisher
 from src.adapter.parameter_store import SSMParameterStoreAdapter
 from src.adapter.postgres import ProductPostgresAdapter
-from src.adapter.sqs import SQSAdapter
+from src.adapter.redis_cache import RedisCacheAdapter
+from src.adapter.sqs import SEND_MESSAGE_BATCH_SIZE, SQSAdapter
 from src.config import get_config
 from src.domain.services import CatalogueService
+from src.port import ProductEventPublisher, ProductRepository
+from src.utils.lru_cache import LRUCache
 
 config = get_config()
 
@@ -23,8 +31,41 @@ async def startup_event():
     config.set_parameter_store(parameter_store=parameter_store)
 
     product_postgres_adapter = ProductPostgresAdapter(
-        database_url=config.get_database_url()
+        database_url=config.get_database_url(),
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        outbox_enabled=config.OUTBOX_ENABLED,
+        trigram_search=config.SEARCH_TRIGRAM_ENABLED,
+        read_model=config.READ_MODEL_ENABLED,
+        category_cache_size=config.CATEGORY_CACHE_MAX_SIZE,
+        category_cache_ttl_seconds=config.CATEGORY_CACHE_TTL_SECONDS,
     )
+    await product_postgres_adapter.warm_up()
+    product_repository: ProductRepository = product_postgres_adapter
+    shared_cache = None
+    if config.CACHE_ENABLED:
+        local_ttl_seconds = config.CACHE_TTL_SECONDS
+        if config.CACHE_URL:
+            shared_cache = RedisCacheAdapter(url=config.CACHE_URL)
+            # writes in other processes only reach the shared cache, so
+            # local copies must expire quickly to bound their staleness
+            local_ttl_seconds = min(
+                local_ttl_seconds, config.CACHE_LOCAL_TTL_SECONDS
+            )
+        product_repository = CachedProductRepository(
+            product_repository=product_postgres_adapter,
+            cache=LRUCache(
+                max_size=config.CACHE_MAX_SIZE,
+                ttl_seconds=local_ttl_seconds,
+            ),
+            shared_cache=shared_cache,
+            shared_cache_ttl_seconds=config.CACHE_SHARED_TTL_SECONDS,
+            lock_ttl_seconds=config.CACHE_LOCK_TTL_SECONDS,
+            tombstone_ttl_seconds=config.CACHE_TOMBSTONE_TTL_SECONDS,
+        )
     sqs_adapter = SQSAdapter(
         queue_name=config.QUEUE_NAME,
         aws_access_key_id=config.AWS_ACCESS_KEY_ID,
@@ -32,9 +73,34 @@ async def startup_event():
         endpoint_url=config.ENDPOINT_URL,
         region_name=config.REGION_NAME,
     )
+    product_event_publisher: ProductEventPublisher = sqs_adapter
+    buffered_publisher = None
+    if config.OUTBOX_ENABLED:
+        product_event_publisher = NullProductEventPublisher()
+    elif config.EVENT_BUFFER_ENABLED:
+        buffered_publisher = BufferedProductEventPublisher(
+            product_event_publisher=sqs_adapter,
+            batch_size=SEND_MESSAGE_BATCH_SIZE,
+            flush_interval_seconds=config.EVENT_FLUSH_INTERVAL_SECONDS,
+            max_buffer_size=config.EVENT_BUFFER_MAX_SIZE,
+        )
+        buffered_publisher.start()
+        product_event_publisher = buffered_publisher
     catalogue_service = CatalogueService(
-        product_event_publisher=sqs_adapter,
-        product_repository=product_postgres_adapter,
+        product_event_publisher=product_event_publisher,
+        product_repository=product_repository,
     )
     http_api_adapter = HTTPApiAdapter(catalogue_service=catalogue_service)
     app.include_router(http_api_adapter.router)
+    app.state.product_postgres_adapter = product_postgres_adapter
+    app.state.shared_cache = shared_cache
+    app.state.buffered_publisher = buffered_publisher
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    if app.state.buffered_publisher is not None:
+        await asyncio.to_thread(app.state.buffered_publisher.stop)
+    await app.state.product_postgres_adapter.dispose()
+    if app.state.shared_cache is not None:
+        await app.state.shared_cache.close()
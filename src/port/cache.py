@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class Cache(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """Store the value only if the key is absent, return if it did."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
@@ -1,9 +1,28 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple
+from uuid import UUID
 
 from src.domain.events import ProductEvent
 
 
+class SerializedProductEvent(NamedTuple):
+    id: UUID
+    sku: str
+    body: str
+
+
 class ProductEventPublisher(ABC):
     @abstractmethod
     def publish(self, product_event: ProductEvent) -> None:
         raise NotImplementedError
+
+    def publish_batch(self, product_events: List[ProductEvent]) -> None:
+        for product_event in product_events:
+            self.publish(product_event=product_event)
+
+    def publish_serialized_batch(
+        self, product_events: List[SerializedProductEvent]
+    ) -> Dict[UUID, str]:
+        """Publish already rendered events as they are and return, by event
+        id, why the events the broker will never accept were rejected."""
+        raise NotImplementedError
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from src.domain.entities.product import Product
+from src.domain.value_objects import Inventory
 
 
 class ProductRepository(ABC):
     @abstractmethod
-    def create_product(
+    async def create_product(
         self,
         product: Product,
         on_duplicate_sku: Exception,
@@ -14,19 +16,138 @@ class ProductRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_product_by_sku(self, sku: str, on_not_found: Exception) -> Product:
+    async def create_products(self, products: List[Product]) -> List[Product]:
         raise NotImplementedError
 
     @abstractmethod
-    def update_product(
+    async def get_product_by_sku(
+        self, sku: str, on_not_found: Exception
+    ) -> Product:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_product_revision(
+        self, sku: str, on_not_found: Exception
+    ) -> Tuple[int, Optional[int]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_products_by_skus(self, skus: List[str]) -> List[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_products(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> List[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_products(
+        self,
+        batch_size: int,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        changed_since: Optional[int] = None,
+    ) -> AsyncIterator[List[Product]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_deleted_skus(
+        self, batch_size: int, changed_since: int
+    ) -> AsyncIterator[List[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_change_watermark(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_products_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Dict[str, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_products(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[Product, float]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_product(
         self,
         product: Product,
         on_not_found: Exception,
         on_outdated_version: Exception,
         on_duplicate: Exception,
+        expected_version: Optional[int] = None,
     ) -> Product:
         raise NotImplementedError
 
     @abstractmethod
-    def delete_product(self, sku, on_not_found: Exception) -> bool:
+    async def patch_product(
+        self,
+        product: Product,
+        changes: Dict[str, Any],
+        on_not_found: Exception,
+        on_outdated_version: Exception,
+        expected_version: int,
+    ) -> Product:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_prices(
+        self,
+        limit: int,
+        after_sku: Optional[str] = None,
+        category: Optional[str] = None,
+        skus: Optional[List[str]] = None,
+    ) -> List[Tuple[str, float, float]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_prices(
+        self,
+        skus: List[str],
+        values: List[float],
+        discount_percents: List[float],
+        expected_values: List[float],
+        expected_discount_percents: List[float],
+    ) -> List[Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reserve_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release_inventory(
+        self,
+        quantities: Dict[str, int],
+        on_not_found: Exception,
+        on_insufficient: Exception,
+    ) -> Dict[str, Inventory]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_product(self, sku, on_not_found: Exception) -> bool:
         raise NotImplementedError
@@ -0,0 +1,29 @@
+import asyncio
+
+from src.adapter.parameter_store import SSMParameterStoreAdapter
+from src.adapter.postgres import ProductPostgresAdapter
+from src.config import get_config
+
+config = get_config()
+
+
+async def main() -> None:
+    parameter_store = SSMParameterStoreAdapter(
+        endpoint_url=config.ENDPOINT_URL,
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        region_name=config.REGION_NAME,
+    )
+    config.set_parameter_store(parameter_store=parameter_store)
+
+    product_postgres_adapter = ProductPostgresAdapter(
+        database_url=config.get_database_url(), pool_size=1
+    )
+    try:
+        await product_postgres_adapter.rebuild_read_model()
+    finally:
+        await product_postgres_adapter.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
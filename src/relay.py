@@ -0,0 +1,50 @@
+import asyncio
+import signal
+
+from src.adapter.outbox_relay import OutboxRelay
+from src.adapter.parameter_store import SSMParameterStoreAdapter
+from src.adapter.postgres import ProductPostgresAdapter
+from src.adapter.sqs import SQSAdapter
+from src.config import get_config
+
+config = get_config()
+
+
+async def main() -> None:
+    parameter_store = SSMParameterStoreAdapter(
+        endpoint_url=config.ENDPOINT_URL,
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        region_name=config.REGION_NAME,
+    )
+    config.set_parameter_store(parameter_store=parameter_store)
+
+    product_postgres_adapter = ProductPostgresAdapter(
+        database_url=config.get_database_url(), pool_size=1
+    )
+    sqs_adapter = SQSAdapter(
+        queue_name=config.QUEUE_NAME,
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        endpoint_url=config.ENDPOINT_URL,
+        region_name=config.REGION_NAME,
+    )
+    outbox_relay = OutboxRelay(
+        product_postgres_adapter=product_postgres_adapter,
+        product_event_publisher=sqs_adapter,
+        batch_size=config.OUTBOX_BATCH_SIZE,
+        poll_interval_seconds=config.OUTBOX_POLL_INTERVAL_SECONDS,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop.set)
+    try:
+        await outbox_relay.run(stop=stop)
+    finally:
+        await product_postgres_adapter.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
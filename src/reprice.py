@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from src.adapter.cached_repository import CachedProductRepository
+from src.adapter.null_publisher import NullProductEventPublisher
+from src.adapter.parameter_store import SSMParameterStoreAdapter
+from src.adapter.postgres import ProductPostgresAdapter
+from src.adapter.redis_cache import RedisCacheAdapter
+from src.adapter.sqs import SQSAdapter
+from src.config import get_config
+from src.domain.services import CatalogueService
+from src.domain.value_objects import RepricingRule
+from src.port import ProductEventPublisher, ProductRepository
+
+config = get_config()
+logger = logging.getLogger("app")
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.reprice",
+        description="Reprice products in bulk.",
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--category", help="reprice a category")
+    target.add_argument(
+        "--sku", action="append", dest="skus", help="reprice a sku"
+    )
+    target.add_argument(
+        "--all", action="store_true", help="reprice every product"
+    )
+    parser.add_argument(
+        "--discount-percent",
+        type=float,
+        help="new discount, between 0 and 1",
+    )
+    parser.add_argument(
+        "--value-change-percent",
+        type=float,
+        help="relative price change, e.g. 0.1 or -0.05",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=config.REPRICE_CHUNK_SIZE
+    )
+    return parser.parse_args(args)
+
+
+async def main(args: argparse.Namespace) -> None:
+    parameter_store = SSMParameterStoreAdapter(
+        endpoint_url=config.ENDPOINT_URL,
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        region_name=config.REGION_NAME,
+    )
+    config.set_parameter_store(parameter_store=parameter_store)
+
+    product_postgres_adapter = ProductPostgresAdapter(
+        database_url=config.get_database_url(),
+        pool_size=1,
+        outbox_enabled=config.OUTBOX_ENABLED,
+        read_model=config.READ_MODEL_ENABLED,
+        category_cache_size=config.CATEGORY_CACHE_MAX_SIZE,
+        category_cache_ttl_seconds=config.CATEGORY_CACHE_TTL_SECONDS,
+    )
+    product_repository: ProductRepository = product_postgres_adapter
+    shared_cache = None
+    if config.CACHE_ENABLED and config.CACHE_URL:
+        shared_cache = RedisCacheAdapter(url=config.CACHE_URL)
+        product_repository = CachedProductRepository(
+            product_repository=product_postgres_adapter,
+            shared_cache=shared_cache,
+        )
+    product_event_publisher: ProductEventPublisher = SQSAdapter(
+        queue_name=config.QUEUE_NAME,
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        endpoint_url=config.ENDPOINT_URL,
+        region_name=config.REGION_NAME,
+    )
+    if config.OUTBOX_ENABLED:
+        product_event_publisher = NullProductEventPublisher()
+    catalogue_service = CatalogueService(
+        product_repository=product_repository,
+        product_event_publisher=product_event_publisher,
+    )
+    rule = RepricingRule(
+        category=args.category,
+        skus=args.skus,
+        discount_percent=args.discount_percent,
+        value_change_percent=args.value_change_percent,
+    )
+    try:
+        repriced = await catalogue_service.reprice_products(
+            rule=rule, chunk_size=args.chunk_size
+        )
+        logger.info(f"Repriced {repriced} products")
+    finally:
+        await product_postgres_adapter.dispose()
+        if shared_cache is not None:
+            await shared_cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,19 @@
+import base64
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode("utf8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Cursor is invalid: {error}")
+    if not isinstance(values, dict):
+        raise ValueError("Cursor is invalid")
+    return values
@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("Cache max size must be greater than zero")
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__clock = clock
+        self.__entries: "OrderedDict[Hashable, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self.__clock():
+            del self.__entries[key]
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.__entries[key] = (self.__clock() + self.__ttl_seconds, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "size": len(self.__entries),
+        }
@@ -1,8 +1,11 @@
+import gzip
+import json
 import unittest
 from unittest.mock import Mock, patch
 from uuid import uuid4
 
 from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
 from fastapi.testclient import TestClient
 from src.adapter.dto import (
     CategoryDTO,
@@ -14,6 +17,7 @@ from src.adapter.dto import (
 from src.adapter.http_api import HTTPApiAdapter
 from src.domain.entities import Category, Product
 from src.domain.exceptions import (
+    InvalidPrice,
     InvalidSku,
     OutdatedProduct,
     ProductAlreadyExist,
@@ -175,6 +179,108 @@ class TestHTTPApiAdapter(unittest.TestCase):
             {**expected_response, "id": str(expected_response["id"])},
         )
 
+    def test_should_list_products(self) -> None:
+        product = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+        )
+        self.catalogue_service_mock.list_products.return_value = (
+            [product],
+            "next",
+        )
+
+        response = self.client.get(
+            "/products",
+            params={
+                "limit": 1,
+                "category": "books",
+                "max_price": 20,
+                "in_stock": "true",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["products"][0]["sku"], "123456")
+        self.assertEqual(response.json()["next_cursor"], "next")
+        self.catalogue_service_mock.list_products.assert_called_once_with(
+            limit=1,
+            cursor=None,
+            category="books",
+            min_price=None,
+            max_price=20.0,
+            in_stock=True,
+        )
+
+    def test_should_get_product_facets(self) -> None:
+        count_products = self.catalogue_service_mock.count_products_by_category
+        count_products.return_value = {"books": 3, "games": 1}
+
+        response = self.client.get("/products/facets", params={"min_price": 5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["categories"],
+            [{"name": "books", "count": 3}, {"name": "games", "count": 1}],
+        )
+        count_products.assert_called_once_with(
+            min_price=5.0, max_price=None, in_stock=None
+        )
+
+    def test_list_products_should_reject_limit_above_maximum(self) -> None:
+        with self.assertRaises(RequestValidationError):
+            self.client.get("/products", params={"limit": 100000})
+
+    def test_should_get_products_by_skus(self) -> None:
+        product = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+        )
+        self.catalogue_service_mock.get_products_by_skus.return_value = (
+            [product],
+            ["654321"],
+        )
+
+        response = self.client.post(
+            "/products:batchGet", json={"skus": ["123456", "654321"]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["sku"] for item in response.json()["products"]], ["123456"]
+        )
+        self.assertEqual(response.json()["missing"], ["654321"])
+
+    def test_get_products_by_skus_should_reject_empty_list(self) -> None:
+        with self.assertRaises(RequestValidationError):
+            self.client.post("/products:batchGet", json={"skus": []})
+
+        self.catalogue_service_mock.get_products_by_skus.assert_not_called()
+
+    def test_get_product_by_sku_should_answer_not_modified(self) -> None:
+        product = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            version=1,
+        )
+        self.catalogue_service_mock.get_product_by_sku.return_value = product
+        self.catalogue_service_mock.get_product_revision.return_value = (
+            1,
+            None,
+        )
+
+        etag = self.client.get("/product/123456").headers["ETag"]
+        response = self.client.get(
+            "/product/123456", headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        self.catalogue_service_mock.get_product_by_sku.assert_called_once()
+
     @patch("logging.Logger.error")
     def test_get_product_by_sku_should_raise_not_found(
         self, mock_logger_error: Mock
@@ -338,6 +444,76 @@ class TestHTTPApiAdapter(unittest.TestCase):
         self.assertIn("Outdated product", context.exception.detail)
         mock_logger_error.assert_called_once()
 
+    def test_update_product_should_forward_if_match_version(self) -> None:
+        product_request = ProductRequestDTO(
+            sku="123456",
+            name="updated_name",
+            description="updated_description",
+        )
+        self.catalogue_service_mock.get_product_by_sku.return_value = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            version=2,
+        )
+        self.catalogue_service_mock.update_product.return_value = Product(
+            sku="123456",
+            name="updated_name",
+            description="updated_description",
+            version=3,
+        )
+        etag = self.client.get("/product/123456").headers["ETag"]
+
+        response = self.client.put(
+            "/product/123456",
+            json=product_request.model_dump(),
+            headers={"If-Match": etag},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        kwargs = self.catalogue_service_mock.update_product.call_args.kwargs
+        self.assertEqual(kwargs["expected_version"], 2)
+
+    def test_should_patch_product(self) -> None:
+        self.catalogue_service_mock.patch_product.return_value = Product(
+            sku="123456",
+            name="test_name",
+            description="test_description",
+            inventory=Inventory(quantity=3, reserved=0),
+            version=4,
+        )
+
+        response = self.client.patch(
+            "/product/123456", json={"inventory": {"quantity": 3}}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inventory"]["quantity"], 3)
+        self.assertIn("ETag", response.headers)
+        self.catalogue_service_mock.patch_product.assert_called_once_with(
+            sku="123456",
+            changes={"inventory": {"quantity": 3}},
+            expected_version=None,
+        )
+
+    def test_update_product_should_reject_unknown_if_match(self) -> None:
+        product_request = ProductRequestDTO(
+            sku="123456",
+            name="updated_name",
+            description="updated_description",
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.put(
+                "/product/123456",
+                json=product_request.model_dump(),
+                headers={"If-Match": '"unknown"'},
+            )
+
+        self.assertEqual(context.exception.status_code, 412)
+        self.catalogue_service_mock.update_product.assert_not_called()
+
     @patch("logging.Logger.error")
     def test_update_product_should_raise_generic_exception(
         self, mock_logger_error: Mock
@@ -364,6 +540,221 @@ class TestHTTPApiAdapter(unittest.TestCase):
         )
         mock_logger_error.assert_called_once()
 
+    def test_should_import_products_from_json_list(self) -> None:
+        rows = [
+            {
+                "sku": "123456",
+                "name": "test_name",
+                "description": "test_description",
+                "price": {"value": 10.0, "discount_percent": 0.1},
+                "inventory": {"quantity": 10, "reserved": 1},
+                "category": {"name": "test_category"},
+            },
+            {"sku": "654321", "name": "test_name"},
+            {
+                "sku": "111111",
+                "name": "test_name",
+                "description": "test_description",
+                "inventory": {"quantity": 1, "reserved": 2},
+            },
+            {
+                "sku": "222222",
+                "name": "test_name",
+                "description": "test_description",
+            },
+        ]
+        self.catalogue_service_mock.import_products.return_value = (
+            [Mock(spec=Product)],
+            [(1, "Product already exists")],
+        )
+
+        response = self.client.post("/products:import", json=rows)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(
+            [failure["index"] for failure in response.json()["failed"]],
+            [1, 2, 3],
+        )
+        self.assertIn("description", response.json()["failed"][0]["error"])
+        self.assertEqual(response.json()["failed"][1]["sku"], "111111")
+        self.assertEqual(
+            response.json()["failed"][2],
+            {"index": 3, "sku": "222222", "error": "Product already exists"},
+        )
+        products = self.catalogue_service_mock.import_products.call_args[1][
+            "products"
+        ]
+        self.assertEqual(
+            [fields["sku"] for fields in products], ["123456", "222222"]
+        )
+        self.assertIsInstance(products[0]["price"], Price)
+        self.assertIsInstance(products[0]["inventory"], Inventory)
+        self.assertIsInstance(products[0]["category"], Category)
+
+    def test_should_import_products_from_ndjson_stream(self) -> None:
+        lines = [
+            '{"sku": "123456", "name": "test_name", '
+            '"description": "test_description"}',
+            "",
+            "not json",
+            '{"sku": "654321", "name": "test_name", '
+            '"description": "test_description"}',
+        ]
+        self.catalogue_service_mock.import_products.return_value = (
+            [Mock(spec=Product), Mock(spec=Product)],
+            [],
+        )
+
+        response = self.client.post(
+            "/products:import",
+            content="\n".join(lines).encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual(response.json()["failed"][0]["index"], 1)
+        products = self.catalogue_service_mock.import_products.call_args[1][
+            "products"
+        ]
+        self.assertEqual(
+            [fields["sku"] for fields in products], ["123456", "654321"]
+        )
+
+    def test_should_report_too_long_category_as_row_failure(self) -> None:
+        rows = [
+            {
+                "sku": "123456",
+                "name": "test_name",
+                "description": "test_description",
+                "category": {"name": "c" * 256},
+            },
+            {
+                "sku": "654321",
+                "name": "test_name",
+                "description": "test_description",
+            },
+        ]
+        self.catalogue_service_mock.import_products.return_value = (
+            [Mock(spec=Product)],
+            [],
+        )
+
+        response = self.client.post("/products:import", json=rows)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["failed"],
+            [
+                {
+                    "index": 0,
+                    "sku": "123456",
+                    "error": "Name can not have more than 255 characters.",
+                }
+            ],
+        )
+        products = self.catalogue_service_mock.import_products.call_args[1][
+            "products"
+        ]
+        self.assertEqual([fields["sku"] for fields in products], ["654321"])
+
+    @patch("logging.Logger.error")
+    def test_import_products_should_reject_non_list_body(
+        self, mock_logger_error: Mock
+    ) -> None:
+        with self.assertRaises(HTTPException) as context:
+            self.client.post("/products:import", json={"sku": "123456"})
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.catalogue_service_mock.import_products.assert_not_called()
+
+    def __export_batches(self, *batches, deleted_skus=None):
+        async def export(items):
+            for item in items:
+                yield item
+
+        self.catalogue_service_mock.export_products.return_value = (
+            42,
+            export(deleted_skus) if deleted_skus is not None else None,
+            export(batches),
+        )
+
+    def test_should_export_products_as_ndjson(self) -> None:
+        self.__export_batches(
+            [
+                Product(
+                    sku="123456",
+                    name="test_name",
+                    description="test_description",
+                    price=Price(value=10.0),
+                ),
+                Product(
+                    sku="234567", name="test_name", description="test_desc"
+                ),
+            ],
+            [Product(sku="345678", name="test_name", description="test")],
+            deleted_skus=[["012345"]],
+        )
+
+        response = self.client.get(
+            "/products:export",
+            params={"category": "books", "changed_since": 7},
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response.headers["content-type"].startswith("application/x-ndjson")
+        )
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.headers["x-export-watermark"], "42")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(lines[0], {"sku": "012345", "deleted": True})
+        self.assertEqual(
+            [line["sku"] for line in lines[1:]],
+            ["123456", "234567", "345678"],
+        )
+        self.assertEqual(lines[1]["price"]["value"], 10.0)
+        self.catalogue_service_mock.export_products.assert_called_once_with(
+            batch_size=1000,
+            category="books",
+            min_price=None,
+            max_price=None,
+            in_stock=None,
+            changed_since=7,
+        )
+
+    def test_should_gzip_export_when_accepted(self) -> None:
+        self.__export_batches(
+            [Product(sku="123456", name="test_name", description="test")]
+        )
+
+        with self.client.stream(
+            "GET",
+            "/products:export",
+            headers={"Accept-Encoding": "br;q=1.0, gzip;q=0.8"},
+        ) as response:
+            body = b"".join(response.iter_raw())
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body))["sku"], "123456")
+
+    @patch("logging.Logger.error")
+    def test_export_products_should_reject_inverted_price_range(
+        self, mock_logger_error: Mock
+    ) -> None:
+        self.catalogue_service_mock.export_products.side_effect = InvalidPrice(
+            "Minimum price can not be higher than maximum price."
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            self.client.get(
+                "/products:export", params={"min_price": 10, "max_price": 5}
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
     def test_delete_product(self):
         response = self.client.delete("/product/123456")
 
@@ -1,17 +1,21 @@
+import json
 import logging
 import os
 import random
 import unittest
 from typing import Optional
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 from alembic import command
 from alembic.config import Config
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from src.adapter.exceptions import DatabaseException
 from src.adapter.postgres import ProductPostgresAdapter
 from src.config import get_config
 from src.domain.entities import Category, Product
+from src.domain.enums import ProductEventType
+from src.domain.events import ProductEvent
 from src.domain.value_objects import Inventory, Price
 from src.port.parameter_store import ParameterStore
 
@@ -27,7 +31,7 @@ class MockParameterStore(ParameterStore):
         return self.get_parameter("DATABASE_URL")
 
 
-class TestProductPostgresAdapter(unittest.TestCase):
+class TestProductPostgresAdapter(unittest.IsolatedAsyncioTestCase):
 
     @classmethod
     def setUpClass(cls):
@@ -52,10 +56,24 @@ class TestProductPostgresAdapter(unittest.TestCase):
         database_url = config.get_database_url()
         self.adapter = ProductPostgresAdapter(database_url=database_url)
 
-    def tearDown(self):
-        pass
+    async def asyncTearDown(self):
+        await self.adapter.dispose()
 
-    def test_create_product(self):
+    async def test_warm_up(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), pool_size=3
+        )
+
+        await adapter.warm_up()
+
+        with self.assertRaises(DatabaseException):
+            await adapter.get_product_by_sku(
+                sku="missing-sku",
+                on_not_found=DatabaseException("Product not found"),
+            )
+        await adapter.dispose()
+
+    async def test_create_product(self):
         product_id = uuid4()
         price_id = uuid4()
         inventory_id = uuid4()
@@ -74,13 +92,13 @@ class TestProductPostgresAdapter(unittest.TestCase):
             category=Category(id=category_id, name="Test Category"),
         )
 
-        created_product = self.adapter.create_product(
+        created_product = await self.adapter.create_product(
             product=product,
             on_duplicate_sku=DatabaseException("Duplicate SKU"),
             on_not_found=DatabaseException("Product not found"),
         )
 
-        retrieved_product = self.adapter.get_product_by_sku(
+        retrieved_product = await self.adapter.get_product_by_sku(
             sku=product_sku,
             on_not_found=DatabaseException("Product not found"),
         )
@@ -89,7 +107,164 @@ class TestProductPostgresAdapter(unittest.TestCase):
         self.assertEqual(created_product.sku, product_sku)
         self.assertEqual(retrieved_product.sku, product_sku)
 
-    def test_get_product_by_sku(self):
+    async def test_create_product_with_existing_category(self):
+        category_name = f"Shared Category {uuid4()}"
+        first_product = Product(
+            sku=str(uuid4())[:8],
+            name="First Product",
+            description="First product in the category",
+            image_url="https://example.com/first.jpg",
+            price=Price(value=10.0, discount_percent=0.0),
+            inventory=Inventory(quantity=1, reserved=0),
+            category=Category(name=category_name),
+        )
+        second_product = Product(
+            sku=str(uuid4())[:8],
+            name="Second Product",
+            description="Second product in the category",
+            image_url="https://example.com/second.jpg",
+            price=Price(value=20.0, discount_percent=0.5),
+            inventory=Inventory(quantity=2, reserved=1),
+            category=Category(name=category_name),
+        )
+
+        first_created = await self.adapter.create_product(
+            product=first_product,
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        second_created = await self.adapter.create_product(
+            product=second_product,
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=second_product.sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+
+        self.assertEqual(second_created.version, 0)
+        self.assertEqual(first_created.category.id, second_created.category.id)
+        self.assertEqual(
+            retrieved_product.category.id, first_created.category.id
+        )
+        self.assertEqual(retrieved_product.price.discount_percent, 0.5)
+        self.assertEqual(retrieved_product.inventory.reserved, 1)
+
+    async def test_create_product_with_duplicated_sku(self):
+        product = Product(
+            sku=str(uuid4())[:8],
+            name="Test Product",
+            description="This is a test product",
+            image_url="https://example.com/product.jpg",
+            price=Price(value=10.0, discount_percent=0.0),
+            inventory=Inventory(quantity=1, reserved=0),
+            category=Category(name="Test Category"),
+        )
+        await self.adapter.create_product(
+            product=product,
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+
+        with self.assertRaises(ValueError):
+            await self.adapter.create_product(
+                product=Product(
+                    sku=product.sku,
+                    name="Test Product",
+                    description="This is a test product",
+                    image_url="https://example.com/product.jpg",
+                ),
+                on_duplicate_sku=ValueError("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+
+    async def test_create_products(self):
+        existing_product = Product(
+            sku=str(uuid4())[:8],
+            name="Existing Product",
+            description="Product created before the import",
+            image_url="https://example.com/existing.jpg",
+            price=Price(value=5.0, discount_percent=0.0),
+            inventory=Inventory(quantity=5, reserved=0),
+            category=Category(name="Import Category 0"),
+        )
+        await self.adapter.create_product(
+            product=existing_product,
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        products = [
+            Product(
+                sku=str(uuid4())[:8],
+                name=f"Imported Product {index}",
+                description="Product created by the import",
+                image_url="https://example.com/imported.jpg",
+                price=Price(value=10.0 + index, discount_percent=0.1),
+                inventory=Inventory(quantity=index, reserved=0),
+                category=Category(name=f"Import Category {index % 2}"),
+            )
+            for index in range(5)
+        ]
+        duplicated_product = Product(
+            sku=existing_product.sku,
+            name="Duplicated Product",
+            description="Product with an existing sku",
+            image_url="https://example.com/duplicated.jpg",
+            price=Price(value=1.0, discount_percent=0.0),
+            inventory=Inventory(quantity=1, reserved=0),
+        )
+
+        created_products = await self.adapter.create_products(
+            products=products + [duplicated_product]
+        )
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=products[3].sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        existing_retrieved = await self.adapter.get_product_by_sku(
+            sku=existing_product.sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+
+        self.assertEqual(
+            [product.sku for product in created_products],
+            [product.sku for product in products],
+        )
+        self.assertEqual(
+            created_products[1].category.id, created_products[3].category.id
+        )
+        self.assertEqual(retrieved_product.price.value, 13.0)
+        self.assertEqual(retrieved_product.inventory.quantity, 3)
+        self.assertEqual(retrieved_product.category.name, "Import Category 1")
+        self.assertEqual(existing_retrieved.name, "Existing Product")
+
+    async def test_create_products_without_image_url(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), read_model=True
+        )
+        product = Product(
+            sku=f"no-image-{uuid4().hex[:12]}",
+            name="Imageless Product",
+            description="Product imported without an image",
+        )
+        try:
+            created_products = await adapter.create_products(
+                products=[product]
+            )
+            retrieved_product = await adapter.get_product_by_sku(
+                sku=product.sku,
+                on_not_found=DatabaseException("Product not found"),
+            )
+        finally:
+            await adapter.dispose()
+
+        self.assertEqual(
+            [created.sku for created in created_products], [product.sku]
+        )
+        self.assertIsNone(retrieved_product.image_url)
+
+    async def test_get_product_by_sku(self):
         product_id = uuid4()
         price_id = uuid4()
         inventory_id = uuid4()
@@ -108,13 +283,13 @@ class TestProductPostgresAdapter(unittest.TestCase):
             category=Category(id=category_id, name="Test Category"),
         )
 
-        self.adapter.create_product(
+        await self.adapter.create_product(
             product=product,
             on_duplicate_sku=DatabaseException("Duplicate SKU"),
             on_not_found=DatabaseException("Product not found"),
         )
 
-        retrieved_product = self.adapter.get_product_by_sku(
+        retrieved_product = await self.adapter.get_product_by_sku(
             sku=product_sku,
             on_not_found=DatabaseException("Product not found"),
         )
@@ -122,8 +297,203 @@ class TestProductPostgresAdapter(unittest.TestCase):
         self.assertIsNotNone(retrieved_product)
         self.assertEqual(retrieved_product.sku, product_sku)
         self.assertEqual(retrieved_product.name, "Test Product")
+        self.assertEqual(
+            await self.adapter.get_product_revision(
+                sku=product_sku,
+                on_not_found=DatabaseException("Product not found"),
+            ),
+            (retrieved_product.version, retrieved_product.inventory.reserved),
+        )
+
+    async def test_get_products_by_skus(self):
+        prefix = str(uuid4())[:8]
+        products = [
+            Product(
+                sku=f"{prefix}-{index}",
+                name="Test Product",
+                description="This is a test product",
+                image_url="https://example.com/product.jpg",
+                price=Price(value=10.0 + index, discount_percent=0.0),
+                inventory=Inventory(quantity=index, reserved=0),
+                category=Category(name="Test Category"),
+            )
+            for index in range(3)
+        ]
+        products.append(
+            Product(
+                sku=f"{prefix}-bare",
+                name="Test Product",
+                description="This is a test product",
+                image_url="https://example.com/product.jpg",
+            )
+        )
+        await self.adapter.create_products(products=products)
+
+        retrieved_products = await self.adapter.get_products_by_skus(
+            skus=[
+                f"{prefix}-2",
+                f"{prefix}-missing",
+                f"{prefix}-bare",
+                f"{prefix}-0",
+            ]
+        )
+
+        self.assertEqual(
+            [product.sku for product in retrieved_products],
+            [f"{prefix}-2", f"{prefix}-bare", f"{prefix}-0"],
+        )
+        self.assertEqual(retrieved_products[0].price.value, 12.0)
+        self.assertEqual(retrieved_products[0].inventory.quantity, 2)
+        self.assertIsNone(retrieved_products[1].price)
+        self.assertIsNone(retrieved_products[1].inventory)
+
+    async def test_list_products(self):
+        prefix = str(uuid4())[:8]
+        category = f"{prefix}-category"
+        await self.adapter.create_products(
+            products=[
+                Product(
+                    sku=f"{prefix}-{index}",
+                    name="Test Product",
+                    description="This is a test product",
+                    image_url="https://example.com/product.jpg",
+                    category=Category(name=category if index % 2 else "other"),
+                )
+                for index in range(5)
+            ]
+        )
+
+        first_page = await self.adapter.list_products(
+            limit=2, after_sku=prefix
+        )
+        second_page = await self.adapter.list_products(
+            limit=2, after_sku=first_page[-1].sku
+        )
+        filtered = await self.adapter.list_products(
+            limit=10, category=category
+        )
+
+        self.assertEqual(
+            [product.sku for product in first_page + second_page],
+            [f"{prefix}-{index}" for index in range(4)],
+        )
+        self.assertEqual(
+            [product.sku for product in filtered],
+            [f"{prefix}-1", f"{prefix}-3"],
+        )
+
+    async def test_outbox_events_are_written_with_changes_and_drained(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), outbox_enabled=True
+        )
+        self.addAsyncCleanup(adapter.dispose)
+        await adapter.drain_outbox(
+            publish=AsyncMock(return_value={}), limit=10000
+        )
+        sku = str(uuid4())[:8]
+        product = Product(
+            sku=sku,
+            name="Test Product",
+            description="This is a test product",
+            image_url="https://example.com/product.jpg",
+            price=Price(value=10.0, discount_percent=0.0),
+            category=Category(name="Test Category"),
+        )
+        await adapter.create_product(
+            product=product,
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        await adapter.update_product(
+            product=Product(
+                sku=sku,
+                name="Updated Product",
+                description="This is a test product",
+                image_url="https://example.com/product.jpg",
+            ),
+            on_not_found=DatabaseException("Product not found"),
+            on_outdated_version=DatabaseException("Outdated version"),
+            on_duplicate=DatabaseException("Duplicated product"),
+        )
+        await adapter.delete_product(
+            sku=sku, on_not_found=DatabaseException("Product not found")
+        )
+
+        failing_publish = AsyncMock(side_effect=Exception("sqs down"))
+        with self.assertRaises(DatabaseException):
+            await adapter.drain_outbox(publish=failing_publish)
+        publish = AsyncMock(return_value={})
+        relayed = await adapter.drain_outbox(publish=publish, limit=10)
+
+        self.assertEqual(relayed, 3)
+        product_events = [
+            ProductEvent.from_dict(json.loads(product_event.body))
+            for product_event in publish.await_args[0][0]
+        ]
+        self.assertEqual(
+            [product_event.type for product_event in product_events],
+            [
+                ProductEventType.CREATED,
+                ProductEventType.UPDATED,
+                ProductEventType.DELETED,
+            ],
+        )
+        self.assertEqual(
+            {product_event.sku for product_event in publish.await_args[0][0]},
+            {sku},
+        )
+        self.assertEqual(product_events[1].product.name, "Updated Product")
+        self.assertEqual(product_events[1].product.version, 1)
+        self.assertEqual(
+            await adapter.drain_outbox(publish=publish, limit=10), 0
+        )
+
+    async def test_outbox_rows_rejected_by_the_publisher_are_not_retried(
+        self,
+    ):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), outbox_enabled=True
+        )
+        self.addAsyncCleanup(adapter.dispose)
+        await adapter.drain_outbox(
+            publish=AsyncMock(return_value={}), limit=10000
+        )
+        skus = [str(uuid4())[:8] for _ in range(2)]
+        for sku in skus:
+            await adapter.create_product(
+                product=Product(
+                    sku=sku,
+                    name="Test Product",
+                    description="This is a test product",
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+
+        async def reject_first(product_events):
+            return {product_events[0].id: "InvalidMessageContents: bad"}
 
-    def test_update_product(self):
+        relayed = await adapter.drain_outbox(publish=reject_first, limit=10)
+        publish = AsyncMock(return_value={})
+        drained_again = await adapter.drain_outbox(publish=publish, limit=10)
+
+        self.assertEqual(relayed, 2)
+        self.assertEqual(drained_again, 0)
+        publish.assert_not_awaited()
+        with self.engine.connect() as connection:
+            failed = connection.execute(
+                text(
+                    'SELECT sku, error FROM "ProductOutbox" '
+                    "WHERE failed_at IS NOT NULL AND sku = :sku"
+                ),
+                {"sku": skus[0]},
+            ).fetchall()
+        self.assertEqual(
+            [tuple(row) for row in failed],
+            [(skus[0], "InvalidMessageContents: bad")],
+        )
+
+    async def test_update_product(self):
         product_id = uuid4()
         price_id = uuid4()
         inventory_id = uuid4()
@@ -143,7 +513,7 @@ class TestProductPostgresAdapter(unittest.TestCase):
             category=Category(id=category_id, name="Test Category 2"),
         )
 
-        self.adapter.create_product(
+        await self.adapter.create_product(
             product=product,
             on_duplicate_sku=DatabaseException("Duplicate SKU"),
             on_not_found=DatabaseException("Product not found"),
@@ -161,14 +531,14 @@ class TestProductPostgresAdapter(unittest.TestCase):
             category=Category(id=new_category_id, name="Updated Category"),
         )
 
-        updated_product_result = self.adapter.update_product(
+        updated_product_result = await self.adapter.update_product(
             product=updated_product,
             on_not_found=DatabaseException("Product not found"),
             on_outdated_version=DatabaseException("Outdated version"),
             on_duplicate=DatabaseException("Duplicate product"),
         )
 
-        retrieved_product = self.adapter.get_product_by_sku(
+        retrieved_product = await self.adapter.get_product_by_sku(
             sku=product_sku,
             on_not_found=DatabaseException("Product not found"),
         )
@@ -176,8 +546,515 @@ class TestProductPostgresAdapter(unittest.TestCase):
         self.assertIsNotNone(updated_product_result)
         self.assertEqual(updated_product_result.name, "Updated Product Name")
         self.assertEqual(retrieved_product.name, "Updated Product Name")
+        self.assertEqual(retrieved_product.version, 1)
+        self.assertEqual(retrieved_product.price.value, 59.99)
+        self.assertEqual(retrieved_product.inventory.quantity, 60)
+        self.assertEqual(retrieved_product.category.name, "Updated Category")
+
+    async def test_update_product_with_outdated_expected_version(self):
+        product_sku = str(random.randint(1001, 2000))
+        await self.adapter.create_product(
+            product=Product(
+                sku=product_sku,
+                name="Versioned Product",
+                description="Versioned description",
+                image_url="https://example.com/versioned.jpg",
+            ),
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+
+        with self.assertRaises(DatabaseException) as context:
+            await self.adapter.update_product(
+                product=Product(
+                    sku=product_sku,
+                    name="Lost Update",
+                    description="Versioned description",
+                    image_url="https://example.com/versioned.jpg",
+                    price=Price(value=10.0, discount_percent=0),
+                ),
+                on_not_found=DatabaseException("Product not found"),
+                on_outdated_version=DatabaseException("Outdated version"),
+                on_duplicate=DatabaseException("Duplicate product"),
+                expected_version=3,
+            )
+
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=product_sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        self.assertEqual(str(context.exception), "Outdated version")
+        self.assertEqual(retrieved_product.name, "Versioned Product")
+        self.assertEqual(retrieved_product.version, 0)
+        self.assertIsNone(retrieved_product.price)
+
+    async def test_update_product_creates_missing_price_and_inventory(self):
+        product_sku = str(random.randint(2001, 3000))
+        await self.adapter.create_product(
+            product=Product(
+                sku=product_sku,
+                name="Bare Product",
+                description="Bare description",
+                image_url="https://example.com/bare.jpg",
+            ),
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+
+        updated_product = await self.adapter.update_product(
+            product=Product(
+                sku=product_sku,
+                name="Bare Product",
+                description="Bare description",
+                image_url="https://example.com/bare.jpg",
+                price=Price(value=19.99, discount_percent=0),
+                inventory=Inventory(quantity=7, reserved=0),
+            ),
+            on_not_found=DatabaseException("Product not found"),
+            on_outdated_version=DatabaseException("Outdated version"),
+            on_duplicate=DatabaseException("Duplicate product"),
+            expected_version=0,
+        )
+
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=product_sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        self.assertEqual(updated_product.version, 1)
+        self.assertEqual(retrieved_product.price.value, 19.99)
+        self.assertEqual(retrieved_product.inventory.quantity, 7)
+
+    async def test_patch_product(self):
+        product_sku = str(random.randint(3001, 4000))
+        product = await self.adapter.create_product(
+            product=Product(
+                sku=product_sku,
+                name="Patched Product",
+                description="Patched description",
+                image_url="https://example.com/patched.jpg",
+                price=Price(value=10.0, discount_percent=0.2),
+                inventory=Inventory(quantity=5, reserved=1),
+                category=Category(name="Patched Category"),
+            ),
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        changes = {"price": {"value": 12.0}, "inventory": {"quantity": 9}}
+
+        patched_product = await self.adapter.patch_product(
+            product=product.patch(changes),
+            changes=changes,
+            on_not_found=DatabaseException("Product not found"),
+            on_outdated_version=DatabaseException("Outdated version"),
+            expected_version=product.version,
+        )
+        with self.assertRaises(DatabaseException) as context:
+            await self.adapter.patch_product(
+                product=product.patch({"name": "Lost Update"}),
+                changes={"name": "Lost Update"},
+                on_not_found=DatabaseException("Product not found"),
+                on_outdated_version=DatabaseException("Outdated version"),
+                expected_version=product.version,
+            )
+
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=product_sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        self.assertEqual(str(context.exception), "Outdated version")
+        self.assertEqual(patched_product.version, product.version + 1)
+        self.assertEqual(retrieved_product.version, product.version + 1)
+        self.assertEqual(retrieved_product.name, "Patched Product")
+        self.assertEqual(retrieved_product.price.id, product.price.id)
+        self.assertEqual(retrieved_product.price.value, 12.0)
+        self.assertEqual(retrieved_product.price.discount_percent, 0.2)
+        self.assertEqual(retrieved_product.inventory.quantity, 9)
+        self.assertEqual(retrieved_product.inventory.reserved, 1)
+        self.assertEqual(retrieved_product.category.name, "Patched Category")
+
+    async def test_patch_product_creates_missing_price(self):
+        product_sku = str(random.randint(4001, 5000))
+        product = await self.adapter.create_product(
+            product=Product(
+                sku=product_sku,
+                name="Bare Product",
+                description="Bare description",
+                image_url="https://example.com/bare.jpg",
+            ),
+            on_duplicate_sku=DatabaseException("Duplicate SKU"),
+            on_not_found=DatabaseException("Product not found"),
+        )
+        changes = {"price": {"value": 3.5}, "category": {"name": "Bare"}}
+
+        await self.adapter.patch_product(
+            product=product.patch(changes),
+            changes=changes,
+            on_not_found=DatabaseException("Product not found"),
+            on_outdated_version=DatabaseException("Outdated version"),
+            expected_version=product.version,
+        )
+
+        retrieved_product = await self.adapter.get_product_by_sku(
+            sku=product_sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        self.assertEqual(retrieved_product.price.value, 3.5)
+        self.assertEqual(retrieved_product.price.discount_percent, 0)
+        self.assertEqual(retrieved_product.category.name, "Bare")
+
+    async def test_reserve_and_release_inventory(self):
+        first_sku = str(random.randint(5001, 6000))
+        second_sku = str(random.randint(6001, 7000))
+        for sku, quantity in ((first_sku, 5), (second_sku, 1)):
+            await self.adapter.create_product(
+                product=Product(
+                    sku=sku,
+                    name="Stocked Product",
+                    description="Stocked description",
+                    image_url="https://example.com/stocked.jpg",
+                    inventory=Inventory(quantity=quantity, reserved=0),
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+
+        reserved = await self.adapter.reserve_inventory(
+            quantities={first_sku: 3, second_sku: 1},
+            on_not_found=KeyError("not found"),
+            on_insufficient=ValueError("insufficient"),
+        )
+        with self.assertRaises(ValueError):
+            await self.adapter.reserve_inventory(
+                quantities={first_sku: 1, second_sku: 1},
+                on_not_found=KeyError("not found"),
+                on_insufficient=ValueError("insufficient"),
+            )
+        with self.assertRaises(KeyError):
+            await self.adapter.reserve_inventory(
+                quantities={first_sku: 1, "missing-sku": 1},
+                on_not_found=KeyError("not found"),
+                on_insufficient=ValueError("insufficient"),
+            )
+        with self.assertRaises(ValueError):
+            await self.adapter.release_inventory(
+                quantities={first_sku: 4},
+                on_not_found=KeyError("not found"),
+                on_insufficient=ValueError("insufficient"),
+            )
+        released = await self.adapter.release_inventory(
+            quantities={first_sku: 2},
+            on_not_found=KeyError("not found"),
+            on_insufficient=ValueError("insufficient"),
+        )
+
+        first_product = await self.adapter.get_product_by_sku(
+            sku=first_sku,
+            on_not_found=DatabaseException("Product not found"),
+        )
+        patched_product = await self.adapter.patch_product(
+            product=first_product.patch({"name": "Restocked Product"}),
+            changes={"name": "Restocked Product"},
+            on_not_found=KeyError("not found"),
+            on_outdated_version=ValueError("outdated"),
+            expected_version=0,
+        )
+        self.assertEqual(reserved[first_sku].reserved, 3)
+        self.assertEqual(reserved[second_sku].reserved, 1)
+        self.assertEqual(released[first_sku].reserved, 1)
+        self.assertEqual(first_product.inventory.quantity, 5)
+        self.assertEqual(first_product.inventory.reserved, 1)
+        self.assertEqual(first_product.version, 0)
+        self.assertEqual(patched_product.version, 1)
+        self.assertEqual(patched_product.inventory.reserved, 1)
+
+    async def test_list_and_update_prices(self):
+        category = f"Repricing {uuid4()}"
+        skus = [f"reprice-{uuid4()}" for _ in range(3)]
+        for index, sku in enumerate(skus):
+            await self.adapter.create_product(
+                product=Product(
+                    sku=sku,
+                    name="Repriced Product",
+                    description="Repriced description",
+                    image_url="https://example.com/repriced.jpg",
+                    price=Price(value=10.0 * (index + 1), discount_percent=0),
+                    category=Category(name=category),
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+        skus.sort()
+
+        first_page = await self.adapter.list_prices(limit=2, category=category)
+        second_page = await self.adapter.list_prices(
+            limit=2, after_sku=first_page[-1][0], category=category
+        )
+        products = await self.adapter.update_prices(
+            skus=skus[:2],
+            values=[first_page[0][1], 99.0],
+            discount_percents=[0.3, 0.3],
+            expected_values=[first_page[0][1], -1.0],
+            expected_discount_percents=[0.0, 0.0],
+        )
+
+        self.assertEqual([row[0] for row in first_page], skus[:2])
+        self.assertEqual([row[0] for row in second_page], skus[2:])
+        self.assertEqual([product.sku for product in products], skus[:1])
+        self.assertEqual(products[0].price.discount_percent, 0.3)
+        self.assertEqual(products[0].version, 1)
+        unchanged = await self.adapter.get_product_by_sku(
+            sku=skus[1], on_not_found=DatabaseException("Product not found")
+        )
+        self.assertEqual(unchanged.price.discount_percent, 0)
+        self.assertEqual(unchanged.version, 0)
+
+    async def test_list_products_with_facet_filters(self):
+        category = f"Facets {uuid4()}"
+        fixtures = [
+            ("cheap-in-stock", 10.0, 0.5, 3, 1),
+            ("cheap-sold-out", 8.0, 0.0, 2, 2),
+            ("pricey-in-stock", 100.0, 0.1, 5, 0),
+        ]
+        skus = {}
+        for name, value, discount, quantity, reserved in fixtures:
+            skus[name] = f"{name}-{uuid4().hex[:12]}"
+            await self.adapter.create_product(
+                product=Product(
+                    sku=skus[name],
+                    name="Faceted Product",
+                    description="Faceted description",
+                    image_url="https://example.com/faceted.jpg",
+                    price=Price(value=value, discount_percent=discount),
+                    inventory=Inventory(quantity=quantity, reserved=reserved),
+                    category=Category(name=category),
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+
+        cheap = await self.adapter.list_products(
+            limit=10, category=category, max_price=9.0
+        )
+        cheap_in_stock = await self.adapter.list_products(
+            limit=10, category=category, max_price=9.0, in_stock=True
+        )
+        sold_out = await self.adapter.list_products(
+            limit=10, category=category, in_stock=False
+        )
+        counts = await self.adapter.count_products_by_category(min_price=5.0)
+        in_stock_counts = await self.adapter.count_products_by_category(
+            in_stock=True
+        )
+
+        self.assertEqual(
+            sorted(product.sku for product in cheap),
+            sorted([skus["cheap-in-stock"], skus["cheap-sold-out"]]),
+        )
+        self.assertEqual(
+            [product.sku for product in cheap_in_stock],
+            [skus["cheap-in-stock"]],
+        )
+        self.assertEqual(
+            [product.sku for product in sold_out], [skus["cheap-sold-out"]]
+        )
+        self.assertEqual(counts[category], 3)
+        self.assertEqual(in_stock_counts[category], 2)
+
+    async def test_export_products_streams_batches(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), read_model=True
+        )
+        category = f"Export {uuid4().hex[:12]}"
+        skus = sorted(f"export-{uuid4().hex[:12]}" for _ in range(4))
+        try:
+            created_products = []
+            for sku in skus:
+                created_products.append(
+                    await adapter.create_product(
+                        product=Product(
+                            sku=sku,
+                            name="Exported Product",
+                            description="Exported description",
+                            image_url="https://example.com/exported.jpg",
+                            price=Price(value=10.0),
+                            inventory=Inventory(quantity=10),
+                            category=Category(name=category),
+                        ),
+                        on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                        on_not_found=DatabaseException("Product not found"),
+                    )
+                )
+            checkpoint = await adapter.get_change_watermark()
+            await adapter.patch_product(
+                product=created_products[1].patch({"name": "Changed"}),
+                changes={"name": "Changed"},
+                on_not_found=KeyError("not found"),
+                on_outdated_version=ValueError("outdated"),
+                expected_version=created_products[1].version,
+            )
+            await adapter.reserve_inventory(
+                quantities={skus[2]: 1},
+                on_not_found=KeyError("not found"),
+                on_insufficient=ValueError("insufficient"),
+            )
+            await adapter.delete_product(
+                sku=skus[0], on_not_found=KeyError("not found")
+            )
+            deleted_skus = [
+                sku
+                async for batch in adapter.export_deleted_skus(
+                    batch_size=2, changed_since=checkpoint
+                )
+                for sku in batch
+                if sku in skus
+            ]
+
+            exports = {}
+            for read_model in (False, True):
+                reader = ProductPostgresAdapter(
+                    database_url=config.get_database_url(),
+                    read_model=read_model,
+                )
+                try:
+                    exports[read_model] = (
+                        [
+                            batch
+                            async for batch in reader.export_products(
+                                batch_size=2, category=category
+                            )
+                        ],
+                        [
+                            batch
+                            async for batch in reader.export_products(
+                                batch_size=2,
+                                category=category,
+                                changed_since=checkpoint,
+                            )
+                        ],
+                    )
+                finally:
+                    await reader.dispose()
+        finally:
+            await adapter.dispose()
+
+        self.assertEqual(deleted_skus, [skus[0]])
+        for read_model, (batches, changed) in exports.items():
+            with self.subTest(read_model=read_model):
+                self.assertEqual([len(batch) for batch in batches], [2, 1])
+                self.assertEqual(
+                    [product.sku for batch in batches for product in batch],
+                    skus[1:],
+                )
+                self.assertEqual(
+                    [product.sku for batch in changed for product in batch],
+                    skus[1:3],
+                )
+                self.assertEqual(changed[0][0].name, "Changed")
+                self.assertEqual(changed[0][1].inventory.reserved, 1)
+
+    async def test_search_products(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), pool_size=1
+        )
+        await adapter.warm_up()
+        word = f"zephyr{random.randint(10000, 99999)}"
+        products = [
+            (f"search-{uuid4()}", f"{word} headphones", "Wireless audio"),
+            (f"search-{uuid4()}", "Studio monitor", f"Pairs with {word}"),
+            (f"search-{uuid4()}", "Unrelated lamp", "Lights a room"),
+        ]
+        for sku, name, description in products:
+            await adapter.create_product(
+                product=Product(
+                    sku=sku,
+                    name=name,
+                    description=description,
+                    image_url="https://example.com/search.jpg",
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+
+        try:
+            first_page = await adapter.search_products(query=word, limit=1)
+            product, rank = first_page[0]
+            second_page = await adapter.search_products(
+                query=word, limit=10, after=(rank, product.sku)
+            )
+        finally:
+            await adapter.dispose()
+
+        self.assertEqual(product.sku, products[0][0])
+        self.assertEqual(
+            [result.sku for result, _ in second_page], [products[1][0]]
+        )
+        self.assertGreater(rank, second_page[0][1])
+
+    async def test_read_model_follows_writes(self):
+        adapter = ProductPostgresAdapter(
+            database_url=config.get_database_url(), read_model=True
+        )
+        category = f"View {uuid4().hex[:12]}"
+        sku = f"view-{uuid4().hex[:12]}"
+        try:
+            created_product = await adapter.create_product(
+                product=Product(
+                    sku=sku,
+                    name="Viewed Product",
+                    description="Viewed description",
+                    image_url="https://example.com/viewed.jpg",
+                    price=Price(value=20.0, discount_percent=0.5),
+                    inventory=Inventory(quantity=2, reserved=0),
+                    category=Category(name=category),
+                ),
+                on_duplicate_sku=DatabaseException("Duplicate SKU"),
+                on_not_found=DatabaseException("Product not found"),
+            )
+            await adapter.patch_product(
+                product=created_product.patch({"name": "Renamed Product"}),
+                changes={"name": "Renamed Product"},
+                on_not_found=KeyError("not found"),
+                on_outdated_version=ValueError("outdated"),
+                expected_version=created_product.version,
+            )
+            await adapter.reserve_inventory(
+                quantities={sku: 2},
+                on_not_found=KeyError("not found"),
+                on_insufficient=ValueError("insufficient"),
+            )
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text('DELETE FROM "ProductView" WHERE sku = :sku'),
+                    {"sku": sku},
+                )
+            await adapter.rebuild_read_model()
+
+            viewed_product = await adapter.get_product_by_sku(
+                sku=sku, on_not_found=KeyError("not found")
+            )
+            in_stock = await adapter.list_products(
+                limit=10, category=category, in_stock=True
+            )
+            counts = await adapter.count_products_by_category(max_price=10)
+            await adapter.delete_product(
+                sku=sku, on_not_found=KeyError("not found")
+            )
+            with self.assertRaises(KeyError):
+                await adapter.get_product_by_sku(
+                    sku=sku, on_not_found=KeyError("not found")
+                )
+        finally:
+            await adapter.dispose()
+
+        self.assertEqual(viewed_product.name, "Renamed Product")
+        self.assertEqual(viewed_product.version, 1)
+        self.assertEqual(viewed_product.price.value, 20.0)
+        self.assertEqual(viewed_product.inventory.reserved, 2)
+        self.assertEqual(viewed_product.category.name, category)
+        self.assertEqual(in_stock, [])
+        self.assertEqual(counts[category], 1)
 
-    def test_delete_product(self):
+    async def test_delete_product(self):
         product_id = uuid4()
         price_id = uuid4()
         inventory_id = uuid4()
@@ -196,19 +1073,19 @@ class TestProductPostgresAdapter(unittest.TestCase):
             category=Category(id=category_id, name="Category to Delete"),
         )
 
-        self.adapter.create_product(
+        await self.adapter.create_product(
             product=product,
             on_duplicate_sku=DatabaseException("Duplicate SKU"),
             on_not_found=DatabaseException("Product not found"),
         )
 
-        delete_result = self.adapter.delete_product(
+        delete_result = await self.adapter.delete_product(
             sku=product_sku,
             on_not_found=DatabaseException("Product not found"),
         )
 
         with self.assertRaises(DatabaseException):
-            self.adapter.get_product_by_sku(
+            await self.adapter.get_product_by_sku(
                 sku=product_sku,
                 on_not_found=DatabaseException("Product not found"),
             )
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import unittest
+from typing import Awaitable, Callable, Iterator, Optional
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, func, literal, select, text
+from src.adapter.exceptions import DatabaseException
+from src.adapter.postgres import ProductPostgresAdapter
+from src.config import get_config
+from src.port.parameter_store import ParameterStore
+
+config = get_config()
+
+SEED_PRODUCTS = 5000
+SEED_CATEGORIES = 50
+
+
+class MockParameterStore(ParameterStore):
+    def get_parameter(self, name: str) -> Optional[str]:
+        return os.getenv(name)
+
+    def get_database_url(self):
+        return self.get_parameter("DATABASE_URL")
+
+
+def plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list = []
+
+    async def begin(self) -> None:
+        pass
+
+    async def execute(self, statement, *args):
+        self.statements.append(statement)
+        result = MagicMock()
+        result.fetchone.return_value = (uuid4(), uuid4(), uuid4(), uuid4())
+        return result
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class TestProductQueryPlans(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        config.set_parameter_store(parameter_store=MockParameterStore())
+        cls.engine = create_engine(config.get_database_url())
+        alembic_cfg = Config("migrations/alembic/alembic.ini")
+        alembic_cfg.set_main_option("script_location", "migrations/alembic")
+        command.upgrade(alembic_cfg, "head")
+        # seed inside a transaction that is rolled back once the class ends
+        cls.connection = cls.engine.connect()
+        cls.transaction = cls.connection.begin()
+        cls.seed()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.transaction.rollback()
+        cls.connection.close()
+        cls.engine.dispose()
+
+    @classmethod
+    def seed(cls):
+        cls.connection.execute(
+            text(
+                'INSERT INTO "Category" (id, name) '
+                "SELECT md5('plan-category-' || g)::uuid, "
+                "'plan-category-' || g "
+                "FROM generate_series(1, :categories) g"
+            ),
+            {"categories": SEED_CATEGORIES},
+        )
+        cls.connection.execute(
+            text(
+                'INSERT INTO "Price" (id, value, discount_percent) '
+                "SELECT md5('plan-price-' || g)::uuid, g, 0.1 "
+                "FROM generate_series(1, :products) g"
+            ),
+            {"products": SEED_PRODUCTS},
+        )
+        cls.connection.execute(
+            text(
+                'INSERT INTO "Inventory" (id, quantity, reserved) '
+                "SELECT md5('plan-inventory-' || g)::uuid, 10, "
+                "CASE WHEN g % 100 = 0 THEN 0 ELSE 10 END "
+                "FROM generate_series(1, :products) g"
+            ),
+            {"products": SEED_PRODUCTS},
+        )
+        cls.connection.execute(
+            text(
+                'INSERT INTO "Product" (id, version, sku, name, description, '
+                "image_url, price_id, inventory_id, category_id) "
+                "SELECT md5('plan-product-' || g)::uuid, 0, 'plan-' || g, "
+                "'Plan product ' || g, 'Seeded to check query plans', "
+                "'https://example.com/plan.jpg', "
+                "md5('plan-price-' || g)::uuid, "
+                "md5('plan-inventory-' || g)::uuid, "
+                "md5('plan-category-' || (g % :categories + 1))::uuid "
+                "FROM generate_series(1, :products) g"
+            ),
+            {"products": SEED_PRODUCTS, "categories": SEED_CATEGORIES},
+        )
+        # VACUUM cannot run in a transaction; flush the GIN pending list
+        # so the planner costs the search index as it would in production
+        cls.connection.execute(
+            text("SELECT gin_clean_pending_list('ix_product_search_vector')")
+        )
+        for table in ("Category", "Price", "Inventory", "Product"):
+            cls.connection.execute(text(f'ANALYZE "{table}"'))
+
+    def record_statements(
+        self, call: Callable[[ProductPostgresAdapter], Awaitable]
+    ) -> list:
+        """Run an adapter method against a session that only records the
+        statements it is given, so their plans can be checked on the seeded
+        tables."""
+        session = RecordingSession()
+        with patch("src.adapter.postgres.async_sessionmaker") as sessionmaker:
+            sessionmaker.return_value.return_value = session
+            adapter = ProductPostgresAdapter(
+                database_url=config.get_database_url(), trigram_search=False
+            )
+        try:
+            asyncio.run(call(adapter))
+        except DatabaseException:
+            # the recorded rows are stand-ins: the adapter fails to map them
+            pass
+        return session.statements
+
+    def explain(self, statement) -> dict:
+        compiled = statement.compile(
+            dialect=self.connection.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = self.connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}".replace("%", "%%")
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan
+
+    def assert_uses_index(self, statement, *indexes: str) -> None:
+        plan = self.explain(statement)
+        nodes = list(plan_nodes(plan[0]["Plan"]))
+        for index in indexes:
+            self.assertIn(
+                index,
+                [node.get("Index Name") for node in nodes],
+                json.dumps(plan, indent=2),
+            )
+        # the seeded Category table is small enough for a seq scan to win
+        self.assertEqual(
+            [
+                node["Relation Name"]
+                for node in nodes
+                if node["Node Type"] == "Seq Scan"
+                and node["Relation Name"] != "Category"
+            ],
+            [],
+            json.dumps(plan, indent=2),
+        )
+
+    def test_get_product_by_sku_uses_sku_index(self):
+        (statement,) = self.record_statements(
+            lambda adapter: adapter.get_product_by_sku(
+                sku="plan-42", on_not_found=KeyError("not found")
+            )
+        )
+
+        self.assert_uses_index(statement, "Product_sku_key")
+
+    def test_list_products_by_price_uses_discounted_price_index(self):
+        (statement,) = self.record_statements(
+            lambda adapter: adapter.list_products(
+                limit=21, min_price=10, max_price=20
+            )
+        )
+
+        self.assert_uses_index(
+            statement, "ix_price_discounted_price", "ix_product_price_id"
+        )
+
+    def test_list_products_in_stock_uses_partial_index(self):
+        (statement,) = self.record_statements(
+            lambda adapter: adapter.list_products(limit=21, in_stock=True)
+        )
+
+        self.assert_uses_index(statement, "ix_inventory_in_stock")
+
+    def test_list_products_by_category_pages_by_sku(self):
+        (statement,) = self.record_statements(
+            lambda adapter: adapter.list_products(
+                limit=21, after_sku="plan-42", category="plan-category-7"
+            )
+        )
+
+        self.assert_uses_index(statement, "Product_sku_key")
+
+    def test_search_uses_search_vector_index(self):
+        (statement,) = self.record_statements(
+            lambda adapter: adapter.search_products(query="4242", limit=21)
+        )
+
+        self.assert_uses_index(statement, "ix_product_search_vector")
+
+    def test_delete_product_uses_key_indexes(self):
+        statements = self.record_statements(
+            lambda adapter: adapter.delete_product(
+                sku="plan-42", on_not_found=KeyError("not found")
+            )
+        )
+
+        select_ids, delete_product, _, delete_inventory, delete_price = (
+            statements
+        )
+        self.assert_uses_index(select_ids, "Product_sku_key")
+        self.assert_uses_index(delete_product, "Product_sku_key")
+        self.assert_uses_index(delete_inventory, "Inventory_pkey")
+        self.assert_uses_index(delete_price, "Price_pkey")
+
+    def test_foreign_key_checks_use_foreign_key_indexes(self):
+        # deleting a Price, Inventory or Category row makes Postgres look up
+        # the products still referencing it; these checks run inside the
+        # foreign key triggers and never show up in an EXPLAIN of the
+        # adapter's statements, so the lookup is written out here
+        product_table = ProductPostgresAdapter(
+            database_url=config.get_database_url()
+        ).metadata.tables["Product"]
+        for column, index, value in (
+            ("price_id", "ix_product_price_id", "plan-price-42"),
+            ("inventory_id", "ix_product_inventory_id", "plan-inventory-42"),
+            ("category_id", "ix_product_category_id", "plan-category-7"),
+        ):
+            with self.subTest(column=column):
+                self.assert_uses_index(
+                    select(literal(1))
+                    .select_from(product_table)
+                    .where(
+                        product_table.c[column]
+                        == func.md5(value).cast(product_table.c.id.type)
+                    )
+                    .with_for_update(key_share=True),
+                    index,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
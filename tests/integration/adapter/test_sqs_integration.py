@@ -44,6 +44,31 @@ class TestSQSAdapter(unittest.TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(messages[0]["Body"], product_event.to_json())
 
+    def test_publish_batch_success(self):
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku=f"sku-{index}")
+            for index in range(12)
+        ]
+
+        self.adapter.publish_batch(product_events)
+        bodies = []
+        for _ in range(3):
+            response = self.sqs_client.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=0,
+            )
+            bodies.extend(
+                message["Body"] for message in response.get("Messages", [])
+            )
+
+        self.assertEqual(
+            sorted(bodies),
+            sorted(
+                product_event.to_json() for product_event in product_events
+            ),
+        )
+
     def test_publish_sqs_error(self):
         product_event = ProductEvent(type="created", product=None)
 
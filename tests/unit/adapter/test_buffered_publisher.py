@@ -0,0 +1,128 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from src.adapter.buffered_publisher import BufferedProductEventPublisher
+from src.domain.enums import ProductEventType
+from src.domain.events import ProductEvent
+from src.port.event_publishers import ProductEventPublisher
+
+
+def create_event(sku: str) -> ProductEvent:
+    return ProductEvent(type=ProductEventType.DELETED, sku=sku)
+
+
+class TestBufferedProductEventPublisher(unittest.TestCase):
+    def setUp(self):
+        self.mock_publisher = Mock(spec=ProductEventPublisher)
+        self.published = []
+        self.mock_publisher.publish_batch.side_effect = (
+            lambda product_events: self.published.append(
+                [event.sku for event in product_events]
+            )
+        )
+
+    def test_should_flush_full_batches(self):
+        # Arrange
+        publisher = BufferedProductEventPublisher(
+            product_event_publisher=self.mock_publisher,
+            batch_size=10,
+            flush_interval_seconds=60,
+        )
+        publisher.start()
+
+        # Act
+        publisher.publish_batch([create_event(f"sku{i}") for i in range(25)])
+        publisher.stop()
+
+        # Assert
+        self.assertEqual([len(batch) for batch in self.published], [10, 10, 5])
+        self.assertEqual(
+            [sku for batch in self.published for sku in batch],
+            [f"sku{i}" for i in range(25)],
+        )
+        self.mock_publisher.publish.assert_not_called()
+
+    def test_should_flush_partial_batch_after_interval(self):
+        # Arrange
+        flushed = threading.Event()
+        self.mock_publisher.publish_batch.side_effect = (
+            lambda product_events: flushed.set()
+        )
+        publisher = BufferedProductEventPublisher(
+            product_event_publisher=self.mock_publisher,
+            batch_size=10,
+            flush_interval_seconds=0.01,
+        )
+        publisher.start()
+
+        # Act
+        publisher.publish(create_event("sku001"))
+
+        # Assert
+        self.assertTrue(flushed.wait(timeout=5))
+        publisher.stop()
+        self.mock_publisher.publish_batch.assert_called_once()
+
+    def test_should_publish_synchronously_when_not_started(self):
+        # Arrange
+        publisher = BufferedProductEventPublisher(
+            product_event_publisher=self.mock_publisher
+        )
+        product_event = create_event("sku001")
+
+        # Act
+        publisher.publish(product_event)
+
+        # Assert
+        self.mock_publisher.publish.assert_called_once_with(
+            product_event=product_event
+        )
+
+    @patch("src.adapter.buffered_publisher.logger")
+    def test_should_retry_and_drop_failed_batches(self, mock_logger):
+        # Arrange
+        self.mock_publisher.publish_batch.side_effect = Exception("sqs down")
+        publisher = BufferedProductEventPublisher(
+            product_event_publisher=self.mock_publisher,
+            max_retries=2,
+            retry_backoff_seconds=0,
+        )
+        publisher.start()
+
+        # Act
+        publisher.publish(create_event("sku001"))
+        publisher.stop()
+
+        # Assert
+        self.assertEqual(self.mock_publisher.publish_batch.call_count, 2)
+        self.assertEqual(publisher.dropped, 1)
+        self.assertIn("Dropping 1", mock_logger.error.call_args[0][0])
+
+    @patch("src.adapter.buffered_publisher.logger")
+    def test_should_drop_events_when_buffer_is_full(self, mock_logger):
+        # Arrange
+        release = threading.Event()
+        self.mock_publisher.publish_batch.side_effect = (
+            lambda product_events: release.wait(timeout=5)
+        )
+        publisher = BufferedProductEventPublisher(
+            product_event_publisher=self.mock_publisher,
+            batch_size=1,
+            max_buffer_size=1,
+        )
+        publisher.start()
+        publisher.publish(create_event("sku000"))
+        while self.mock_publisher.publish_batch.call_count == 0:
+            release.wait(timeout=0.001)
+
+        # Act
+        publisher.publish_batch([create_event(f"sku00{i}") for i in (1, 2)])
+        dropped = publisher.dropped
+        release.set()
+        publisher.stop()
+
+        # Assert
+        self.assertEqual(dropped, 1)
+        self.assertEqual(self.mock_publisher.publish_batch.call_count, 2)
+        self.assertIn("sku002", mock_logger.error.call_args[0][0])
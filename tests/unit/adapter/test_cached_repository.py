@@ -0,0 +1,449 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock
+from uuid import uuid4
+
+from src.adapter.cached_repository import CachedProductRepository
+from src.adapter.memory_cache import InMemoryCacheAdapter
+from src.domain.entities import Product
+from src.port import ProductRepository
+from src.utils.lru_cache import LRUCache
+
+
+def create_product(sku: str) -> Product:
+    return Product(sku=sku, name="Test Product", description="Description")
+
+
+class FailingCache(InMemoryCacheAdapter):
+    async def get(self, key):
+        raise ConnectionError("cache is down")
+
+    async def get_many(self, keys):
+        raise ConnectionError("cache is down")
+
+
+class TestCachedProductRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_product_repository = Mock(spec=ProductRepository)
+        self.cache = LRUCache(max_size=10, ttl_seconds=60)
+        self.repository = CachedProductRepository(
+            product_repository=self.mock_product_repository, cache=self.cache
+        )
+
+    async def test_get_product_by_sku_reads_through_cache(self):
+        # Arrange
+        product = create_product("sku001")
+        self.mock_product_repository.get_product_by_sku.return_value = product
+        on_not_found = Exception("Product not found")
+
+        # Act
+        first = await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=on_not_found
+        )
+        second = await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=on_not_found
+        )
+
+        # Assert
+        self.assertIs(first, product)
+        self.assertIs(second, product)
+        self.mock_product_repository.get_product_by_sku.assert_awaited_once()
+        self.assertEqual(self.repository.stats["hits"], 1)
+        self.assertEqual(self.repository.stats["misses"], 1)
+
+    async def test_get_product_by_sku_does_not_cache_not_found(self):
+        # Arrange
+        self.mock_product_repository.get_product_by_sku.side_effect = KeyError(
+            "sku001"
+        )
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            await self.repository.get_product_by_sku(
+                sku="sku001", on_not_found=KeyError("sku001")
+            )
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_writes_invalidate_cached_product(self):
+        # Arrange
+        product = create_product("sku001")
+        self.cache.set("sku001", product)
+
+        # Act
+        await self.repository.update_product(
+            product=product,
+            on_not_found=Exception(),
+            on_outdated_version=Exception(),
+            on_duplicate=Exception(),
+        )
+
+        # Assert
+        self.assertIsNone(self.cache.get("sku001"))
+        self.cache.set("sku001", product)
+        await self.repository.delete_product(
+            sku="sku001", on_not_found=Exception()
+        )
+        self.assertIsNone(self.cache.get("sku001"))
+        self.cache.set("sku001", product)
+        await self.repository.patch_product(
+            product=product,
+            changes={"name": product.name},
+            on_not_found=Exception(),
+            on_outdated_version=Exception(),
+            expected_version=1,
+        )
+        self.assertIsNone(self.cache.get("sku001"))
+        self.cache.set("sku001", product)
+        await self.repository.reserve_inventory(
+            quantities={"sku001": 1},
+            on_not_found=Exception(),
+            on_insufficient=Exception(),
+        )
+        self.assertIsNone(self.cache.get("sku001"))
+        self.cache.set("sku001", product)
+        await self.repository.update_prices(
+            skus=["sku001"],
+            values=[1.0],
+            discount_percents=[0.0],
+            expected_values=[2.0],
+            expected_discount_percents=[0.0],
+        )
+        self.assertIsNone(self.cache.get("sku001"))
+
+    async def test_failed_write_still_invalidates(self):
+        # Arrange
+        product = create_product("sku001")
+        self.cache.set("sku001", product)
+        self.mock_product_repository.update_product.side_effect = Exception()
+
+        # Act
+        with self.assertRaises(Exception):
+            await self.repository.update_product(
+                product=product,
+                on_not_found=Exception(),
+                on_outdated_version=Exception(),
+                on_duplicate=Exception(),
+            )
+
+        # Assert
+        self.assertIsNone(self.cache.get("sku001"))
+
+    async def test_read_racing_a_write_is_not_cached(self):
+        # Arrange
+        stale_product = create_product("sku001")
+        loaded = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_get_product_by_sku(sku, on_not_found):
+            loaded.set()
+            await release.wait()
+            return stale_product
+
+        self.mock_product_repository.get_product_by_sku.side_effect = (
+            slow_get_product_by_sku
+        )
+
+        # Act
+        read = asyncio.create_task(
+            self.repository.get_product_by_sku(
+                sku="sku001", on_not_found=Exception()
+            )
+        )
+        await loaded.wait()
+        await self.repository.delete_product(
+            sku="sku001", on_not_found=Exception()
+        )
+        release.set()
+        await read
+
+        # Assert
+        self.assertIsNone(self.cache.get("sku001"))
+
+    async def test_get_product_revision_uses_cached_product(self):
+        # Arrange
+        self.cache.set(
+            "sku001",
+            Product.from_dict(
+                {
+                    **create_product("sku001").to_dict(),
+                    "version": 4,
+                    "inventory": {
+                        "id": str(uuid4()),
+                        "quantity": 5,
+                        "reserved": 2,
+                    },
+                }
+            ),
+        )
+        self.mock_product_repository.get_product_revision.return_value = (
+            5,
+            None,
+        )
+
+        # Act
+        cached_revision = await self.repository.get_product_revision(
+            sku="sku001", on_not_found=Exception()
+        )
+        revision = await self.repository.get_product_revision(
+            sku="sku002", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertEqual(cached_revision, (4, 2))
+        self.assertEqual(revision, (5, None))
+        get_revision = self.mock_product_repository.get_product_revision
+        get_revision.assert_awaited_once()
+
+    async def test_get_products_by_skus_only_fetches_uncached(self):
+        # Arrange
+        cached_product = create_product("sku001")
+        fetched_product = create_product("sku002")
+        self.cache.set("sku001", cached_product)
+        self.mock_product_repository.get_products_by_skus.return_value = [
+            fetched_product
+        ]
+
+        # Act
+        products = await self.repository.get_products_by_skus(
+            skus=["sku002", "sku003", "sku001"]
+        )
+
+        # Assert
+        self.assertEqual(products, [fetched_product, cached_product])
+        get_many = self.mock_product_repository.get_products_by_skus
+        get_many.assert_awaited_once_with(skus=["sku002", "sku003"])
+        self.assertIs(self.cache.get("sku002"), fetched_product)
+
+
+class TestCachedProductRepositoryWithSharedCache(
+    unittest.IsolatedAsyncioTestCase
+):
+    def setUp(self):
+        self.mock_product_repository = Mock(spec=ProductRepository)
+        self.shared_cache = InMemoryCacheAdapter()
+        self.repository = CachedProductRepository(
+            product_repository=self.mock_product_repository,
+            shared_cache=self.shared_cache,
+            lock_ttl_seconds=1,
+            lock_poll_interval_seconds=0.01,
+        )
+
+    async def test_get_product_by_sku_populates_shared_cache(self):
+        # Arrange
+        product = create_product("sku001")
+        self.mock_product_repository.get_product_by_sku.return_value = product
+
+        # Act
+        await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+        other_process = CachedProductRepository(
+            product_repository=self.mock_product_repository,
+            shared_cache=self.shared_cache,
+        )
+        cached = await other_process.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertEqual(cached.to_dict(), product.to_dict())
+        self.mock_product_repository.get_product_by_sku.assert_awaited_once()
+        self.assertIsNone(await self.shared_cache.get("lock:product:sku001"))
+
+    async def test_concurrent_misses_load_once(self):
+        # Arrange
+        product = create_product("sku001")
+        release = asyncio.Event()
+
+        async def slow_get_product_by_sku(sku, on_not_found):
+            await release.wait()
+            return product
+
+        self.mock_product_repository.get_product_by_sku.side_effect = (
+            slow_get_product_by_sku
+        )
+
+        # Act
+        reads = asyncio.gather(
+            *(
+                self.repository.get_product_by_sku(
+                    sku="sku001", on_not_found=Exception()
+                )
+                for _ in range(10)
+            )
+        )
+        await asyncio.sleep(0)
+        release.set()
+        products = await reads
+
+        # Assert
+        self.assertTrue(all(item is product for item in products))
+        self.mock_product_repository.get_product_by_sku.assert_awaited_once()
+
+    async def test_waits_for_lock_holder_in_another_process(self):
+        # Arrange
+        product = create_product("sku001")
+        await self.shared_cache.add("lock:product:sku001", b"1", 1)
+
+        async def fill_cache():
+            await asyncio.sleep(0.03)
+            await self.shared_cache.set(
+                "product:sku001",
+                json.dumps(product.to_dict()).encode(),
+                ttl_seconds=60,
+            )
+
+        # Act
+        filler = asyncio.create_task(fill_cache())
+        cached = await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+        await filler
+
+        # Assert
+        self.assertEqual(cached.to_dict(), product.to_dict())
+        self.mock_product_repository.get_product_by_sku.assert_not_called()
+
+    async def test_writes_invalidate_shared_cache(self):
+        # Arrange
+        await self.shared_cache.set("product:sku001", b"{}", ttl_seconds=60)
+
+        # Act
+        await self.repository.delete_product(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertEqual(await self.shared_cache.get("product:sku001"), b"")
+
+    async def test_stale_load_does_not_refill_after_remote_invalidation(self):
+        # Arrange
+        stale_product = create_product("sku001")
+        other_process = CachedProductRepository(
+            product_repository=Mock(spec=ProductRepository),
+            shared_cache=self.shared_cache,
+        )
+
+        async def get_product_by_sku_racing_a_write(sku, on_not_found):
+            await other_process.delete_product(
+                sku=sku, on_not_found=on_not_found
+            )
+            return stale_product
+
+        self.mock_product_repository.get_product_by_sku.side_effect = (
+            get_product_by_sku_racing_a_write
+        )
+
+        # Act
+        await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertEqual(await self.shared_cache.get("product:sku001"), b"")
+
+    async def test_tombstone_reads_through_to_repository(self):
+        # Arrange
+        product = create_product("sku001")
+        self.mock_product_repository.get_product_by_sku.return_value = product
+        await self.shared_cache.set("product:sku001", b"", ttl_seconds=60)
+
+        # Act
+        result = await self.repository.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertIs(result, product)
+        self.assertIsNone(await self.shared_cache.get("lock:product:sku001"))
+
+    async def test_get_products_by_skus_uses_shared_cache(self):
+        # Arrange
+        cached_product = create_product("sku001")
+        fetched_product = create_product("sku002")
+        self.mock_product_repository.get_products_by_skus.return_value = [
+            cached_product
+        ]
+        await self.repository.get_products_by_skus(skus=["sku001"])
+        self.mock_product_repository.get_products_by_skus.return_value = [
+            fetched_product
+        ]
+
+        # Act
+        products = await self.repository.get_products_by_skus(
+            skus=["sku001", "sku002"]
+        )
+
+        # Assert
+        self.assertEqual(
+            [product.sku for product in products], ["sku001", "sku002"]
+        )
+        self.mock_product_repository.get_products_by_skus.assert_awaited_with(
+            skus=["sku002"]
+        )
+
+    async def test_local_copies_expire_after_a_remote_write(self):
+        # Arrange
+        now = [0.0]
+        product = create_product("sku001")
+        renamed_product = product.patch({"name": "Renamed Product"})
+        self.mock_product_repository.get_product_by_sku.return_value = product
+        self.mock_product_repository.update_product.return_value = (
+            renamed_product
+        )
+        local_process, other_process = (
+            CachedProductRepository(
+                product_repository=self.mock_product_repository,
+                cache=LRUCache(
+                    max_size=10, ttl_seconds=1, clock=lambda: now[0]
+                ),
+                shared_cache=self.shared_cache,
+            )
+            for _ in range(2)
+        )
+        await local_process.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Act
+        await other_process.update_product(
+            product=renamed_product,
+            on_not_found=Exception(),
+            on_outdated_version=Exception(),
+            on_duplicate=Exception(),
+        )
+        self.mock_product_repository.get_product_by_sku.return_value = (
+            renamed_product
+        )
+        stale = await local_process.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+        now[0] += 1
+        fresh = await local_process.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertEqual(stale.name, "Test Product")
+        self.assertEqual(fresh.name, "Renamed Product")
+        self.assertEqual(
+            self.mock_product_repository.get_product_by_sku.await_count, 2
+        )
+
+    async def test_shared_cache_errors_fall_back_to_repository(self):
+        # Arrange
+        product = create_product("sku001")
+        self.mock_product_repository.get_product_by_sku.return_value = product
+        repository = CachedProductRepository(
+            product_repository=self.mock_product_repository,
+            shared_cache=FailingCache(),
+        )
+
+        # Act
+        result = await repository.get_product_by_sku(
+            sku="sku001", on_not_found=Exception()
+        )
+
+        # Assert
+        self.assertIs(result, product)
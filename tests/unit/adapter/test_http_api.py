@@ -1,33 +1,54 @@
+import json
 import unittest
 from unittest.mock import MagicMock
 from uuid import uuid4
 
+from fastapi import HTTPException
 from src.adapter.dto import (
     CategoryDTO,
+    InventoryBatchReservationDTO,
     InventoryDTO,
+    InventoryReservationDTO,
     PriceDTO,
+    ProductBatchGetRequestDTO,
+    ProductBatchGetResponseDTO,
+    ProductPatchRequestDTO,
     ProductRequestDTO,
     ProductResponseDTO,
 )
 from src.adapter.http_api import HTTPApiAdapter
 from src.domain.entities import Category, Product
-from src.domain.exceptions import InvalidSku, OutdatedProduct, ProductNotFound
+from src.domain.exceptions import (
+    InsufficientInventory,
+    InvalidCursor,
+    InvalidInventory,
+    InvalidPrice,
+    InvalidSearchQuery,
+    InvalidSku,
+    OutdatedProduct,
+    ProductNotFound,
+)
 from src.domain.services import CatalogueService
 from src.domain.value_objects import Inventory, Price
 
 
-class TestHTTPApiAdapter(unittest.TestCase):
+class TestHTTPApiAdapter(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         self.mock_catalogue_service = MagicMock(spec=CatalogueService)
         self.adapter = HTTPApiAdapter(
             catalogue_service=self.mock_catalogue_service
         )
+        self.product_dto = ProductRequestDTO(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+        )
 
     def tearDown(self):
         self.mock_catalogue_service.reset_mock()
 
-    def test_create_product_success(self):
+    async def test_create_product_success(self):
         id_ = uuid4()
         mock_product_dto = ProductRequestDTO(
             sku="0123456789",
@@ -53,9 +74,10 @@ class TestHTTPApiAdapter(unittest.TestCase):
             mock_created_product
         )
 
-        result = self.adapter.create_product(mock_product_dto)
+        response = await self.adapter.create_product(mock_product_dto)
 
-        self.assertIsInstance(result, ProductResponseDTO)
+        result = ProductResponseDTO.model_validate_json(response.body)
+        self.assertEqual(result.id, id_)
         self.assertEqual(result.sku, mock_created_product.sku)
         self.assertEqual(result.name, mock_created_product.name)
         self.assertEqual(result.description, mock_created_product.description)
@@ -87,7 +109,7 @@ class TestHTTPApiAdapter(unittest.TestCase):
         self.assertIsInstance(call_args[1]["inventory"], Inventory)
         self.assertIsInstance(call_args[1]["category"], Category)
 
-    def test_get_product_by_sku_success(self):
+    async def test_get_product_by_sku_success(self):
         id_ = uuid4()
         mock_product = Product(
             id=id_,
@@ -100,9 +122,9 @@ class TestHTTPApiAdapter(unittest.TestCase):
             mock_product
         )
 
-        result = self.adapter.get_product_by_sku("0123456789")
+        response = await self.adapter.get_product_by_sku("0123456789")
 
-        self.assertIsInstance(result, ProductResponseDTO)
+        result = ProductResponseDTO.model_validate_json(response.body)
         self.assertEqual(result.sku, mock_product.sku)
         self.assertEqual(result.name, mock_product.name)
         self.assertEqual(result.description, mock_product.description)
@@ -112,31 +134,246 @@ class TestHTTPApiAdapter(unittest.TestCase):
             sku="0123456789"
         )
 
-    def test_get_product_by_sku_invalid_sku(self):
+    async def test_get_product_by_sku_sets_etag(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+            version=3,
+        )
+        self.mock_catalogue_service.get_product_by_sku.return_value = (
+            mock_product
+        )
+        response = await self.adapter.get_product_by_sku("0123456789")
+
+        self.assertTrue(response.headers["ETag"].startswith('"'))
+        self.mock_catalogue_service.get_product_revision.assert_not_called()
+
+    async def test_get_product_by_sku_not_modified(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+            version=3,
+        )
+        self.mock_catalogue_service.get_product_by_sku.return_value = (
+            mock_product
+        )
+        response = await self.adapter.get_product_by_sku("0123456789")
+        etag = response.headers["ETag"]
+        self.mock_catalogue_service.get_product_by_sku.reset_mock()
+        self.mock_catalogue_service.get_product_revision.return_value = (
+            3,
+            None,
+        )
+
+        result = await self.adapter.get_product_by_sku(
+            "0123456789", if_none_match=f'W/"other", {etag}'
+        )
+
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(result.headers["ETag"], etag)
+        self.mock_catalogue_service.get_product_by_sku.assert_not_called()
+
+    async def test_get_product_by_sku_modified_since_etag(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+            version=4,
+        )
+        self.mock_catalogue_service.get_product_revision.return_value = (
+            4,
+            None,
+        )
+        self.mock_catalogue_service.get_product_by_sku.return_value = (
+            mock_product
+        )
+
+        result = await self.adapter.get_product_by_sku(
+            "0123456789", if_none_match='"stale"'
+        )
+
+        self.assertEqual(json.loads(result.body)["sku"], mock_product.sku)
+
+    async def test_get_product_by_sku_modified_by_reservation(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+            inventory=Inventory(quantity=5, reserved=1),
+            version=3,
+        )
+        self.mock_catalogue_service.get_product_by_sku.return_value = (
+            mock_product
+        )
+        response = await self.adapter.get_product_by_sku("0123456789")
+        etag = response.headers["ETag"]
+        self.mock_catalogue_service.get_product_revision.return_value = (
+            3,
+            2,
+        )
+
+        result = await self.adapter.get_product_by_sku(
+            "0123456789", if_none_match=etag
+        )
+
+        self.assertEqual(result.status_code, 200)
+
+    async def test_get_product_by_sku_invalid_sku(self):
         self.mock_catalogue_service.get_product_by_sku.side_effect = (
             InvalidSku("Invalid SKU")
         )
 
         with self.assertRaises(Exception):
-            self.adapter.get_product_by_sku("0123456789")
+            await self.adapter.get_product_by_sku("0123456789")
 
         self.mock_catalogue_service.get_product_by_sku.assert_called_once_with(
             sku="0123456789"
         )
 
-    def test_get_product_by_sku_product_not_found(self):
+    async def test_get_product_by_sku_product_not_found(self):
         self.mock_catalogue_service.get_product_by_sku.side_effect = (
             ProductNotFound("Product not found")
         )
 
         with self.assertRaises(Exception):
-            self.adapter.get_product_by_sku("0123456789")
+            await self.adapter.get_product_by_sku("0123456789")
 
         self.mock_catalogue_service.get_product_by_sku.assert_called_once_with(
             sku="0123456789"
         )
 
-    def test_update_product_success(self):
+    async def test_list_products_success(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+        )
+        self.mock_catalogue_service.list_products.return_value = (
+            [mock_product],
+            "next",
+        )
+
+        result = await self.adapter.list_products(
+            limit=1,
+            cursor=None,
+            category="books",
+            min_price=None,
+            max_price=None,
+            in_stock=None,
+        )
+
+        body = json.loads(result.body)
+        self.assertEqual(body["products"][0]["sku"], mock_product.sku)
+        self.assertEqual(body["next_cursor"], "next")
+        self.mock_catalogue_service.list_products.assert_called_once_with(
+            limit=1,
+            cursor=None,
+            category="books",
+            min_price=None,
+            max_price=None,
+            in_stock=None,
+        )
+
+    async def test_list_products_invalid_cursor(self):
+        self.mock_catalogue_service.list_products.side_effect = InvalidCursor(
+            "Cursor is invalid"
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.list_products(
+                limit=1,
+                cursor="garbage",
+                category=None,
+                min_price=None,
+                max_price=None,
+                in_stock=None,
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_get_product_facets_invalid_price_range(self):
+        self.mock_catalogue_service.count_products_by_category.side_effect = (
+            InvalidPrice("Minimum price can not be higher than maximum price.")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.get_product_facets(
+                min_price=10, max_price=5, in_stock=None
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_search_products_success(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+        )
+        self.mock_catalogue_service.search_products.return_value = (
+            [mock_product],
+            None,
+        )
+
+        result = await self.adapter.search_products(
+            q="test", limit=10, cursor=None
+        )
+
+        body = json.loads(result.body)
+        self.assertEqual(body["products"][0]["sku"], mock_product.sku)
+        self.assertIsNone(body["next_cursor"])
+        self.mock_catalogue_service.search_products.assert_called_once_with(
+            query="test", limit=10, cursor=None
+        )
+
+    async def test_search_products_invalid_query(self):
+        self.mock_catalogue_service.search_products.side_effect = (
+            InvalidSearchQuery("Search query is mandatory.")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.search_products(q=" ", limit=10, cursor=None)
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_get_products_by_skus_success(self):
+        mock_product = Product(
+            sku="0123456789",
+            name="Test Product",
+            description="Test description",
+            category=Category(name="Test Category"),
+        )
+        self.mock_catalogue_service.get_products_by_skus.return_value = (
+            [mock_product],
+            ["9876543210"],
+        )
+
+        response = await self.adapter.get_products_by_skus(
+            ProductBatchGetRequestDTO(skus=["0123456789", "9876543210"])
+        )
+
+        result = ProductBatchGetResponseDTO.model_validate_json(response.body)
+        self.assertEqual(len(result.products), 1)
+        self.assertEqual(result.products[0].sku, mock_product.sku)
+        self.assertEqual(result.products[0].category.name, "Test Category")
+        self.assertEqual(result.missing, ["9876543210"])
+        get_many = self.mock_catalogue_service.get_products_by_skus
+        get_many.assert_called_once_with(skus=["0123456789", "9876543210"])
+
+    async def test_get_products_by_skus_invalid_sku(self):
+        self.mock_catalogue_service.get_products_by_skus.side_effect = (
+            InvalidSku("Invalid SKU")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.get_products_by_skus(
+                ProductBatchGetRequestDTO(skus=["0"])
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_update_product_success(self):
         id_ = uuid4()
         mock_product_dto = ProductRequestDTO(
             sku="0123456789",
@@ -159,9 +396,11 @@ class TestHTTPApiAdapter(unittest.TestCase):
             mock_updated_product
         )
 
-        result = self.adapter.update_product("0123456789", mock_product_dto)
+        response = await self.adapter.update_product(
+            "0123456789", mock_product_dto
+        )
 
-        self.assertIsInstance(result, ProductResponseDTO)
+        result = ProductResponseDTO.model_validate_json(response.body)
         self.assertEqual(result.sku, mock_updated_product.sku)
         self.assertEqual(result.name, mock_updated_product.name)
         self.assertEqual(result.description, mock_updated_product.description)
@@ -175,32 +414,215 @@ class TestHTTPApiAdapter(unittest.TestCase):
             price=None,
             inventory=None,
             category=None,
+            expected_version=None,
+        )
+
+    async def test_update_product_with_if_match(self):
+        self.mock_catalogue_service.get_product_by_sku.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            image_url="http://example.com/image.jpg",
+            version=3,
+        )
+        get_response = await self.adapter.get_product_by_sku("0123456789")
+        etag = get_response.headers["ETag"]
+        self.mock_catalogue_service.update_product.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            image_url="http://example.com/image.jpg",
+            version=4,
+        )
+        response = await self.adapter.update_product(
+            "0123456789", self.product_dto, if_match=etag
+        )
+
+        kwargs = self.mock_catalogue_service.update_product.call_args.kwargs
+        self.assertEqual(kwargs["expected_version"], 3)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    async def test_update_product_with_if_match_before_reservation(self):
+        self.mock_catalogue_service.get_product_by_sku.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            inventory=Inventory(quantity=5, reserved=1),
+            version=3,
+        )
+        get_response = await self.adapter.get_product_by_sku("0123456789")
+        self.mock_catalogue_service.update_product.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            version=4,
+        )
+
+        await self.adapter.update_product(
+            "0123456789",
+            self.product_dto,
+            if_match=get_response.headers["ETag"],
+        )
+
+        kwargs = self.mock_catalogue_service.update_product.call_args.kwargs
+        self.assertEqual(kwargs["expected_version"], 3)
+
+    async def test_update_product_with_foreign_if_match(self):
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.update_product(
+                "0123456789",
+                self.product_dto,
+                if_match='"3-0000000000000000"',
+            )
+
+        self.assertEqual(context.exception.status_code, 412)
+        self.mock_catalogue_service.update_product.assert_not_called()
+
+    async def test_update_product_with_if_match_wildcard(self):
+        self.mock_catalogue_service.update_product.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            image_url="http://example.com/image.jpg",
+        )
+
+        await self.adapter.update_product(
+            "0123456789", self.product_dto, if_match="*"
+        )
+
+        kwargs = self.mock_catalogue_service.update_product.call_args.kwargs
+        self.assertIsNone(kwargs["expected_version"])
+
+    async def test_patch_product_forwards_only_sent_fields(self):
+        self.mock_catalogue_service.patch_product.return_value = Product(
+            sku="0123456789",
+            name="Product",
+            description="Description",
+            price=Price(value=5.0),
+            version=2,
+        )
+        response = await self.adapter.patch_product(
+            "0123456789", ProductPatchRequestDTO(price={"value": 5.0})
         )
 
-    def test_update_product_invalid_sku(self):
+        self.assertEqual(json.loads(response.body)["price"]["value"], 5.0)
+        self.assertIn("ETag", response.headers)
+        self.mock_catalogue_service.patch_product.assert_called_once_with(
+            sku="0123456789",
+            changes={"price": {"value": 5.0}},
+            expected_version=None,
+        )
+
+    async def test_patch_product_without_changes(self):
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.patch_product(
+                "0123456789", ProductPatchRequestDTO()
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.mock_catalogue_service.patch_product.assert_not_called()
+
+    async def test_patch_product_invalid_inventory(self):
+        self.mock_catalogue_service.patch_product.side_effect = (
+            InvalidInventory("Reserved can not be higher than quantity.")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.patch_product(
+                "0123456789",
+                ProductPatchRequestDTO(inventory={"reserved": 100}),
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_patch_product_invalid_sku(self):
+        self.mock_catalogue_service.patch_product.side_effect = InvalidSku(
+            "Invalid SKU"
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.patch_product(
+                "0123456789", ProductPatchRequestDTO(name="Renamed")
+            )
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    async def test_reserve_inventory(self):
+        self.mock_catalogue_service.reserve_inventory.return_value = {
+            "0123456789": Inventory(quantity=10, reserved=4)
+        }
+
+        result = await self.adapter.reserve_inventory(
+            "0123456789", InventoryReservationDTO(quantity=4)
+        )
+
+        self.assertEqual(result.sku, "0123456789")
+        self.assertEqual(result.reserved, 4)
+        self.mock_catalogue_service.reserve_inventory.assert_called_once_with(
+            lines=[("0123456789", 4)]
+        )
+
+    async def test_reserve_inventory_insufficient(self):
+        self.mock_catalogue_service.reserve_inventory.side_effect = (
+            InsufficientInventory("Insufficient inventory")
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.reserve_inventory(
+                "0123456789", InventoryReservationDTO(quantity=4)
+            )
+
+        self.assertEqual(context.exception.status_code, 409)
+
+    async def test_release_inventories(self):
+        self.mock_catalogue_service.release_inventory.return_value = {
+            "0123456789": Inventory(quantity=10, reserved=0),
+            "9876543210": Inventory(quantity=3, reserved=1),
+        }
+
+        result = await self.adapter.release_inventories(
+            InventoryBatchReservationDTO(
+                lines=[
+                    {"sku": "0123456789", "quantity": 2},
+                    {"sku": "9876543210", "quantity": 1},
+                ]
+            )
+        )
+
+        self.assertEqual(
+            [line.sku for line in result.inventories],
+            ["0123456789", "9876543210"],
+        )
+        self.mock_catalogue_service.release_inventory.assert_called_once_with(
+            lines=[("0123456789", 2), ("9876543210", 1)]
+        )
+
+    async def test_update_product_invalid_sku(self):
         self.mock_catalogue_service.update_product.side_effect = InvalidSku(
             "Invalid SKU"
         )
 
         with self.assertRaises(Exception):
-            self.adapter.update_product("0123456789", ProductRequestDTO())
+            await self.adapter.update_product("0123456789", self.product_dto)
 
-    def test_update_product_product_not_found(self):
+    async def test_update_product_product_not_found(self):
         self.mock_catalogue_service.update_product.side_effect = (
             ProductNotFound("Product not found")
         )
 
         with self.assertRaises(Exception):
-            self.adapter.update_product("0123456789", ProductRequestDTO())
+            await self.adapter.update_product("0123456789", self.product_dto)
 
-    def test_update_product_outdated_product(self):
+    async def test_update_product_outdated_product(self):
 
         self.mock_catalogue_service.update_product.side_effect = (
             OutdatedProduct("Outdated product")
         )
 
-        with self.assertRaises(Exception):
-            self.adapter.update_product("0123456789", ProductRequestDTO())
+        with self.assertRaises(HTTPException) as context:
+            await self.adapter.update_product("0123456789", self.product_dto)
+
+        self.assertEqual(context.exception.status_code, 409)
 
 
 if __name__ == "__main__":
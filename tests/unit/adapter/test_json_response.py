@@ -0,0 +1,89 @@
+import json
+import unittest
+
+from fastapi.encoders import jsonable_encoder
+from src.adapter.dto import (
+    CategoryDTO,
+    InventoryDTO,
+    PriceDTO,
+    ProductResponseDTO,
+)
+from src.adapter.json_response import ProductJSONResponse, encode_product
+from src.domain.entities import Category, Product
+from src.domain.value_objects import Inventory, Price
+
+
+def to_dto(product: Product) -> ProductResponseDTO:
+    return ProductResponseDTO(
+        id=product.id,
+        sku=product.sku,
+        name=product.name,
+        description=product.description,
+        image_url=product.image_url,
+        price=(
+            PriceDTO(
+                value=product.price.value,
+                discount_percent=product.price.discount_percent,
+            )
+            if product.price
+            else None
+        ),
+        inventory=(
+            InventoryDTO(
+                quantity=product.inventory.quantity,
+                reserved=product.inventory.reserved,
+            )
+            if product.inventory
+            else None
+        ),
+        category=(
+            CategoryDTO(name=product.category.name)
+            if product.category
+            else None
+        ),
+    )
+
+
+class TestProductJSONResponse(unittest.TestCase):
+    def setUp(self):
+        self.product = Product(
+            sku="0123456789",
+            name="Produto",
+            description="Descrição",
+            image_url="http://example.com/image.jpg",
+            price=Price(value=10, discount_percent=0.1),
+            inventory=Inventory(quantity=100, reserved=10),
+            category=Category(name="Books"),
+        )
+        self.bare_product = Product(
+            sku="9876543210", name="Bare", description="No extras"
+        )
+
+    def test_renders_products_like_the_response_dto(self):
+        for product in (self.product, self.bare_product):
+            with self.subTest(sku=product.sku):
+                response = ProductJSONResponse(product)
+
+                self.assertEqual(
+                    json.loads(response.body),
+                    jsonable_encoder(to_dto(product)),
+                )
+
+    def test_renders_products_nested_in_containers(self):
+        response = ProductJSONResponse(
+            {"products": [self.product], "next_cursor": None}
+        )
+
+        body = json.loads(response.body)
+        self.assertEqual(body["products"][0]["sku"], "0123456789")
+        self.assertEqual(body["products"][0]["price"]["value"], 10.0)
+        self.assertIsNone(body["next_cursor"])
+        self.assertEqual(response.media_type, "application/json")
+
+    def test_rejects_unknown_types(self):
+        with self.assertRaises(TypeError):
+            encode_product(object())
+
+
+if __name__ == "__main__":
+    unittest.main()
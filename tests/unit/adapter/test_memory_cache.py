@@ -0,0 +1,49 @@
+import unittest
+
+from src.adapter.memory_cache import InMemoryCacheAdapter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestInMemoryCacheAdapter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = InMemoryCacheAdapter(clock=self.clock)
+
+    async def test_set_and_get(self):
+        await self.cache.set("key", b"value", ttl_seconds=10)
+
+        self.assertEqual(await self.cache.get("key"), b"value")
+        self.assertEqual(
+            await self.cache.get_many(["key", "missing"]), [b"value", None]
+        )
+
+    async def test_entries_expire(self):
+        await self.cache.set("key", b"value", ttl_seconds=10)
+
+        self.clock.now = 10
+
+        self.assertIsNone(await self.cache.get("key"))
+
+    async def test_add_only_sets_absent_keys(self):
+        self.assertTrue(await self.cache.add("lock", b"1", ttl_seconds=5))
+        self.assertFalse(await self.cache.add("lock", b"2", ttl_seconds=5))
+
+        self.clock.now = 5
+
+        self.assertTrue(await self.cache.add("lock", b"3", ttl_seconds=5))
+        self.assertEqual(await self.cache.get("lock"), b"3")
+
+    async def test_delete(self):
+        await self.cache.set("a", b"1", ttl_seconds=10)
+        await self.cache.set("b", b"2", ttl_seconds=10)
+
+        await self.cache.delete("a", "b", "missing")
+
+        self.assertEqual(await self.cache.get_many(["a", "b"]), [None, None])
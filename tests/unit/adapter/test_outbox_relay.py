@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from src.adapter.outbox_relay import OutboxRelay
+from src.adapter.postgres import ProductPostgresAdapter
+from src.domain.enums import ProductEventType
+from src.domain.events import ProductEvent
+from src.port.event_publishers import (
+    ProductEventPublisher,
+    SerializedProductEvent,
+)
+
+
+class TestOutboxRelay(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_adapter = Mock(spec=ProductPostgresAdapter)
+        self.mock_publisher = Mock(spec=ProductEventPublisher)
+        self.relay = OutboxRelay(
+            product_postgres_adapter=self.mock_adapter,
+            product_event_publisher=self.mock_publisher,
+            batch_size=2,
+            poll_interval_seconds=0.01,
+        )
+
+    async def test_relay_once_publishes_drained_events(self):
+        # Arrange
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="001")
+        product_events = [
+            SerializedProductEvent(
+                id=product_event.id, sku="001", body=product_event.to_json()
+            )
+        ]
+        self.mock_publisher.publish_serialized_batch.return_value = {}
+        rejected = []
+
+        async def drain_outbox(publish, limit):
+            rejected.append(await publish(product_events))
+            return len(product_events)
+
+        self.mock_adapter.drain_outbox = AsyncMock(side_effect=drain_outbox)
+
+        # Act
+        relayed = await self.relay.relay_once()
+
+        # Assert
+        self.assertEqual(relayed, 1)
+        self.assertEqual(rejected, [{}])
+        self.mock_publisher.publish_serialized_batch.assert_called_once_with(
+            product_events=product_events
+        )
+        self.assertEqual(
+            self.mock_adapter.drain_outbox.await_args[1]["limit"], 2
+        )
+
+    async def test_run_keeps_going_after_errors_until_stopped(self):
+        # Arrange
+        stop = asyncio.Event()
+        results = [Exception("database down"), 2, 0]
+
+        async def drain_outbox(publish, limit):
+            result = results.pop(0) if results else 0
+            if not results:
+                stop.set()
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.mock_adapter.drain_outbox = AsyncMock(side_effect=drain_outbox)
+
+        # Act
+        await asyncio.wait_for(self.relay.run(stop=stop), timeout=5)
+
+        # Assert
+        self.assertEqual(self.mock_adapter.drain_outbox.await_count, 3)
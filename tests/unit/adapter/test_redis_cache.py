@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from redis.exceptions import ConnectionError
+from src.adapter.exceptions import CacheException
+from src.adapter.redis_cache import RedisCacheAdapter
+
+
+class TestRedisCacheAdapter(unittest.IsolatedAsyncioTestCase):
+    @patch("src.adapter.redis_cache.redis.from_url")
+    def setUp(self, mock_from_url):
+        self.mock_client = AsyncMock()
+        mock_from_url.return_value = self.mock_client
+        self.adapter = RedisCacheAdapter(url="redis://localhost:6379/0")
+
+    async def test_should_get_value(self):
+        # Arrange
+        self.mock_client.get.return_value = b"value"
+
+        # Act
+        value = await self.adapter.get("key")
+
+        # Assert
+        self.assertEqual(value, b"value")
+        self.mock_client.get.assert_awaited_once_with("key")
+
+    async def test_should_set_value_with_ttl_in_milliseconds(self):
+        # Act
+        await self.adapter.set("key", b"value", ttl_seconds=1.5)
+
+        # Assert
+        self.mock_client.set.assert_awaited_once_with("key", b"value", px=1500)
+
+    async def test_should_add_value_only_if_absent(self):
+        # Arrange
+        self.mock_client.set.return_value = None
+
+        # Act
+        added = await self.adapter.add("lock", b"1", ttl_seconds=5)
+
+        # Assert
+        self.assertFalse(added)
+        self.mock_client.set.assert_awaited_once_with(
+            "lock", b"1", px=5000, nx=True
+        )
+
+    async def test_should_get_many_values(self):
+        # Arrange
+        self.mock_client.mget.return_value = [b"a", None]
+
+        # Act
+        values = await self.adapter.get_many(["a", "b"])
+
+        # Assert
+        self.assertEqual(values, [b"a", None])
+        self.mock_client.mget.assert_awaited_once_with(["a", "b"])
+
+    async def test_should_delete_keys(self):
+        # Act
+        await self.adapter.delete("a", "b")
+
+        # Assert
+        self.mock_client.delete.assert_awaited_once_with("a", "b")
+
+    async def test_should_raise_cache_exception_on_redis_error(self):
+        # Arrange
+        self.mock_client.get.side_effect = ConnectionError("down")
+
+        # Act & Assert
+        with self.assertRaises(CacheException):
+            await self.adapter.get("key")
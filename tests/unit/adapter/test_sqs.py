@@ -1,10 +1,13 @@
 import unittest
 from unittest.mock import patch
+from uuid import uuid4
 
+from botocore.exceptions import ClientError
 from src.adapter.exceptions import SqsException
 from src.adapter.sqs import SQSAdapter
 from src.domain.enums import ProductEventType
 from src.domain.events import ProductEvent
+from src.port.event_publishers import SerializedProductEvent
 
 
 class TestSQSAdapter(unittest.TestCase):
@@ -82,6 +85,89 @@ class TestSQSAdapter(unittest.TestCase):
             DelaySeconds=0,
         )
 
+    def test_should_resolve_queue_url_once(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {"Failed": []}
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act
+        self.sqs_adapter.publish(product_event)
+        self.sqs_adapter.publish(product_event)
+        self.sqs_adapter.publish_batch([product_event])
+
+        # Assert
+        self.mock_sqs_client.get_queue_url.assert_called_once_with(
+            QueueName=self.queue_name
+        )
+        self.assertEqual(self.mock_sqs_client.send_message.call_count, 2)
+
+    def test_should_resolve_queue_url_again_when_queue_does_not_exist(
+        self,
+    ) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.side_effect = [
+            {"QueueUrl": "http://old-queue-url"},
+            {"QueueUrl": "http://new-queue-url"},
+        ]
+        self.mock_sqs_client.send_message.side_effect = [
+            ClientError(
+                {
+                    "Error": {
+                        "Code": "AWS.SimpleQueueService.NonExistentQueue",
+                        "Message": "The specified queue does not exist.",
+                    }
+                },
+                "SendMessage",
+            ),
+            {},
+        ]
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act
+        self.sqs_adapter.publish(product_event)
+
+        # Assert
+        self.assertEqual(self.mock_sqs_client.get_queue_url.call_count, 2)
+        self.assertEqual(
+            self.mock_sqs_client.send_message.call_args[1]["QueueUrl"],
+            "http://new-queue-url",
+        )
+        self.assertEqual(
+            self.sqs_adapter.get_queue_url(), "http://new-queue-url"
+        )
+
+    @patch("boto3.client")
+    def test_should_send_deduplication_ids_to_fifo_queues(
+        self, mock_boto_client
+    ) -> None:
+        # Arrange
+        sqs_adapter = SQSAdapter(
+            "product-update.fifo",
+            self.aws_access_key_id,
+            self.aws_secret_access_key,
+            self.endpoint_url,
+            self.region_name,
+        )
+        mock_sqs_client = mock_boto_client.return_value
+        mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act
+        sqs_adapter.publish(product_event)
+
+        # Assert
+        mock_sqs_client.send_message.assert_called_once_with(
+            QueueUrl="http://test-queue-url",
+            MessageBody=product_event.to_json(),
+            MessageGroupId="123",
+            MessageDeduplicationId=str(product_event.id),
+        )
+
     def test_publish_message_should_fail(self) -> None:
         # Arrange
         self.mock_sqs_client.get_queue_url.return_value = {
@@ -103,6 +189,152 @@ class TestSQSAdapter(unittest.TestCase):
         self.assertIn(
             "Send message failed", context.exception.args[0]["message"]
         )
+        self.mock_sqs_client.get_queue_url.assert_called_once()
+
+    def test_should_publish_messages_in_batches_of_ten(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [],
+            "Failed": [],
+        }
+        product_events = [
+            ProductEvent(type=ProductEventType.DELETED, sku=f"sku-{index}")
+            for index in range(25)
+        ]
+
+        # Act
+        self.sqs_adapter.publish_batch(product_events)
+
+        # Assert
+        self.mock_sqs_client.get_queue_url.assert_called_once_with(
+            QueueName=self.queue_name
+        )
+        calls = self.mock_sqs_client.send_message_batch.call_args_list
+        self.assertEqual(
+            [len(call[1]["Entries"]) for call in calls], [10, 10, 5]
+        )
+        self.assertEqual(
+            calls[2][1]["Entries"][0]["MessageBody"],
+            product_events[20].to_json(),
+        )
+
+    def test_publish_batch_should_fail_on_failed_entries(self) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [],
+            "Failed": [{"Id": "0", "SenderFault": False, "Code": "Error"}],
+        }
+        product_event = ProductEvent(type=ProductEventType.DELETED, sku="123")
+
+        # Act & Assert
+        with self.assertRaises(SqsException) as context:
+            self.sqs_adapter.publish_batch([product_event])
+
+        self.assertEqual(
+            context.exception.args[0]["code"],
+            "sqs.error.queue.send_message_batch",
+        )
+
+    @patch("boto3.client")
+    def test_should_publish_serialized_events_as_stored(
+        self, mock_boto_client
+    ) -> None:
+        # Arrange
+        sqs_adapter = SQSAdapter(
+            "product-update.fifo",
+            self.aws_access_key_id,
+            self.aws_secret_access_key,
+            self.endpoint_url,
+            self.region_name,
+        )
+        mock_sqs_client = mock_boto_client.return_value
+        mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        mock_sqs_client.send_message_batch.return_value = {"Failed": []}
+        product_event = SerializedProductEvent(
+            id=uuid4(), sku="123", body='{"type": "deleted", "sku": "123"}'
+        )
+
+        # Act
+        rejected = sqs_adapter.publish_serialized_batch([product_event])
+
+        # Assert
+        self.assertEqual(rejected, {})
+        mock_sqs_client.send_message_batch.assert_called_once_with(
+            QueueUrl="http://test-queue-url",
+            Entries=[
+                {
+                    "Id": "0",
+                    "MessageBody": '{"type": "deleted", "sku": "123"}',
+                    "MessageGroupId": "123",
+                    "MessageDeduplicationId": str(product_event.id),
+                }
+            ],
+        )
+
+    def test_should_return_serialized_events_rejected_by_the_queue(
+        self,
+    ) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Failed": [
+                {
+                    "Id": "1",
+                    "SenderFault": True,
+                    "Code": "InvalidMessageContents",
+                    "Message": "Invalid characters",
+                }
+            ]
+        }
+        product_events = [
+            SerializedProductEvent(id=uuid4(), sku=f"sku-{index}", body="{}")
+            for index in range(12)
+        ]
+
+        # Act
+        rejected = self.sqs_adapter.publish_serialized_batch(product_events)
+
+        # Assert
+        self.assertEqual(
+            rejected,
+            {
+                product_events[1].id: "InvalidMessageContents: "
+                "Invalid characters",
+                product_events[11].id: "InvalidMessageContents: "
+                "Invalid characters",
+            },
+        )
+
+    def test_publish_serialized_batch_should_fail_on_server_errors(
+        self,
+    ) -> None:
+        # Arrange
+        self.mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "http://test-queue-url"
+        }
+        self.mock_sqs_client.send_message_batch.return_value = {
+            "Failed": [{"Id": "0", "SenderFault": False, "Code": "Error"}],
+        }
+        product_event = SerializedProductEvent(id=uuid4(), sku="1", body="{}")
+
+        # Act & Assert
+        with self.assertRaises(SqsException) as context:
+            self.sqs_adapter.publish_serialized_batch([product_event])
+
+        self.assertEqual(
+            context.exception.args[0]["code"],
+            "sqs.error.queue.send_message_batch",
+        )
 
 
 if __name__ == "__main__":
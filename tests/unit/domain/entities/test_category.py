@@ -23,6 +23,18 @@ class TestCategory(unittest.TestCase):
         self.assertIsInstance(category.id, UUID)
         self.assertEqual(category.name, self.valid_name)
 
+    def test_intern_shares_identical_categories(self):
+        first = Category.intern(id=self.valid_id, name=self.valid_name)
+        second = Category.intern(id=self.valid_id, name=self.valid_name)
+        other = Category.intern(id=uuid4(), name=self.valid_name)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.name, self.valid_name)
+
+    def test_from_dict_returns_interned_category(self):
+        data = {"id": str(self.valid_id), "name": self.valid_name}
+        self.assertIs(Category.from_dict(data), Category.from_dict(data))
+
     def test_validate_name_valid(self):
         self.assertEqual(
             Category.validate_name(self.valid_name), self.valid_name
@@ -35,6 +47,14 @@ class TestCategory(unittest.TestCase):
             str(context.exception), "Name can not have less than 3 characters."
         )
 
+    def test_validate_name_too_long(self):
+        with self.assertRaises(InvalidName) as context:
+            Category(name="c" * 256)
+        self.assertEqual(
+            str(context.exception),
+            "Name can not have more than 255 characters.",
+        )
+
     def test_validate_name_empty(self):
         with self.assertRaises(InvalidName) as context:
             Category.validate_name(self.empty_name)
@@ -5,7 +5,9 @@ from src.domain.entities import Category, Product
 from src.domain.exceptions import (
     InvalidDescription,
     InvalidImageUrl,
+    InvalidInventory,
     InvalidName,
+    InvalidPrice,
     InvalidSku,
 )
 from src.domain.value_objects import Inventory, Price
@@ -55,6 +57,51 @@ class TestProduct(unittest.TestCase):
         self.assertEqual(product.inventory, self.valid_inventory)
         self.assertEqual(product.category, self.valid_category)
 
+    def test_product_from_row_matches_constructor(self):
+        product = Product.from_row(
+            id=self.valid_id,
+            version=self.valid_version,
+            sku=self.valid_sku,
+            name=self.valid_name,
+            description=self.valid_description,
+            image_url=self.valid_image_url,
+            price=self.valid_price,
+            inventory=self.valid_inventory,
+            category=self.valid_category,
+        )
+        expected = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            image_url=self.valid_image_url,
+            price=self.valid_price,
+            inventory=self.valid_inventory,
+            category=self.valid_category,
+            version=self.valid_version,
+            id=self.valid_id,
+        )
+        self.assertEqual(product.to_dict(), expected.to_dict())
+
+    def test_product_and_value_objects_have_no_instance_dict(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            price=self.valid_price,
+            inventory=self.valid_inventory,
+            category=self.valid_category,
+        )
+        for entity in (
+            product,
+            product.price,
+            product.inventory,
+            product.category,
+        ):
+            with self.subTest(entity=type(entity).__name__):
+                self.assertFalse(hasattr(entity, "__dict__"))
+        with self.assertRaises(AttributeError):
+            product.unknown = True
+
     def test_product_creation_without_id_and_version(self):
         product = Product(
             name=self.valid_name,
@@ -85,6 +132,13 @@ class TestProduct(unittest.TestCase):
             str(context.exception), "Sku can not have less than 3 characters."
         )
 
+    def test_validate_sku_too_long(self):
+        with self.assertRaises(InvalidSku) as context:
+            Product.validate_sku("s" * 51)
+        self.assertEqual(
+            str(context.exception), "Sku can not have more than 50 characters."
+        )
+
     def test_validate_sku_empty(self):
         with self.assertRaises(InvalidSku) as context:
             Product.validate_sku(self.empty_sku)
@@ -107,6 +161,14 @@ class TestProduct(unittest.TestCase):
             str(context.exception), "Name can not have less than 3 characters."
         )
 
+    def test_validate_name_too_long(self):
+        with self.assertRaises(InvalidName) as context:
+            Product.validate_name("n" * 256)
+        self.assertEqual(
+            str(context.exception),
+            "Name can not have more than 255 characters.",
+        )
+
     def test_validate_name_empty(self):
         with self.assertRaises(InvalidName) as context:
             Product.validate_name(self.empty_name)
@@ -156,6 +218,14 @@ class TestProduct(unittest.TestCase):
             Product.validate_image_url(self.invalid_image_url)
         self.assertEqual(str(context.exception), "Image Url is invalid.")
 
+    def test_validate_image_url_too_long(self):
+        with self.assertRaises(InvalidImageUrl) as context:
+            Product.validate_image_url("https://" + "i" * 248)
+        self.assertEqual(
+            str(context.exception),
+            "Image Url can not have more than 255 characters.",
+        )
+
     def test_validate_image_url_none(self):
         self.assertIsNone(Product.validate_image_url(None))
 
@@ -184,6 +254,97 @@ class TestProduct(unittest.TestCase):
         }
         self.assertEqual(product.to_dict(), expected_dict)
 
+    def test_from_dict_round_trip(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            image_url=self.valid_image_url,
+            price=self.valid_price,
+            inventory=self.valid_inventory,
+            category=self.valid_category,
+            version=self.valid_version,
+            id=self.valid_id,
+        )
+
+        restored = Product.from_dict(product.to_dict())
+
+        self.assertEqual(restored.to_dict(), product.to_dict())
+        self.assertIsInstance(restored.id, UUID)
+
+    def test_from_dict_without_optional_fields(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            id=self.valid_id,
+        )
+
+        restored = Product.from_dict(product.to_dict())
+
+        self.assertIsNone(restored.price)
+        self.assertIsNone(restored.inventory)
+        self.assertIsNone(restored.category)
+
+    def test_patch_keeps_unchanged_fields(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            image_url=self.valid_image_url,
+            price=self.valid_price,
+            inventory=self.valid_inventory,
+            category=self.valid_category,
+            version=self.valid_version,
+            id=self.valid_id,
+        )
+
+        patched = product.patch(
+            {"price": {"discount_percent": 0.5}, "inventory": {"reserved": 4}}
+        )
+
+        self.assertEqual(patched.id, product.id)
+        self.assertEqual(patched.version, product.version)
+        self.assertEqual(patched.name, self.valid_name)
+        self.assertEqual(patched.price.id, self.valid_price.id)
+        self.assertEqual(patched.price.value, 100)
+        self.assertEqual(patched.price.discount_percent, 0.5)
+        self.assertEqual(patched.inventory.id, self.valid_inventory.id)
+        self.assertEqual(patched.inventory.quantity, 10)
+        self.assertEqual(patched.inventory.reserved, 4)
+        self.assertEqual(patched.category.name, "Electronics")
+
+    def test_patch_validates_merged_values(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+            inventory=self.valid_inventory,
+        )
+
+        with self.assertRaises(InvalidInventory):
+            product.patch({"inventory": {"reserved": 11}})
+        with self.assertRaises(InvalidPrice):
+            product.patch({"price": {"discount_percent": 0.1}})
+        with self.assertRaises(InvalidName):
+            product.patch({"name": None})
+
+    def test_patch_creates_missing_value_objects(self):
+        product = Product(
+            name=self.valid_name,
+            description=self.valid_description,
+            sku=self.valid_sku,
+        )
+
+        patched = product.patch(
+            {"price": {"value": 5.0}, "category": {"name": "Books"}}
+        )
+
+        self.assertEqual(patched.price.value, 5.0)
+        self.assertEqual(patched.price.discount_percent, 0)
+        self.assertEqual(patched.category.name, "Books")
+        self.assertIsNone(patched.inventory)
+
 
 if __name__ == "__main__":
     unittest.main()
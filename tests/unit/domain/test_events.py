@@ -45,6 +45,10 @@ class TestProductEvent(unittest.TestCase):
         self.assertIsNone(event.product)
         self.assertEqual(event.sku, self.valid_sku)
 
+    def test_product_event_has_no_instance_dict(self):
+        event = ProductEvent(type=ProductEventType.DELETED, sku=self.valid_sku)
+        self.assertFalse(hasattr(event, "__dict__"))
+
     def test_product_event_creation_created_type_without_product(self):
         with self.assertRaises(Exception) as context:
             ProductEvent(type=ProductEventType.CREATED)
@@ -68,23 +72,52 @@ class TestProductEvent(unittest.TestCase):
             str(context.exception), "DELETED product event must have valid sku"
         )
 
+    def test_product_event_creation_patched_type_without_changes(self):
+        with self.assertRaises(Exception) as context:
+            ProductEvent(type=ProductEventType.PATCHED, sku=self.valid_sku)
+        self.assertEqual(
+            str(context.exception),
+            "PATCHED product event must have sku and changes",
+        )
+
+    def test_to_dict_with_changes(self):
+        changes = {"version": 2, "price": {"value": 9.99}}
+        event = ProductEvent(
+            type=ProductEventType.PATCHED, sku=self.valid_sku, changes=changes
+        )
+        expected_dict = {
+            "id": str(event.id),
+            "type": ProductEventType.PATCHED.string,
+            "product": None,
+            "sku": self.valid_sku,
+            "changes": changes,
+        }
+        self.assertEqual(event.to_dict(), expected_dict)
+        self.assertEqual(
+            ProductEvent.from_dict(event.to_dict()).changes, changes
+        )
+
     def test_to_dict_with_product(self):
         event = ProductEvent(
             type=ProductEventType.CREATED, product=self.mock_product
         )
         expected_dict = {
+            "id": str(event.id),
             "type": ProductEventType.CREATED.string,
             "product": self.mock_product.to_dict(),
             "sku": None,
+            "changes": None,
         }
         self.assertEqual(event.to_dict(), expected_dict)
 
     def test_to_dict_with_sku(self):
         event = ProductEvent(type=ProductEventType.DELETED, sku=self.valid_sku)
         expected_dict = {
+            "id": str(event.id),
             "type": ProductEventType.DELETED.string,
             "product": None,
             "sku": self.valid_sku,
+            "changes": None,
         }
         self.assertEqual(event.to_dict(), expected_dict)
 
@@ -92,25 +125,37 @@ class TestProductEvent(unittest.TestCase):
         event = ProductEvent(
             type=ProductEventType.CREATED, product=self.mock_product
         )
-        expected_json = json.dumps(
-            {
-                "type": ProductEventType.CREATED.string,
-                "product": self.mock_product.to_dict(),
-                "sku": None,
-            }
-        )
-        self.assertEqual(event.to_json(), expected_json)
+        expected_dict = {
+            "id": str(event.id),
+            "type": ProductEventType.CREATED.string,
+            "product": self.mock_product.to_dict(),
+            "sku": None,
+            "changes": None,
+        }
+        self.assertEqual(json.loads(event.to_json()), expected_dict)
 
     def test_to_json_with_sku(self):
         event = ProductEvent(type=ProductEventType.DELETED, sku=self.valid_sku)
-        expected_json = json.dumps(
-            {
-                "type": ProductEventType.DELETED.string,
-                "product": None,
-                "sku": self.valid_sku,
-            }
+        expected_dict = {
+            "id": str(event.id),
+            "type": ProductEventType.DELETED.string,
+            "product": None,
+            "sku": self.valid_sku,
+            "changes": None,
+        }
+        self.assertEqual(json.loads(event.to_json()), expected_dict)
+
+    def test_from_dict_round_trip(self):
+        product = Product(
+            sku="testsku", name="Test Product", description="Description"
         )
-        self.assertEqual(event.to_json(), expected_json)
+        event = ProductEvent(type=ProductEventType.UPDATED, product=product)
+
+        restored = ProductEvent.from_dict(event.to_dict())
+
+        self.assertEqual(restored.id, event.id)
+        self.assertEqual(restored.type, ProductEventType.UPDATED)
+        self.assertEqual(restored.to_dict(), event.to_dict())
 
 
 if __name__ == "__main__":
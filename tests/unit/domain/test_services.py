@@ -2,13 +2,22 @@ import unittest
 from unittest.mock import Mock
 
 from src.domain.entities import Category, Product
-from src.domain.exceptions import InvalidSku, ProductNotFound
+from src.domain.exceptions import (
+    InsufficientInventory,
+    InvalidCursor,
+    InvalidInventory,
+    InvalidPrice,
+    InvalidSearchQuery,
+    InvalidSku,
+    OutdatedProduct,
+    ProductNotFound,
+)
 from src.domain.services import CatalogueService
-from src.domain.value_objects import Inventory, Price
+from src.domain.value_objects import Inventory, Price, RepricingRule
 from src.port import ProductEventPublisher, ProductRepository
 
 
-class TestCatalogueService(unittest.TestCase):
+class TestCatalogueService(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.mock_product_repository = Mock(spec=ProductRepository)
         self.mock_product_event_publisher = Mock(spec=ProductEventPublisher)
@@ -17,14 +26,14 @@ class TestCatalogueService(unittest.TestCase):
             product_event_publisher=self.mock_product_event_publisher,
         )
 
-    def test_create_product_success(self):
+    async def test_create_product_success(self):
         mock_product = Mock(spec=Product)
         self.mock_product_repository.create_product.return_value = mock_product
         price = Mock(spec=Price)
         inventory = Mock(spec=Inventory)
         category = Mock(spec=Category)
 
-        product = self.catalogue_service.create_product(
+        product = await self.catalogue_service.create_product(
             sku="validsku",
             name="Valid Name",
             description="Valid Description",
@@ -37,38 +46,338 @@ class TestCatalogueService(unittest.TestCase):
         self.assertEqual(product, mock_product)
         self.mock_product_event_publisher.publish.assert_called_once()
 
-    def test_create_product_invalid_sku(self):
+    async def test_create_product_invalid_sku(self):
         with self.assertRaises(InvalidSku):
-            self.catalogue_service.create_product(
+            await self.catalogue_service.create_product(
                 sku="", name="Valid Name", description="Valid Description"
             )
 
-    def test_get_product_by_sku_success(self):
+    async def test_import_products_success(self):
+        products = [
+            {"sku": f"sku-{index}", "name": "Name", "description": "Desc"}
+            for index in range(3)
+        ]
+        self.mock_product_repository.create_products.side_effect = (
+            lambda products: products
+        )
+
+        created_products, failures = (
+            await self.catalogue_service.import_products(
+                products=products, batch_size=2
+            )
+        )
+
+        self.assertEqual(len(created_products), 3)
+        self.assertEqual(failures, [])
+        self.assertEqual(
+            self.mock_product_repository.create_products.call_count, 2
+        )
+        self.assertEqual(
+            self.mock_product_event_publisher.publish_batch.call_count, 2
+        )
+
+    async def test_import_products_reports_row_failures(self):
+        products = [
+            {"sku": "sku-0", "name": "Name", "description": "Desc"},
+            {"sku": "", "name": "Name", "description": "Desc"},
+            {"sku": "sku-0", "name": "Name", "description": "Desc"},
+            {"sku": "sku-3", "name": "Name", "description": "Desc"},
+        ]
+        self.mock_product_repository.create_products.side_effect = (
+            lambda products: [
+                product for product in products if product.sku != "sku-3"
+            ]
+        )
+
+        created_products, failures = (
+            await self.catalogue_service.import_products(products=products)
+        )
+
+        self.assertEqual(
+            [product.sku for product in created_products], ["sku-0"]
+        )
+        self.assertEqual([position for position, _ in failures], [1, 2, 3])
+        self.assertEqual(failures[1][1], "Product is duplicated in batch")
+        self.assertEqual(failures[2][1], "Product already exists")
+        published_events = (
+            self.mock_product_event_publisher.publish_batch.call_args[1][
+                "product_events"
+            ]
+        )
+        self.assertEqual(len(published_events), 1)
+
+    async def test_import_products_batch_error_only_fails_bad_rows(self):
+        products = [
+            {"sku": f"sku-{index}", "name": "Name", "description": "Desc"}
+            for index in range(4)
+        ]
+
+        def create_products(products):
+            if any(product.sku == "sku-0" for product in products):
+                raise Exception("Mock DB Error")
+            return products
+
+        self.mock_product_repository.create_products.side_effect = (
+            create_products
+        )
+
+        created_products, failures = (
+            await self.catalogue_service.import_products(
+                products=products, batch_size=2
+            )
+        )
+
+        self.assertEqual(
+            [product.sku for product in created_products],
+            ["sku-1", "sku-2", "sku-3"],
+        )
+        self.assertEqual(
+            failures, [(0, "Error creating product: Mock DB Error")]
+        )
+        self.assertEqual(
+            self.mock_product_repository.create_products.call_count, 4
+        )
+
+    async def test_get_product_by_sku_success(self):
         mock_product = Mock(spec=Product)
         self.mock_product_repository.get_product_by_sku.return_value = (
             mock_product
         )
 
-        product = self.catalogue_service.get_product_by_sku(sku="validsku")
+        product = await self.catalogue_service.get_product_by_sku(
+            sku="validsku"
+        )
 
         self.assertEqual(product, mock_product)
 
-    def test_get_product_by_sku_not_found(self):
+    async def test_get_product_revision(self):
+        self.mock_product_repository.get_product_revision.return_value = (
+            2,
+            1,
+        )
+
+        revision = await self.catalogue_service.get_product_revision(
+            sku="validsku"
+        )
+
+        self.assertEqual(revision, (2, 1))
+
+    async def test_get_product_revision_not_found(self):
+        self.mock_product_repository.get_product_revision.side_effect = (
+            ProductNotFound("Product not found")
+        )
+
+        with self.assertRaises(ProductNotFound):
+            await self.catalogue_service.get_product_revision(sku="validsku")
+
+    async def test_get_product_by_sku_not_found(self):
         self.mock_product_repository.get_product_by_sku.side_effect = (
             ProductNotFound("Product not found")
         )
 
         with self.assertRaises(ProductNotFound):
-            self.catalogue_service.get_product_by_sku(sku="invalidsku")
+            await self.catalogue_service.get_product_by_sku(sku="invalidsku")
+
+    async def test_get_products_by_skus_reports_missing_skus(self):
+        mock_product = Mock(spec=Product)
+        mock_product.sku = "sku002"
+        self.mock_product_repository.get_products_by_skus.return_value = [
+            mock_product
+        ]
+
+        products, missing = await self.catalogue_service.get_products_by_skus(
+            skus=["sku001", "sku002", "sku001", "sku003"]
+        )
+
+        self.assertEqual(products, [mock_product])
+        self.assertEqual(missing, ["sku001", "sku003"])
+        get_many = self.mock_product_repository.get_products_by_skus
+        get_many.assert_awaited_once_with(skus=["sku001", "sku002", "sku003"])
+
+    async def test_get_products_by_skus_invalid_sku(self):
+        with self.assertRaises(InvalidSku):
+            await self.catalogue_service.get_products_by_skus(
+                skus=["sku001", "x"]
+            )
+
+        self.mock_product_repository.get_products_by_skus.assert_not_called()
+
+    async def test_list_products_returns_next_cursor(self):
+        mock_products = [Mock(spec=Product, sku=f"sku00{i}") for i in range(3)]
+        self.mock_product_repository.list_products.return_value = mock_products
+
+        products, next_cursor = await self.catalogue_service.list_products(
+            limit=2, category="books"
+        )
+
+        self.assertEqual(products, mock_products[:2])
+        self.mock_product_repository.list_products.assert_awaited_once_with(
+            limit=3,
+            after_sku=None,
+            category="books",
+            min_price=None,
+            max_price=None,
+            in_stock=None,
+        )
+
+        await self.catalogue_service.list_products(
+            limit=2, cursor=next_cursor, min_price=1.5, in_stock=True
+        )
+
+        self.mock_product_repository.list_products.assert_awaited_with(
+            limit=3,
+            after_sku="sku001",
+            category=None,
+            min_price=1.5,
+            max_price=None,
+            in_stock=True,
+        )
+
+    async def test_list_products_last_page_has_no_cursor(self):
+        mock_products = [Mock(spec=Product, sku="sku001")]
+        self.mock_product_repository.list_products.return_value = mock_products
+
+        products, next_cursor = await self.catalogue_service.list_products(
+            limit=2
+        )
+
+        self.assertEqual(products, mock_products)
+        self.assertIsNone(next_cursor)
+
+    async def test_list_products_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            await self.catalogue_service.list_products(
+                limit=2, cursor="garbage"
+            )
+
+        self.mock_product_repository.list_products.assert_not_called()
+
+    async def test_list_products_invalid_price_range(self):
+        with self.assertRaises(InvalidPrice):
+            await self.catalogue_service.list_products(
+                limit=2, min_price=10, max_price=5
+            )
+
+        self.mock_product_repository.list_products.assert_not_called()
+
+    async def test_export_products_includes_deletions_when_incremental(self):
+        repository = self.mock_product_repository
+        repository.get_change_watermark.return_value = 42
+        repository.export_products.return_value = iter([])
+        repository.export_deleted_skus.return_value = iter([])
+
+        (
+            watermark,
+            deleted_skus,
+            products,
+        ) = await self.catalogue_service.export_products(
+            batch_size=500, category="books", changed_since=7
+        )
+
+        self.assertEqual(watermark, 42)
+        self.assertIs(
+            deleted_skus, repository.export_deleted_skus.return_value
+        )
+        self.assertIs(products, repository.export_products.return_value)
+        repository.export_deleted_skus.assert_called_once_with(
+            batch_size=500, changed_since=7
+        )
+        repository.export_products.assert_called_once_with(
+            batch_size=500,
+            category="books",
+            min_price=None,
+            max_price=None,
+            in_stock=None,
+            changed_since=7,
+        )
+
+    async def test_export_products_full_export_has_no_deletions(self):
+        repository = self.mock_product_repository
+        repository.get_change_watermark.return_value = 42
+
+        (
+            watermark,
+            deleted_skus,
+            _,
+        ) = await self.catalogue_service.export_products(batch_size=500)
+
+        self.assertEqual(watermark, 42)
+        self.assertIsNone(deleted_skus)
+        repository.export_deleted_skus.assert_not_called()
+
+    async def test_export_products_invalid_price_range(self):
+        with self.assertRaises(InvalidPrice):
+            await self.catalogue_service.export_products(
+                batch_size=500, min_price=10, max_price=5
+            )
+
+        self.mock_product_repository.export_products.assert_not_called()
+
+    async def test_count_products_by_category(self):
+        count_products = (
+            self.mock_product_repository.count_products_by_category
+        )
+        count_products.return_value = {"books": 2}
+
+        counts = await self.catalogue_service.count_products_by_category(
+            in_stock=True
+        )
+
+        self.assertEqual(counts, {"books": 2})
+        count_products.assert_awaited_once_with(
+            min_price=None, max_price=None, in_stock=True
+        )
+
+    async def test_search_products_returns_next_cursor(self):
+        results = [
+            (Mock(spec=Product, sku=f"sku00{i}"), 1.0 - i / 10)
+            for i in range(3)
+        ]
+        self.mock_product_repository.search_products.return_value = results
+
+        products, next_cursor = await self.catalogue_service.search_products(
+            query="  head phones ", limit=2
+        )
+
+        self.assertEqual(products, [product for product, _ in results[:2]])
+        self.mock_product_repository.search_products.assert_awaited_once_with(
+            query="head phones", limit=3, after=None
+        )
+
+        await self.catalogue_service.search_products(
+            query="head phones", limit=2, cursor=next_cursor
+        )
+
+        self.mock_product_repository.search_products.assert_awaited_with(
+            query="head phones", limit=3, after=(0.9, "sku001")
+        )
+
+    async def test_search_products_invalid_query(self):
+        for query in ("", "   ", "x" * 201):
+            with self.subTest(query=query):
+                with self.assertRaises(InvalidSearchQuery):
+                    await self.catalogue_service.search_products(
+                        query=query, limit=2
+                    )
 
-    def test_update_product_success(self):
+        self.mock_product_repository.search_products.assert_not_called()
+
+    async def test_search_products_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            await self.catalogue_service.search_products(
+                query="phones", limit=2, cursor="garbage"
+            )
+
+        self.mock_product_repository.search_products.assert_not_called()
+
+    async def test_update_product_success(self):
         mock_product = Mock(spec=Product)
         self.mock_product_repository.update_product.return_value = mock_product
         price = Mock(spec=Price)
         inventory = Mock(spec=Inventory)
         category = Mock(spec=Category)
 
-        product = self.catalogue_service.update_product(
+        product = await self.catalogue_service.update_product(
             sku="validsku",
             name="Updated Name",
             description="Updated Description",
@@ -81,31 +390,231 @@ class TestCatalogueService(unittest.TestCase):
         self.assertEqual(product, mock_product)
         self.mock_product_event_publisher.publish.assert_called_once()
 
-    def test_update_product_not_found(self):
+    async def test_update_product_not_found(self):
         self.mock_product_repository.update_product.side_effect = (
             ProductNotFound("Product not found")
         )
 
         with self.assertRaises(ProductNotFound):
-            self.catalogue_service.update_product(
+            await self.catalogue_service.update_product(
                 sku="invalidsku",
                 name="Updated Name",
                 description="Updated Description",
             )
 
-    def test_delete_product_success(self):
-        result = self.catalogue_service.delete_product(sku="validsku")
+    async def test_update_product_outdated(self):
+        self.mock_product_repository.update_product.side_effect = (
+            OutdatedProduct("Outdated product")
+        )
+
+        with self.assertRaises(OutdatedProduct):
+            await self.catalogue_service.update_product(
+                sku="validsku",
+                name="Updated Name",
+                description="Updated Description",
+                expected_version=1,
+            )
+
+        kwargs = self.mock_product_repository.update_product.call_args.kwargs
+        self.assertEqual(kwargs["expected_version"], 1)
+        self.mock_product_event_publisher.publish.assert_not_called()
+
+    async def test_patch_product_success(self):
+        current_product = Product(
+            sku="validsku",
+            name="Valid Name",
+            description="Valid Description",
+            price=Price(value=10.0),
+            version=2,
+        )
+        patched_product = Mock(spec=Product, version=3)
+        self.mock_product_repository.get_product_by_sku.return_value = (
+            current_product
+        )
+        self.mock_product_repository.patch_product.return_value = (
+            patched_product
+        )
+
+        product = await self.catalogue_service.patch_product(
+            sku="validsku", changes={"price": {"value": 12.5}}
+        )
+
+        self.assertEqual(product, patched_product)
+        kwargs = self.mock_product_repository.patch_product.call_args.kwargs
+        self.assertEqual(kwargs["product"].price.value, 12.5)
+        self.assertEqual(kwargs["product"].name, "Valid Name")
+        self.assertEqual(kwargs["expected_version"], 2)
+        event = self.mock_product_event_publisher.publish.call_args.kwargs[
+            "product_event"
+        ]
+        self.assertIsNone(event.product)
+        self.assertEqual(
+            event.changes, {"price": {"value": 12.5}, "version": 3}
+        )
+
+    async def test_patch_product_retries_on_concurrent_change(self):
+        self.mock_product_repository.get_product_by_sku.side_effect = [
+            Product(
+                sku="validsku",
+                name="Valid Name",
+                description="Valid Description",
+                version=version,
+            )
+            for version in (2, 3)
+        ]
+        self.mock_product_repository.patch_product.side_effect = [
+            OutdatedProduct("Outdated version"),
+            Mock(spec=Product, version=4),
+        ]
+
+        await self.catalogue_service.patch_product(
+            sku="validsku", changes={"name": "Other Name"}
+        )
+
+        kwargs = self.mock_product_repository.patch_product.call_args.kwargs
+        self.assertEqual(kwargs["expected_version"], 3)
+        self.assertEqual(
+            self.mock_product_repository.patch_product.call_count, 2
+        )
+
+    async def test_patch_product_with_outdated_expected_version(self):
+        self.mock_product_repository.get_product_by_sku.return_value = Product(
+            sku="validsku",
+            name="Valid Name",
+            description="Valid Description",
+            version=5,
+        )
+
+        with self.assertRaises(OutdatedProduct):
+            await self.catalogue_service.patch_product(
+                sku="validsku",
+                changes={"name": "Other Name"},
+                expected_version=4,
+            )
+
+        self.mock_product_repository.patch_product.assert_not_called()
+        self.mock_product_event_publisher.publish.assert_not_called()
+
+    async def test_patch_product_without_stored_version(self):
+        self.mock_product_repository.get_product_by_sku.return_value = Product(
+            sku="validsku",
+            name="Valid Name",
+            description="Valid Description",
+        )
+
+        with self.assertRaises(OutdatedProduct):
+            await self.catalogue_service.patch_product(
+                sku="validsku", changes={"name": "Other Name"}
+            )
+
+        self.mock_product_repository.patch_product.assert_not_called()
+
+    async def test_reserve_inventory_aggregates_lines(self):
+        inventory = Inventory(quantity=10, reserved=3)
+        self.mock_product_repository.reserve_inventory.return_value = {
+            "validsku": inventory
+        }
+
+        inventories = await self.catalogue_service.reserve_inventory(
+            lines=[("validsku", 1), ("validsku", 2)]
+        )
+
+        self.assertEqual(inventories, {"validsku": inventory})
+        kwargs = (
+            self.mock_product_repository.reserve_inventory.call_args.kwargs
+        )
+        self.assertEqual(kwargs["quantities"], {"validsku": 3})
+        product_events = (
+            self.mock_product_event_publisher.publish_batch.call_args.kwargs[
+                "product_events"
+            ]
+        )
+        self.assertEqual(
+            product_events[0].changes,
+            {"inventory": {"quantity": 10, "reserved": 3}},
+        )
+
+    async def test_reserve_inventory_rejects_non_positive_quantity(self):
+        with self.assertRaises(InvalidInventory):
+            await self.catalogue_service.reserve_inventory(
+                lines=[("validsku", 0)]
+            )
+
+        self.mock_product_repository.reserve_inventory.assert_not_called()
+
+    async def test_release_inventory_insufficient(self):
+        self.mock_product_repository.release_inventory.side_effect = (
+            InsufficientInventory("Can not release more than reserved")
+        )
+
+        with self.assertRaises(InsufficientInventory):
+            await self.catalogue_service.release_inventory(
+                lines=[("validsku", 5)]
+            )
+
+        self.mock_product_event_publisher.publish_batch.assert_not_called()
+
+    async def test_reprice_products_writes_only_changed_prices(self):
+        self.mock_product_repository.list_prices.side_effect = [
+            [("sku001", 10.0, 0.0), ("sku002", 20.0, 0.2)],
+            [("sku003", 30.0, 0.1)],
+        ]
+        self.mock_product_repository.update_prices.side_effect = (
+            lambda skus, **kwargs: [Mock(spec=Product) for _ in skus]
+        )
+
+        repriced = await self.catalogue_service.reprice_products(
+            rule=RepricingRule(category="Books", discount_percent=0.2),
+            chunk_size=2,
+        )
+
+        self.assertEqual(repriced, 2)
+        list_calls = self.mock_product_repository.list_prices.call_args_list
+        self.assertEqual(list_calls[1].kwargs["after_sku"], "sku002")
+        self.assertEqual(list_calls[1].kwargs["category"], "Books")
+        update_calls = (
+            self.mock_product_repository.update_prices.call_args_list
+        )
+        self.assertEqual(
+            update_calls[0].kwargs,
+            {
+                "skus": ["sku001"],
+                "values": [10.0],
+                "discount_percents": [0.2],
+                "expected_values": [10.0],
+                "expected_discount_percents": [0.0],
+            },
+        )
+        self.assertEqual(update_calls[1].kwargs["skus"], ["sku003"])
+        self.assertEqual(
+            self.mock_product_event_publisher.publish_batch.call_count, 2
+        )
+
+    async def test_reprice_products_rejects_invalid_prices(self):
+        self.mock_product_repository.list_prices.return_value = [
+            ("sku001", -10.0, 0.0)
+        ]
+
+        with self.assertRaises(InvalidPrice):
+            await self.catalogue_service.reprice_products(
+                rule=RepricingRule(discount_percent=0.2)
+            )
+
+        self.mock_product_repository.update_prices.assert_not_called()
+
+    async def test_delete_product_success(self):
+        result = await self.catalogue_service.delete_product(sku="validsku")
 
         self.assertTrue(result)
         self.mock_product_event_publisher.publish.assert_called_once()
 
-    def test_delete_product_not_found(self):
+    async def test_delete_product_not_found(self):
         self.mock_product_repository.delete_product.side_effect = (
             ProductNotFound("Product not found")
         )
 
         with self.assertRaises(ProductNotFound):
-            self.catalogue_service.delete_product(sku="invalidsku")
+            await self.catalogue_service.delete_product(sku="invalidsku")
 
 
 if __name__ == "__main__":
@@ -16,6 +16,17 @@ class TestInventory(unittest.TestCase):
         self.none_reserved = None
         self.valid_id = uuid4()
 
+    def test_inventory_from_row(self):
+        inventory = Inventory.from_row(
+            id=self.valid_id,
+            quantity=self.valid_quantity,
+            reserved=self.valid_reserved,
+        )
+        self.assertEqual(inventory.id, self.valid_id)
+        self.assertEqual(
+            inventory.in_stock, self.valid_quantity - self.valid_reserved
+        )
+
     def test_inventory_creation_with_id(self):
         inventory = Inventory(
             quantity=self.valid_quantity,
@@ -1,6 +1,7 @@
 import unittest
 from uuid import UUID, uuid4
 
+import numpy as np
 from src.domain.exceptions import InvalidPrice
 from src.domain.value_objects import Price
 
@@ -30,6 +31,24 @@ class TestPrice(unittest.TestCase):
             self.valid_value * (1 - self.valid_discount),
         )
 
+    def test_price_from_row(self):
+        price = Price.from_row(
+            id=self.valid_id,
+            value=self.valid_value,
+            discount_percent=self.valid_discount,
+        )
+        self.assertEqual(price.id, self.valid_id)
+        self.assertEqual(price.value, self.valid_value)
+        self.assertEqual(price.discount_percent, self.valid_discount)
+        self.assertEqual(
+            price.to_dict(),
+            Price(
+                value=self.valid_value,
+                discount_percent=self.valid_discount,
+                id=self.valid_id,
+            ).to_dict(),
+        )
+
     def test_price_creation_without_id(self):
         price = Price(
             value=self.valid_value, discount_percent=self.valid_discount
@@ -102,6 +121,38 @@ class TestPrice(unittest.TestCase):
         }
         self.assertEqual(price.to_dict(), expected_dict)
 
+    def test_validate_many_valid(self):
+        Price.validate_many(
+            np.array([self.valid_value, 0.0]),
+            np.array([self.valid_discount, 1.0]),
+        )
+
+    def test_validate_many_uses_single_price_rules(self):
+        cases = [
+            (self.negative_value, self.valid_discount),
+            (np.nan, self.valid_discount),
+            (self.valid_value, self.negative_discount),
+            (self.valid_value, self.high_discount),
+            (self.valid_value, np.nan),
+        ]
+        for value, discount in cases:
+            with self.subTest(value=value, discount=discount):
+                with self.assertRaises(InvalidPrice) as bulk_error:
+                    Price.validate_many(
+                        np.array([self.valid_value, value]),
+                        np.array([self.valid_discount, discount]),
+                    )
+                with self.assertRaises(InvalidPrice) as single_error:
+                    Price(
+                        value=None if np.isnan(value) else value,
+                        discount_percent=(
+                            None if np.isnan(discount) else discount
+                        ),
+                    )
+                self.assertEqual(
+                    str(bulk_error.exception), str(single_error.exception)
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
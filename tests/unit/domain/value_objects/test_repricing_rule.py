@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+from src.domain.exceptions import InvalidPrice
+from src.domain.value_objects import RepricingRule
+
+
+class TestRepricingRule(unittest.TestCase):
+    def setUp(self):
+        self.values = np.array([10.0, 19.99, 0.0])
+        self.discount_percents = np.array([0.0, 0.1, 0.5])
+
+    def test_apply_discount_percent(self):
+        rule = RepricingRule(category="electronics", discount_percent=0.25)
+
+        values, discount_percents = rule.apply(
+            self.values, self.discount_percents
+        )
+
+        np.testing.assert_array_equal(values, self.values)
+        np.testing.assert_array_equal(discount_percents, [0.25, 0.25, 0.25])
+
+    def test_apply_value_change_percent(self):
+        rule = RepricingRule(skus=["sku001"], value_change_percent=0.1)
+
+        values, discount_percents = rule.apply(
+            self.values, self.discount_percents
+        )
+
+        np.testing.assert_array_equal(values, [11.0, 21.99, 0.0])
+        np.testing.assert_array_equal(
+            discount_percents, self.discount_percents
+        )
+
+    def test_rule_must_change_the_price(self):
+        with self.assertRaises(InvalidPrice):
+            RepricingRule(category="electronics")
+
+    def test_rule_validates_discount_percent(self):
+        with self.assertRaises(InvalidPrice):
+            RepricingRule(discount_percent=1.5)
+
+    def test_rule_rejects_negative_prices(self):
+        with self.assertRaises(InvalidPrice):
+            RepricingRule(value_change_percent=-1.5)
+
+    def test_apply_validates_current_prices(self):
+        rule = RepricingRule(discount_percent=0.1)
+
+        with self.assertRaises(InvalidPrice):
+            rule.apply(np.array([-1.0]), np.array([0.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import base64
+import unittest
+
+from src.utils.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor({"sku": "sku/with+chars"})
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), {"sku": "sku/with+chars"})
+
+    def test_decode_cursor_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor")
+
+    def test_decode_cursor_rejects_non_object_payload(self):
+        cursor = base64.urlsafe_b64encode(b"[1, 2]").decode("ascii")
+
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,59 @@
+import unittest
+
+from src.utils.lru_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_size=2, ttl_seconds=10, clock=self.clock)
+
+    def test_get_returns_cached_value(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(
+            self.cache.stats,
+            {"hits": 1, "misses": 1, "evictions": 0, "size": 1},
+        )
+
+    def test_set_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+
+        self.cache.set("c", 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+
+    def test_get_expires_entries_after_ttl(self):
+        self.cache.set("a", 1)
+
+        self.clock.now = 10
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_delete_removes_entry(self):
+        self.cache.set("a", 1)
+
+        self.cache.delete("a")
+        self.cache.delete("missing")
+
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_max_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            LRUCache(max_size=0, ttl_seconds=10)